@@ -11,11 +11,281 @@ This module provides the ImportAnalyzer class which is responsible for:
 from __future__ import annotations
 
 import ast
+import hashlib
 import importlib.util
+import json
+import os
+import shutil
 import sys
+from collections import OrderedDict, deque
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from .types import ImportInfo
+from .utils import iter_python_file_entries
+
+# Imports extracted from file contents shared by all ImportAnalyzer instances, keyed by
+# (path, sha256 of the file bytes) and evicted least-recently-used beyond
+# _IMPORTS_CACHE_SIZE entries. Entries are (module_name, import_type, from_module,
+# line_number) tuples, since ImportInfo objects are mutated by classify_import.
+_IMPORTS_CACHE: OrderedDict[tuple[str, bytes], tuple[tuple[str, str, str | None, int], ...]] = (
+    OrderedDict()
+)
+_IMPORTS_CACHE_SIZE = 1024
+
+# Environment variable naming the directory of the persistent imports cache, which is
+# only used when it is set
+_DISK_CACHE_DIR_ENV = "PYTHON_PACKAGE_FOLDER_CACHE_DIR"
+
+# Version of the persistent cache entry format, part of every entry's file name
+_DISK_CACHE_FORMAT = 1
+
+# Most entries kept in the persistent cache; beyond it, the oldest entries are deleted
+# until a quarter of the room is free again
+_DISK_CACHE_MAX_ENTRIES = 4096
+
+# Number of entries of each persistent cache directory, counted on its first use by the
+# process and kept up to date by _store_disk_entries
+_DISK_CACHE_COUNTS: dict[Path, int] = {}
+
+# Fewest files for which prefetch_imports starts a thread pool to read them
+_PREFETCH_MIN_FILES = 64
+
+# Name prefixes of sandbox directories skipped when searching for a module's file
+_SANDBOX_PREFIXES = ("_SS", "__SS", "_sandbox", "__sandbox")
+
+# Fields holding statement lists (module/def/class/if/for/while/with/try/match bodies,
+# except handlers and match cases), in the order they appear in each node's _fields
+_STATEMENT_LIST_FIELDS = ("body", "handlers", "orelse", "finalbody", "cases")
+
+# Top-level standard library module names of the running interpreter, including modules
+# compiled into it (some builds add built-in modules missing from stdlib_module_names)
+_STDLIB_MODULES = frozenset(sys.stdlib_module_names).union(sys.builtin_module_names)
+
+# Directory and file name prefixes skipped when searching for Python files
+_EXCLUDED_PREFIXES = (
+    ".venv",
+    "venv",
+    "__pycache__",
+    ".git",
+    ".pytest_cache",
+    ".mypy_cache",
+    "node_modules",
+    ".tox",
+    "dist",
+    "build",
+)
+
+
+def _is_excluded_part(name: str) -> bool:
+    """
+    Check if a path part should be skipped when searching for Python files.
+
+    Args:
+        name: Single directory or file name
+
+    Returns:
+        True if the name starts with an excluded prefix or is an .egg-info entry
+    """
+    return name.startswith(_EXCLUDED_PREFIXES) or ".egg-info" in name
+
+
+def _iter_import_nodes(tree: ast.AST) -> Iterator[ast.Import | ast.ImportFrom]:
+    """
+    Yield the import statements of a syntax tree, in the same order as ast.walk.
+
+    Breadth-first like ast.walk, but imports are statements, so only statement lists
+    are followed and expressions are never visited. Imports nested in functions,
+    classes and compound statements are included.
+
+    Args:
+        tree: Parsed module (or any statement node)
+
+    Yields:
+        Import and ImportFrom nodes
+    """
+    queue = deque([tree])
+    while queue:
+        node = queue.popleft()
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            yield node
+        else:
+            for field in _STATEMENT_LIST_FIELDS:
+                children = getattr(node, field, None)
+                if children:
+                    queue.extend(children)
+
+
+def _parse_import_entries(
+    data: bytes, filename: str
+) -> tuple[tuple[str, str, str | None, int], ...] | None:
+    """
+    Parse Python source and collect the fields of its import statements.
+
+    Shared by ImportAnalyzer.extract_imports and ImportAnalyzer.prefetch_imports.
+
+    Args:
+        data: Raw contents of the Python file
+        filename: File name used in syntax error messages
+
+    Returns:
+        Tuple of (module_name, import_type, from_module, line_number) entries,
+        or None if the source could not be parsed
+    """
+    try:
+        # Every import statement contains the "import" keyword, so files without
+        # it have nothing to extract and are not parsed. The parser decodes the
+        # bytes itself, honouring a BOM or PEP 263 encoding declaration.
+        if b"import" not in data:
+            return ()
+        tree = ast.parse(data, filename=filename)
+    except (SyntaxError, ValueError) as e:
+        print(f"Warning: Could not parse {filename}: {e}", file=sys.stderr)
+        return None
+
+    found: list[tuple[str, str, str | None, int]] = []
+    for node in _iter_import_nodes(tree):
+        # Module names are interned: the same names recur across files and end up as
+        # dictionary keys during classification
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                found.append((sys.intern(alias.name), "import", None, node.lineno))
+        elif node.module:
+            module = sys.intern(node.module)
+            found.append((module, "from", module, node.lineno))
+
+    return tuple(found)
+
+
+def _cache_import_entries(
+    key: tuple[str, bytes], entries: tuple[tuple[str, str, str | None, int], ...]
+) -> None:
+    """Store parsed import entries in the shared cache, evicting the oldest if full."""
+    _IMPORTS_CACHE[key] = entries
+    if len(_IMPORTS_CACHE) > _IMPORTS_CACHE_SIZE:
+        _IMPORTS_CACHE.popitem(last=False)
+
+
+def _disk_cache_dir() -> Path | None:
+    """
+    Get the directory of the persistent imports cache.
+
+    The cache is opt-in: it is $PYTHON_PACKAGE_FOLDER_CACHE_DIR, and disabled (None)
+    when that is not set.
+    """
+    directory = os.environ.get(_DISK_CACHE_DIR_ENV)
+    return Path(directory) if directory else None
+
+
+def _disk_cache_path(directory: Path, digest: bytes) -> Path:
+    """
+    Get the persistent cache file of a source file's imports.
+
+    Entries are keyed by the sha256 of the source, the interpreter (whose grammar
+    decides what parses) and the entry format, so they never need invalidating.
+    """
+    tag = sys.implementation.cache_tag
+    return directory / f"{digest.hex()}-{tag}-{_DISK_CACHE_FORMAT}.json"
+
+
+def _prune_disk_cache(directory: Path, keep: int) -> int:
+    """
+    Delete the oldest entries of a persistent cache directory beyond a number of entries.
+
+    Args:
+        directory: Persistent cache directory
+        keep: Number of most recently written entries to keep
+
+    Returns:
+        Number of entries left in the directory
+    """
+    try:
+        with os.scandir(directory) as it:
+            entries = [entry for entry in it if entry.name.endswith(".json")]
+        if len(entries) <= keep:
+            return len(entries)
+        entries.sort(key=lambda entry: entry.stat().st_mtime_ns)
+    except OSError:
+        return 0
+    for entry in entries[: len(entries) - keep]:
+        try:
+            os.unlink(entry.path)
+        except OSError:
+            # Deleted by a concurrent build, or not deletable; either way it's not counted
+            pass
+    return keep
+
+
+def _load_disk_entries(digest: bytes) -> tuple[tuple[str, str, str | None, int], ...] | None:
+    """
+    Load the imports of a source file from the persistent cache, if it is enabled.
+
+    Args:
+        digest: sha256 of the file bytes
+
+    Returns:
+        The cached import entries, or None if they are not cached or unreadable
+    """
+    directory = _disk_cache_dir()
+    if directory is None:
+        return None
+    try:
+        raw = json.loads(_disk_cache_path(directory, digest).read_bytes())
+        return tuple(
+            (
+                sys.intern(module_name),
+                import_type,
+                None if from_module is None else sys.intern(from_module),
+                line_number,
+            )
+            for module_name, import_type, from_module, line_number in raw
+        )
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def _store_disk_entries(
+    digest: bytes, entries: tuple[tuple[str, str, str | None, int], ...]
+) -> None:
+    """
+    Save the imports of a source file to the persistent cache, if it is enabled.
+
+    The entry is written to a temporary file and renamed into place, so concurrent
+    builds never read a partial entry. The directory is created and its entries
+    counted on first use; when the count reaches _DISK_CACHE_MAX_ENTRIES, the oldest
+    entries are deleted.
+
+    Args:
+        digest: sha256 of the file bytes
+        entries: Import entries parsed from the file
+    """
+    directory = _disk_cache_dir()
+    if directory is None:
+        return
+    path = _disk_cache_path(directory, digest)
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        count = _DISK_CACHE_COUNTS.get(directory)
+        if count is None:
+            directory.mkdir(parents=True, exist_ok=True)
+            count = _prune_disk_cache(directory, _DISK_CACHE_MAX_ENTRIES - 1)
+        elif count >= _DISK_CACHE_MAX_ENTRIES:
+            count = _prune_disk_cache(directory, _DISK_CACHE_MAX_ENTRIES * 3 // 4)
+        temp_path.write_text(json.dumps(entries), encoding="utf-8")
+        os.replace(temp_path, path)
+        _DISK_CACHE_COUNTS[directory] = count + 1
+    except OSError:
+        # A cache that can't be written only costs parsing the file again next time
+        temp_path.unlink(missing_ok=True)
+
+
+def clear_disk_cache() -> None:
+    """Delete the persistent imports cache shared by all processes, if it is enabled."""
+    directory = _disk_cache_dir()
+    if directory is not None:
+        _DISK_CACHE_COUNTS.pop(directory, None)
+        shutil.rmtree(directory, ignore_errors=True)
 
 
 class ImportAnalyzer:
@@ -28,24 +298,43 @@ class ImportAnalyzer:
 
     Attributes:
         project_root: Root directory of the project
-        _stdlib_modules: Cached set of standard library module names
+        exclude_patterns: Name prefixes of sandbox directories/files skipped when
+            searching for Python files
+        _imports_cache: Extracted imports keyed by (path, mtime_ns, size)
+        _python_file_index: Paths of .py files under project_root by file name, built on
+            first use
+        _classification_cache: (classification, resolved_path) of absolute imports keyed
+            by (module_name, src_dir)
+        _spec_origins: Origins reported by importlib.util.find_spec, keyed by top-level
+            module name
     """
 
-    def __init__(self, project_root: Path) -> None:
+    def __init__(self, project_root: Path, exclude_patterns: list[str] | None = None) -> None:
         """
         Initialize the import analyzer.
 
         Args:
             project_root: Root directory of the project to analyze
+            exclude_patterns: Name prefixes (e.g. ['_SS', '__sandbox']) of directories and
+                files to skip when searching for Python files
         """
         self.project_root = project_root.resolve()
-        self._stdlib_modules: set[str] | None = None
+        self.exclude_patterns = list(exclude_patterns or [])
+        self._walk_excluded_prefixes = _EXCLUDED_PREFIXES + tuple(self.exclude_patterns)
+        self._imports_cache: dict[
+            tuple[str, int, int], tuple[tuple[str, str, str | None, int], ...]
+        ] = {}
+        self._python_file_index: dict[str, list[Path]] | None = None
+        self._classification_cache: dict[tuple[str, Path], tuple[str, Path | None]] = {}
+        self._spec_origins: dict[str, str | None] = {}
 
     def find_all_python_files(self, directory: Path) -> list[Path]:
         """
         Recursively find all Python files in a directory.
 
-        Excludes common directories like .venv, venv, __pycache__, etc.
+        Excludes common directories like .venv, venv, __pycache__, etc., and anything
+        below the search directory matching exclude_patterns. Excluded directories
+        are not descended into.
 
         Args:
             directory: Directory to search for Python files
@@ -53,53 +342,57 @@ class ImportAnalyzer:
         Returns:
             List of paths to all .py files found in the directory tree
         """
-        exclude_patterns = {
-            ".venv",
-            "venv",
-            "__pycache__",
-            ".git",
-            ".pytest_cache",
-            ".mypy_cache",
-            "node_modules",
-            ".tox",
-            "dist",
-            "build",
-        }
-
-        python_files = []
-        for path in directory.rglob("*.py"):
-            if not path.is_file():
-                continue
+        return list(self.iter_python_files(directory))
+
+    def iter_python_files(self, directory: Path) -> Iterator[Path]:
+        """
+        Yield the Python files of a directory tree as the walk finds them.
+
+        Same files and order as find_all_python_files, without building the whole
+        list first, so callers can start on the first files while the walk goes on.
+
+        Args:
+            directory: Directory to search for Python files
+
+        Yields:
+            Paths to the .py files found in the directory tree
+        """
+        # Paths are excluded if any of their parts is excluded, so an excluded
+        # directory being searched yields nothing
+        if any(_is_excluded_part(part) for part in directory.parts):
+            return
+
+        excluded_prefixes = self._walk_excluded_prefixes
+        for entry in iter_python_file_entries(
+            directory, lambda name: name.startswith(excluded_prefixes) or ".egg-info" in name
+        ):
+            yield Path(entry.path)
+
+    @staticmethod
+    def iter_import_nodes(tree: ast.AST) -> Iterator[ast.Import | ast.ImportFrom]:
+        """
+        Yield the import statements of a parsed file, wherever they are nested.
 
-            # Check if any part of the path matches exclusion patterns
-            should_exclude = False
-            for part in path.parts:
-                # Check exact matches
-                if part in exclude_patterns:
-                    should_exclude = True
-                    break
-                # Check if part starts with excluded pattern or contains .egg-info
-                for pattern in exclude_patterns:
-                    if part.startswith(pattern):
-                        should_exclude = True
-                        break
-                # Also exclude .egg-info directories
-                if ".egg-info" in part:
-                    should_exclude = True
-                    break
-                if should_exclude:
-                    break
-
-            if not should_exclude:
-                python_files.append(path)
-
-        return python_files
+        Visits the same import nodes as filtering ast.walk(tree), in the same order,
+        without visiting expressions.
+
+        Args:
+            tree: Parsed module
+
+        Yields:
+            Import and ImportFrom nodes
+        """
+        return _iter_import_nodes(tree)
 
     def extract_imports(self, file_path: Path) -> list[ImportInfo]:
         """
         Extract all import statements from a Python file.
 
         Uses AST parsing to find both `import` and `from ... import` statements.
+        Results are cached by file contents in memory (and on disk, if
+        $PYTHON_PACKAGE_FOLDER_CACHE_DIR is set), so unchanged files are only parsed
+        once, and files whose modification time and size are unchanged are not read
+        again.
         Handles syntax errors gracefully by returning an empty list.
 
         Args:
@@ -108,132 +401,222 @@ class ImportAnalyzer:
         Returns:
             List of ImportInfo objects representing all imports found in the file
         """
-        imports: list[ImportInfo] = []
+        stat = file_path.stat()
+        stat_key = (str(file_path), stat.st_mtime_ns, stat.st_size)
+        entries = self._imports_cache.get(stat_key)
+        if entries is None:
+            entries = self._extract_import_entries(file_path)
+            if entries is None:
+                return []
+            self._imports_cache[stat_key] = entries
+
+        return [
+            ImportInfo(
+                module_name=module_name,
+                import_type=import_type,
+                from_module=from_module,
+                line_number=line_number,
+                file_path=file_path,
+            )
+            for module_name, import_type, from_module, line_number in entries
+        ]
+
+    def _extract_import_entries(
+        self, file_path: Path
+    ) -> tuple[tuple[str, str, str | None, int], ...] | None:
+        """
+        Get the import fields of a Python file, parsing it only if its contents are new.
+
+        Args:
+            file_path: Path to the Python file to analyze
 
+        Returns:
+            Tuple of (module_name, import_type, from_module, line_number) entries,
+            or None if the file could not be parsed
+        """
+        data = file_path.read_bytes()
+        key = (str(file_path), hashlib.sha256(data).digest())
+        entries = _IMPORTS_CACHE.get(key)
+        if entries is None:
+            entries = _load_disk_entries(key[1])
+            if entries is None:
+                entries = _parse_import_entries(data, str(file_path))
+                if entries is None:
+                    return None
+                _store_disk_entries(key[1], entries)
+            _cache_import_entries(key, entries)
+        else:
+            _IMPORTS_CACHE.move_to_end(key)
+
+        return entries
+
+    def _read_uncached_source(
+        self, file_path: Path
+    ) -> tuple[tuple[str, int, int], tuple[str, bytes], bytes] | None:
+        """
+        Read a Python file for prefetch_imports unless its imports are already cached.
+
+        Args:
+            file_path: Path to the Python file to read
+
+        Returns:
+            Tuple of (stat key, contents key, file bytes), or None if the file is cached
+            or can't be read (left to extract_imports, which reports the error)
+        """
         try:
-            content = file_path.read_text(encoding="utf-8")
-            tree = ast.parse(content, filename=str(file_path))
-        except (SyntaxError, UnicodeDecodeError) as e:
-            print(f"Warning: Could not parse {file_path}: {e}", file=sys.stderr)
-            return imports
-
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    imports.append(
-                        ImportInfo(
-                            module_name=alias.name,
-                            import_type="import",
-                            line_number=node.lineno,
-                            file_path=file_path,
-                        )
-                    )
-            elif isinstance(node, ast.ImportFrom):
-                if node.module:
-                    imports.append(
-                        ImportInfo(
-                            module_name=node.module,
-                            import_type="from",
-                            from_module=node.module,
-                            line_number=node.lineno,
-                            file_path=file_path,
-                        )
-                    )
+            stat = file_path.stat()
+            stat_key = (str(file_path), stat.st_mtime_ns, stat.st_size)
+            if stat_key in self._imports_cache:
+                return None
+            data = file_path.read_bytes()
+        except OSError:
+            return None
+        return stat_key, (stat_key[0], hashlib.sha256(data).digest()), data
+
+    def prefetch_imports(self, file_paths: list[Path]) -> None:
+        """
+        Read and parse many Python files up front, reading them in parallel.
+
+        Files that are not cached yet are read and hashed in a thread pool while the
+        calling thread parses the files already read, and the results are stored in the
+        caches used by extract_imports, so the following extract_imports calls don't
+        read or parse anything. Only threads are used: worker processes would re-import
+        the caller's main script on platforms that spawn them. Small batches are left to
+        extract_imports, since starting the threads costs more than reading a few files.
+
+        Args:
+            file_paths: Paths of the Python files that are about to be analyzed
+        """
+        if len(file_paths) < _PREFETCH_MIN_FILES:
+            return
+
+        # Reading and hashing wait on the disk and release the GIL, so threads overlap them
+        with ThreadPoolExecutor() as executor:
+            for source in executor.map(self._read_uncached_source, file_paths):
+                if source is None:
+                    continue
+                stat_key, key, data = source
+                entries = _IMPORTS_CACHE.get(key)
+                if entries is None:
+                    entries = _load_disk_entries(key[1])
+                    if entries is None:
+                        entries = _parse_import_entries(data, key[0])
+                        if entries is None:
+                            continue
+                        _store_disk_entries(key[1], entries)
+                    _cache_import_entries(key, entries)
+                self._imports_cache[stat_key] = entries
+
+    def clear_cache(self) -> None:
+        """Forget the imports, file index, classifications and module lookups of this analyzer."""
+        self._imports_cache.clear()
+        self._python_file_index = None
+        self._classification_cache.clear()
+        self._spec_origins.clear()
+
+    def _find_files_named(self, directory: Path, file_name: str) -> list[Path]:
+        """
+        Find files with a given name anywhere under a directory within project_root.
+
+        Equivalent to directory.rglob(file_name) (same paths, same order), but served
+        from an index of project_root built by a single walk, so repeated lookups
+        don't list the tree again.
+
+        Args:
+            directory: Directory to search, inside project_root
+            file_name: Exact file name to look for (e.g. "some_utility.py")
 
-        return imports
+        Returns:
+            List of matching paths under directory
+        """
+        if self._python_file_index is None:
+            self._python_file_index = self._build_python_file_index()
+        return [
+            path
+            for path in self._python_file_index.get(file_name, ())
+            if path.is_relative_to(directory)
+        ]
 
-    def get_stdlib_modules(self) -> set[str]:
+    def _build_python_file_index(self) -> dict[str, list[Path]]:
         """
-        Get a set of standard library module names.
+        Walk project_root once and index every .py file by name.
 
-        Caches the result for performance. Attempts to discover stdlib modules
-        by examining the Python installation directory, with a fallback list
-        of common standard library modules.
+        The walk visits directories in the same depth-first order as rglob and, like it,
+        does not descend into symlinked directories.
 
         Returns:
-            Set of standard library module names
+            Dictionary mapping file names to their paths in walk order
         """
-        if self._stdlib_modules is not None:
-            return self._stdlib_modules
+        index: dict[str, list[Path]] = {}
+        for entry in iter_python_file_entries(self.project_root):
+            index.setdefault(entry.name, []).append(Path(entry.path))
+        return index
 
-        stdlib_modules: set[str] = set()
+    def get_stdlib_modules(self) -> frozenset[str]:
+        """
+        Get the set of standard library module names.
 
-        # Get standard library path
-        stdlib_path = (
-            Path(sys.executable).parent
-            / "lib"
-            / f"python{sys.version_info.major}.{sys.version_info.minor}"
-        )
-        if not stdlib_path.exists():
-            # Fallback: try to import and check sys.path
-            import sysconfig
-
-            stdlib_path = Path(sysconfig.get_path("stdlib"))
-
-        if stdlib_path.exists():
-            for item in stdlib_path.iterdir():
-                if item.is_file() and item.suffix == ".py":
-                    stdlib_modules.add(item.stem)
-                elif (
-                    item.is_dir()
-                    and not item.name.startswith("_")
-                    and (item / "__init__.py").exists()
-                ):
-                    stdlib_modules.add(item.name)
-
-        # Add common stdlib modules that might not be in the directory
-        common_stdlib = {
-            "sys",
-            "os",
-            "json",
-            "pathlib",
-            "typing",
-            "collections",
-            "itertools",
-            "functools",
-            "dataclasses",
-            "enum",
-            "abc",
-            "contextlib",
-            "io",
-            "textwrap",
-            "ast",
-            "importlib",
-            "shutil",
-            "subprocess",
-        }
-        stdlib_modules.update(common_stdlib)
-
-        self._stdlib_modules = stdlib_modules
-        return stdlib_modules
+        Uses the interpreter's own lists (sys.stdlib_module_names and
+        sys.builtin_module_names), which also cover modules that have no file in the
+        standard library directory.
+
+        Returns:
+            Frozen set of top-level standard library module names
+        """
+        return _STDLIB_MODULES
 
     def classify_import(self, import_info: ImportInfo, src_dir: Path) -> None:
         """
         Classify an import as stdlib, third-party, local, external, or ambiguous.
 
         Modifies the ImportInfo object in place, setting its classification
-        and resolved_path attributes.
+        and resolved_path attributes. Results for absolute imports are cached per
+        (module name, src_dir) until clear_cache() is called.
 
         Args:
             import_info: ImportInfo object to classify
             src_dir: Source directory to use for determining local vs external
         """
         module_name = import_info.module_name
-        stdlib_modules = self.get_stdlib_modules()
 
         # Check if it's a standard library module
-        root_module = module_name.split(".")[0]
-        if root_module in stdlib_modules:
+        root_module = module_name.partition(".")[0]
+        if root_module in _STDLIB_MODULES:
             import_info.classification = "stdlib"
             return
 
+        # Absolute imports resolve the same way from every file, relative ones don't
+        key = (module_name, src_dir)
+        result = self._classification_cache.get(key)
+        if result is None:
+            result = self._classify_non_stdlib(import_info, src_dir)
+            if not module_name.startswith("."):
+                self._classification_cache[key] = result
+
+        import_info.classification, resolved = result
+        if resolved is not None:
+            import_info.resolved_path = resolved
+
+    def _classify_non_stdlib(
+        self, import_info: ImportInfo, src_dir: Path
+    ) -> tuple[str, Path | None]:
+        """
+        Classify an import that is not from the standard library.
+
+        Args:
+            import_info: ImportInfo object to classify
+            src_dir: Source directory to use for determining local vs external
+
+        Returns:
+            Tuple of (classification, resolved_path), resolved_path being None except
+            for local and external imports
+        """
         # Check if it's a third-party package (in site-packages) FIRST
         # This must be checked before resolve_local_import to avoid incorrectly
         # classifying site-packages modules as "external" when they're found
         # by the recursive search
-        if self.is_third_party(module_name):
-            import_info.classification = "third_party"
-            return
+        if self.is_third_party(import_info.module_name):
+            return "third_party", None
 
         # Try to resolve as a local import
         resolved = self.resolve_local_import(import_info, src_dir)
@@ -241,17 +624,13 @@ class ImportAnalyzer:
             # Double-check: if resolved path is in site-packages, it's actually third-party
             # (this can happen if the recursive search finds it before importlib does)
             if "site-packages" in str(resolved) or "dist-packages" in str(resolved):
-                import_info.classification = "third_party"
-                return
+                return "third_party", None
             if resolved.is_relative_to(src_dir):
-                import_info.classification = "local"
-            else:
-                import_info.classification = "external"
-            import_info.resolved_path = resolved
-            return
+                return "local", resolved
+            return "external", resolved
 
         # Mark as ambiguous if we can't determine
-        import_info.classification = "ambiguous"
+        return "ambiguous", None
 
     def resolve_local_import(self, import_info: ImportInfo, src_dir: Path) -> Path | None:
         """
@@ -361,7 +740,9 @@ class ImportAnalyzer:
                 module_basename = module_name.split(".")[-1]
                 try:
                     # Search recursively for the module file
-                    for potential_file in parent.rglob(f"{module_basename}.py"):
+                    for potential_file in self._find_files_named(
+                        parent, f"{module_basename}.py"
+                    ):
                         # Only search within project_root to avoid going too far
                         if not potential_file.is_relative_to(self.project_root):
                             continue
@@ -370,11 +751,7 @@ class ImportAnalyzer:
                             continue
                         # Skip excluded patterns
                         if any(
-                            part.startswith("_SS")
-                            or part.startswith("__SS")
-                            or part.startswith("_sandbox")
-                            or part.startswith("__sandbox")
-                            for part in potential_file.parts
+                            part.startswith(_SANDBOX_PREFIXES) for part in potential_file.parts
                         ):
                             continue
                         # Skip if it's in the src_dir (we're looking for external dependencies)
@@ -422,17 +799,23 @@ class ImportAnalyzer:
         Returns:
             True if the module is a third-party package, False otherwise
         """
-        root_module = module_name.split(".")[0]
+        root_module = module_name.partition(".")[0]
 
         # Skip if already known as stdlib
-        stdlib_modules = self.get_stdlib_modules()
-        if root_module in stdlib_modules:
+        if root_module in _STDLIB_MODULES:
             return False
 
         try:
-            spec = importlib.util.find_spec(root_module)
-            if spec and spec.origin:
-                origin_path = Path(spec.origin)
+            # find_spec searches every sys.path entry, so its answer is kept until
+            # clear_cache(); errors are not kept
+            if root_module in self._spec_origins:
+                origin = self._spec_origins[root_module]
+            else:
+                spec = importlib.util.find_spec(root_module)
+                origin = spec.origin if spec else None
+                self._spec_origins[root_module] = origin
+            if origin:
+                origin_path = Path(origin)
                 origin_str = str(origin_path)
 
                 # Check if it's in site-packages or dist-packages
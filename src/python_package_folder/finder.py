@@ -13,6 +13,18 @@ from pathlib import Path
 from .analyzer import ImportAnalyzer
 from .types import ExternalDependency
 
+# Name prefixes of sandbox/skip directories and files that are never copied
+DEFAULT_EXCLUDE_PATTERNS = (
+    "_SS",
+    "__SS",
+    "_sandbox",
+    "__sandbox",
+    "_skip",
+    "__skip",
+    "_test",
+    "__test__",
+)
+
 
 class ExternalDependencyFinder:
     """
@@ -49,19 +61,11 @@ class ExternalDependencyFinder:
         self.src_dir = src_dir.resolve()
         # Store original src_dir for relative path checks (important for subfolder builds)
         self.original_src_dir = (original_src_dir or src_dir).resolve()
-        self.analyzer = ImportAnalyzer(project_root)
         # Patterns for directories/files to exclude (sandbox, skip, etc.)
-        default_patterns = [
-            "_SS",
-            "__SS",
-            "_sandbox",
-            "__sandbox",
-            "_skip",
-            "__skip",
-            "_test",
-            "__test__",
-        ]
-        self.exclude_patterns = default_patterns + (exclude_patterns or [])
+        self.exclude_patterns = list(DEFAULT_EXCLUDE_PATTERNS) + (exclude_patterns or [])
+        # All patterns as one tuple, so a path part is checked with a single startswith call
+        self._exclude_prefixes = tuple(self.exclude_patterns)
+        self.analyzer = ImportAnalyzer(project_root)
 
     def find_external_dependencies(self, python_files: list[Path]) -> list[ExternalDependency]:
         """
@@ -81,6 +85,7 @@ class ExternalDependencyFinder:
         external_deps: list[ExternalDependency] = []
         seen_paths: set[Path] = set()
 
+        self.analyzer.prefetch_imports(python_files)
         for file_path in python_files:
             imports = self.analyzer.extract_imports(file_path)
             for imp in imports:
@@ -257,13 +262,9 @@ class ExternalDependencyFinder:
         Returns:
             True if the path should be excluded, False otherwise
         """
-        # Check each component of the path
-        for part in path.parts:
-            for pattern in self.exclude_patterns:
-                # Match if part equals pattern or starts with pattern
-                if part == pattern or part.startswith(pattern):
-                    return True
-        return False
+        # Match if a path component equals a pattern or starts with it
+        exclude_prefixes = self._exclude_prefixes
+        return any(part.startswith(exclude_prefixes) for part in path.parts)
 
     def _find_main_package(self) -> Path | None:
         """
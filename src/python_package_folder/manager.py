@@ -8,9 +8,12 @@ running the build command, and cleaning up afterward.
 
 from __future__ import annotations
 
+import functools
+import os
 import shutil
+import stat
 import sys
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
 from pathlib import Path
 
 try:
@@ -21,10 +24,176 @@ except ImportError:
     except ImportError:
         tomllib = None
 
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows
+    fcntl = None
+
 from .analyzer import ImportAnalyzer
-from .finder import ExternalDependencyFinder
+from .finder import DEFAULT_EXCLUDE_PATTERNS, ExternalDependencyFinder
 from .subfolder_build import SubfolderBuildConfig
 from .types import ExternalDependency, ImportInfo
+from .utils import iter_python_file_entries
+
+# ioctl request that clones a file's extents into another file (Linux FICLONE)
+_FICLONE = 0x40049409
+
+# (source device, destination directory device) pairs on which FICLONE failed, so files
+# between them go straight to a regular copy
+_UNCLONABLE_DEVICES: set[tuple[int, int]] = set()
+
+
+def _copy_file(src: str | os.PathLike[str], dst: str | os.PathLike[str]) -> str:
+    """
+    Copy a file with its metadata, cloning it when the file system allows.
+
+    On copy-on-write file systems (btrfs, XFS with reflink) the copy shares the
+    source's data blocks, so it takes the same time whatever the file size. Elsewhere
+    this is shutil.copy2, which already uses sendfile() on Linux: cloning is tried once
+    per pair of file systems, and not again between file systems where it failed.
+    Usable as the copy_function of shutil.copytree.
+
+    Args:
+        src: File to copy
+        dst: Destination file path
+
+    Returns:
+        The destination path
+    """
+    # Existing destinations (including src itself) are left to copy2's checks
+    if fcntl is not None and sys.platform.startswith("linux") and not os.path.lexists(dst):
+        try:
+            devices = (
+                os.stat(src).st_dev,
+                os.stat(os.path.dirname(os.path.abspath(dst))).st_dev,
+            )
+        except OSError:
+            devices = None
+        if devices is not None and devices not in _UNCLONABLE_DEVICES:
+            try:
+                with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                    try:
+                        fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+                    except OSError:
+                        _UNCLONABLE_DEVICES.add(devices)
+                        raise
+                shutil.copystat(src, dst)
+            except OSError:
+                # Not cloned, or its metadata not copied: remove the file created for
+                # the clone and do a regular copy, which reports any real error
+                try:
+                    os.unlink(dst)
+                except OSError:
+                    pass
+            else:
+                return os.fspath(dst)
+    return shutil.copy2(src, dst)
+
+
+@functools.cache
+def _installed_packages_distributions() -> Mapping[str, list[str]]:
+    """
+    Map top-level import names to the installed distributions providing them.
+
+    Built once per process by importlib.metadata.packages_distributions(), which reads
+    every distribution's top_level.txt or RECORD.
+    """
+    import importlib.metadata as importlib_metadata
+
+    return importlib_metadata.packages_distributions()
+
+
+@functools.lru_cache(maxsize=4096)
+def _resolve_import_to_package(root_module: str) -> str | None:
+    """
+    Get the PyPI package name providing a top-level import name.
+
+    Results are cached for the process, since every BuildManager looks up the same
+    installed distributions; call _resolve_import_to_package.cache_clear() (and
+    _installed_packages_distributions.cache_clear()) after installing packages.
+
+    Args:
+        root_module: Top-level module name from an import statement
+
+    Returns:
+        The package name, or None if not found
+    """
+    # Names are normalized once per lookup rather than once per distribution or file:
+    # distribution names are compared lower case with hyphens as underscores, and
+    # files belong to the module if they are under either spelling of its directory
+    module_key = root_module.lower()
+    package_prefixes = (f"{root_module}/", f"{root_module.replace('_', '-')}/")
+    try:
+        # Try Python 3.10+ first (has packages_distributions)
+        import importlib.metadata as importlib_metadata
+
+        # Use packages_distributions() if available (Python 3.10+)
+        if hasattr(importlib_metadata, "packages_distributions"):
+            packages_map = _installed_packages_distributions()
+            # packages_map is a dict mapping module names to list of distribution names
+            if root_module in packages_map:
+                # Return the first distribution name (usually there's only one)
+                dist_names = packages_map[root_module]
+                if dist_names:
+                    return dist_names[0]
+
+        # Fallback: search all distributions (this can be slow, so limit search)
+        # Only check top-level package matches to speed up search
+        dist_count = 0
+        max_distributions_to_check = 1000  # Limit to prevent excessive searching
+        for dist in importlib_metadata.distributions():
+            dist_count += 1
+            if dist_count > max_distributions_to_check:
+                # Too many distributions, give up to avoid hanging
+                break
+            try:
+                # Check distribution name first (fast check)
+                dist_name = dist.metadata.get("Name", "")
+                # If distribution name matches or contains the module name, check files
+                if module_key in dist_name.lower().replace("-", "_"):
+                    # Check if this distribution provides the module by looking at its files
+                    files = dist.files or []
+                    # Limit file checking to first 100 files per distribution
+                    file_count = 0
+                    for file in files:
+                        file_count += 1
+                        if file_count > 100:
+                            break
+                        file_str = str(file)
+                        # Check if file is the module itself or in a package directory
+                        if (
+                            file.suffix == ".py"
+                            and (file.stem == root_module or file.stem == "__init__")
+                        ) or file_str.startswith(package_prefixes):
+                            return dist.metadata["Name"]
+            except Exception:
+                continue
+
+    except ImportError:
+        try:
+            # Fallback for older Python versions
+            import importlib_metadata
+
+            # Search all distributions
+            for dist in importlib_metadata.distributions():
+                try:
+                    files = dist.files or []
+                    for file in files:
+                        file_str = str(file)
+                        if (
+                            file.suffix == ".py"
+                            and (file.stem == root_module or file.stem == "__init__")
+                        ) or file_str.startswith(package_prefixes):
+                            return dist.metadata["Name"]
+                except Exception:
+                    continue
+        except ImportError:
+            pass
+    except Exception:
+        pass
+
+    return None
 
 
 class BuildManager:
@@ -74,29 +243,29 @@ class BuildManager:
         # Store original src_dir before any changes (e.g., when temp directory is created)
         self.original_src_dir = self.src_dir
 
-        # Validate source directory
-        if not self.src_dir.exists():
-            raise ValueError(f"Source directory not found: {self.src_dir}")
+        # Validate source directory with a single stat call
+        try:
+            src_dir_mode = self.src_dir.stat().st_mode
+        except (FileNotFoundError, NotADirectoryError):
+            raise ValueError(f"Source directory not found: {self.src_dir}") from None
 
-        if not self.src_dir.is_dir():
+        if not stat.S_ISDIR(src_dir_mode):
             raise ValueError(f"Source path is not a directory: {self.src_dir}")
 
         self.copied_files: list[Path] = []
         self.copied_dirs: list[Path] = []
+        # Source of each dependency copied by prepare_build, keyed by target path, so
+        # repeated prepare_build calls skip them without comparing file trees
+        self._copied_sources: dict[Path, Path] = {}
         self.exclude_patterns = exclude_patterns or []
         self.finder = ExternalDependencyFinder(
             self.project_root, self.src_dir, exclude_patterns=exclude_patterns
         )
         self.subfolder_config: SubfolderBuildConfig | None = None
-        # Cache for package name lookups (expensive operation)
-        self._packages_distributions_cache: dict[str, list[str]] | None = None
         # Track files with modified imports and their original content
         self._modified_import_files: dict[Path, str] = {}
-
-        # Check if it's a valid Python package directory
-        if not any(self.src_dir.glob("*.py")) and not (self.src_dir / "__init__.py").exists():
-            # Allow empty directories for now, but warn
-            pass
+        # Directories without Python files are allowed, so nothing else is checked or
+        # scanned here; all file system work is deferred to prepare_build
 
     def find_src_package_dir(self) -> Path | None:
         """
@@ -311,17 +480,23 @@ class BuildManager:
                         f"Using temporary package directory for build: {self.src_dir}"
                     )
 
+        # Exclude patterns only filter the dependencies copied in, not the files searched:
+        # modules such as _skip_helpers.py still ship, so their imports must be analyzed
         analyzer = ImportAnalyzer(self.project_root)
 
         # Find all Python files in src/ (which may now be the temp package directory)
         python_files = analyzer.find_all_python_files(self.src_dir)
 
-        # Find external dependencies using the configured finder
+        # Find external dependencies using the configured finder, against the current tree
+        self.finder.analyzer.clear_cache()
         external_deps = self.finder.find_external_dependencies(python_files)
 
-        # Copy external dependencies
-        for dep in external_deps:
-            self._copy_dependency(dep)
+        # Copy external dependencies, shallowest targets first: a directory dependency
+        # then never replaces files already copied into it, and each target parent
+        # directory is created once
+        created_parents: set[Path] = set()
+        for dep in sorted(external_deps, key=lambda dep: len(dep.target_path.parts)):
+            self._copy_dependency(dep, created_parents)
 
         # For subfolder builds, fix imports
         if self._is_subfolder_build() and external_deps:
@@ -350,7 +525,9 @@ class BuildManager:
 
         return external_deps
 
-    def _copy_dependency(self, dep: ExternalDependency) -> None:
+    def _copy_dependency(
+        self, dep: ExternalDependency, created_parents: set[Path] | None = None
+    ) -> None:
         """
         Copy an external dependency to the target location.
 
@@ -359,6 +536,8 @@ class BuildManager:
 
         Args:
             dep: ExternalDependency object with source and target paths
+            created_parents: Parent directories already created while copying a batch of
+                dependencies, updated with the target's parent
         """
         source = dep.source_path
         target = dep.target_path
@@ -367,10 +546,17 @@ class BuildManager:
             print(f"Warning: External dependency not found: {source}", file=sys.stderr)
             return
 
+        # Already copied by an earlier prepare_build call (idempotency)
+        if self._copied_sources.get(target) == source and target.exists():
+            return
+
         # Create target directory if needed
-        target.parent.mkdir(parents=True, exist_ok=True)
+        if created_parents is None or target.parent not in created_parents:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if created_parents is not None:
+                created_parents.add(target.parent)
 
-        # Check if already copied (idempotency)
+        # Check if already in place (idempotency)
         if target.exists():
             # Check if it's the same file
             if source.is_file() and target.is_file():
@@ -388,16 +574,17 @@ class BuildManager:
                 target_has_init = (target / "__init__.py").exists()
                 if source_has_init == target_has_init:
                     # Check if target has at least some files from source
-                    source_files = {f.name for f in source.rglob("*.py")}
-                    target_files = {f.name for f in target.rglob("*.py")}
+                    source_files = {entry.name for entry in iter_python_file_entries(source)}
+                    target_files = {entry.name for entry in iter_python_file_entries(target)}
                     if source_files and target_files and source_files.issubset(target_files):
                         # Assume already copied if structure matches
                         return
 
         try:
             if source.is_file():
-                shutil.copy2(source, target)
+                _copy_file(source, target)
                 self.copied_files.append(target)
+                self._copied_sources[target] = source
                 print(f"Copied external file: {source} -> {target}")
                 # If copying a Python file, ensure parent directory has __init__.py
                 # This helps type checkers resolve imports correctly
@@ -412,6 +599,7 @@ class BuildManager:
                 # Use custom copy function that excludes certain patterns
                 self._copytree_excluding(source, target)
                 self.copied_dirs.append(target)
+                self._copied_sources[target] = source
                 print(f"Copied external directory: {source} -> {target}")
         except Exception as e:
             print(f"Error copying {source} to {target}: {e}", file=sys.stderr)
@@ -428,75 +616,48 @@ class BuildManager:
             src: Source directory
             dst: Destination directory
         """
-        default_patterns = [
-            "_SS",
-            "__SS",
-            "_sandbox",
-            "__sandbox",
-            "_skip",
-            "__skip",
-            "_test",
-            "__test__",
-        ]
-        exclude_patterns = default_patterns + self.exclude_patterns
-
-        def should_exclude(path: Path) -> bool:
-            """Check if a path should be excluded."""
-            # Check each component of the path
-            for part in path.parts:
-                # Check if any part matches an exclusion pattern
-                for pattern in exclude_patterns:
-                    # Match if part equals pattern or starts with pattern
-                    if part == pattern or part.startswith(pattern):
-                        return True
-            return False
+        exclude_prefixes = (*DEFAULT_EXCLUDE_PATTERNS, *self.exclude_patterns)
 
-        # Create destination directory
-        dst.mkdir(parents=True, exist_ok=True)
-
-        has_python_files = False
-        copied_python_files = []
+        # Match if a part equals a pattern or starts with it. Parts above src are checked
+        # once; below it, entries are skipped by name while copytree lists each directory.
+        if any(part.startswith(exclude_prefixes) for part in src.parts):
+            dst.mkdir(parents=True, exist_ok=True)
+            return
 
-        # Copy files and subdirectories, excluding patterns
-        for item in src.iterdir():
-            if should_exclude(item):
-                continue
+        def ignore_excluded(directory: str, names: list[str]) -> list[str]:
+            """Names in a directory listing that should not be copied."""
+            return [name for name in names if name.startswith(exclude_prefixes)]
+
+        shutil.copytree(
+            src,
+            dst,
+            ignore=ignore_excluded,
+            copy_function=_copy_file,
+            ignore_dangling_symlinks=True,
+            dirs_exist_ok=True,
+        )
 
-            src_item = src / item.name
-            dst_item = dst / item.name
-
-            if src_item.is_file():
-                shutil.copy2(src_item, dst_item)
-                if src_item.suffix == ".py":
-                    has_python_files = True
-                    copied_python_files.append(dst_item)
-            elif src_item.is_dir():
-                self._copytree_excluding(src_item, dst_item)
-                # Check if the subdirectory has Python files
-                if any(dst_item.rglob("*.py")):
-                    has_python_files = True
-
-        # Ensure __init__.py exists in directories containing Python files
-        # This is needed for type checkers to resolve imports correctly
-        # Also ensure all parent directories in the path have __init__.py
-        if has_python_files:
-            init_file = dst / "__init__.py"
-            if not init_file.exists():
-                # Create an empty __init__.py file
+        # Ensure __init__.py exists in directories containing Python files (directly or
+        # in a subdirectory). This is needed for type checkers to resolve imports correctly.
+        # Walking bottom-up tells each directory whether anything below it had Python files.
+        has_python_files: dict[str, bool] = {}
+        for dirpath, dirnames, filenames in os.walk(dst, topdown=False):
+            has_python_files[dirpath] = any(name.endswith(".py") for name in filenames) or any(
+                has_python_files.get(os.path.join(dirpath, name), False) for name in dirnames
+            )
+            if has_python_files[dirpath] and "__init__.py" not in filenames:
+                init_file = Path(dirpath) / "__init__.py"
                 init_file.write_text("", encoding="utf-8")
                 self.copied_files.append(init_file)
 
-            # Ensure all parent directories up to src_dir also have __init__.py
-            # This helps type checkers resolve nested imports like:
-            # from empty_drawing_detection.models.Information_extraction._shared_ie.ie_enums import ...
+        # Ensure all parent directories up to src_dir also have __init__.py
+        # This helps type checkers resolve nested imports like:
+        # from empty_drawing_detection.models.Information_extraction._shared_ie.ie_enums import ...
+        if has_python_files.get(os.fspath(dst), False):
             current = dst
             while current != self.src_dir and current.is_relative_to(self.src_dir):
                 parent_init = current.parent / "__init__.py"
-                if (
-                    parent_init.parent != self.src_dir
-                    and not parent_init.exists()
-                    and any(current.parent.rglob("*.py"))
-                ):
+                if parent_init.parent != self.src_dir and not parent_init.exists():
                     parent_init.write_text("", encoding="utf-8")
                     self.copied_files.append(parent_init)
                 current = current.parent
@@ -514,97 +675,7 @@ class BuildManager:
         Returns:
             The actual package name, or None if not found
         """
-        root_module = module_name.split(".")[0]
-        try:
-            # Try Python 3.10+ first (has packages_distributions)
-            import importlib.metadata as importlib_metadata
-
-            # Use packages_distributions() if available (Python 3.10+)
-            # Cache the result since it's expensive to call
-            if hasattr(importlib_metadata, "packages_distributions"):
-                if self._packages_distributions_cache is None:
-                    # Cache the packages_distributions() result
-                    self._packages_distributions_cache = importlib_metadata.packages_distributions()
-                packages_map = self._packages_distributions_cache
-                # packages_map is a dict mapping module names to list of distribution names
-                if root_module in packages_map:
-                    # Return the first distribution name (usually there's only one)
-                    dist_names = packages_map[root_module]
-                    if dist_names:
-                        return dist_names[0]
-
-            # Fallback: search all distributions (this can be slow, so limit search)
-            # Only check top-level package matches to speed up search
-            dist_count = 0
-            max_distributions_to_check = 1000  # Limit to prevent excessive searching
-            for dist in importlib_metadata.distributions():
-                dist_count += 1
-                if dist_count > max_distributions_to_check:
-                    # Too many distributions, give up to avoid hanging
-                    break
-                try:
-                    # Check distribution name first (fast check)
-                    dist_name = dist.metadata.get("Name", "")
-                    # If distribution name matches or contains the module name, check files
-                    if dist_name.lower().replace(
-                        "-", "_"
-                    ) == root_module.lower() or root_module.lower() in dist_name.lower().replace(
-                        "-", "_"
-                    ):
-                        # Check if this distribution provides the module by looking at its files
-                        files = dist.files or []
-                        # Limit file checking to first 100 files per distribution
-                        file_count = 0
-                        for file in files:
-                            file_count += 1
-                            if file_count > 100:
-                                break
-                            file_str = str(file)
-                            # Check if file is the module itself or in a package directory
-                            if (
-                                file.suffix == ".py"
-                                and (file.stem == root_module or file.stem == "__init__")
-                            ) or (
-                                "/" in file_str
-                                and (
-                                    file_str.startswith(f"{root_module}/")
-                                    or file_str.startswith(f"{root_module.replace('_', '-')}/")
-                                )
-                            ):
-                                return dist.metadata["Name"]
-                except Exception:
-                    continue
-
-        except ImportError:
-            try:
-                # Fallback for older Python versions
-                import importlib_metadata
-
-                # Search all distributions
-                for dist in importlib_metadata.distributions():
-                    try:
-                        files = dist.files or []
-                        for file in files:
-                            file_str = str(file)
-                            if (
-                                file.suffix == ".py"
-                                and (file.stem == root_module or file.stem == "__init__")
-                            ) or (
-                                "/" in file_str
-                                and (
-                                    file_str.startswith(f"{root_module}/")
-                                    or file_str.startswith(f"{root_module.replace('_', '-')}/")
-                                )
-                            ):
-                                return dist.metadata["Name"]
-                    except Exception:
-                        continue
-            except ImportError:
-                pass
-        except Exception:
-            pass
-
-        return None
+        return _resolve_import_to_package(module_name.split(".")[0])
 
     def _extract_third_party_dependencies(
         self, python_files: list[Path], analyzer: ImportAnalyzer
@@ -616,6 +687,9 @@ class BuildManager:
         and returns a list of unique package names. Handles cases where the
         import name differs from the package name (e.g., 'fitz' -> 'pymupdf').
 
+        When many files aren't cached yet, they are read in parallel and parsed up
+        front (see ImportAnalyzer.prefetch_imports).
+
         Args:
             python_files: List of Python file paths to analyze
             analyzer: ImportAnalyzer instance to use for classification
@@ -672,6 +746,13 @@ class BuildManager:
         # Cache package name lookups to avoid repeated expensive searches
         package_name_cache: dict[str, str | None] = {}
 
+        stdlib_modules = analyzer.get_stdlib_modules()
+        # Absolute imports classify the same way from every file, so each module name is
+        # only handled the first time it is seen; relative imports depend on the file
+        seen_modules: set[str] = set()
+
+        analyzer.prefetch_imports(python_files)
+
         total_files = len(python_files)
         for idx, file_path in enumerate(python_files):
             if idx > 0 and idx % 50 == 0:
@@ -679,16 +760,21 @@ class BuildManager:
 
             imports = analyzer.extract_imports(file_path)
             for imp in imports:
-                analyzer.classify_import(imp, self.src_dir)
+                module_name = imp.module_name
+                if module_name in seen_modules:
+                    continue
 
                 # Extract the root package name (first part of module name)
-                root_module = imp.module_name.split(".")[0]
+                root_module = module_name.split(".")[0]
 
                 # Skip if it's a standard library module
-                stdlib_modules = analyzer.get_stdlib_modules()
                 if root_module in stdlib_modules:
                     continue
 
+                if not module_name.startswith("."):
+                    seen_modules.add(module_name)
+                analyzer.classify_import(imp, self.src_dir)
+
                 # Skip if it's local or external (already copied, don't add as dependency)
                 if imp.classification in ("local", "external"):
                     continue
@@ -768,7 +854,9 @@ class BuildManager:
             if dep.target_path.is_file() and dep.target_path.suffix == ".py":
                 copied_files.append(dep.target_path)
             elif dep.target_path.is_dir():
-                copied_files.extend(dep.target_path.rglob("*.py"))
+                copied_files.extend(
+                    Path(entry.path) for entry in iter_python_file_entries(dep.target_path)
+                )
 
         for file_path in copied_files:
             try:
@@ -784,7 +872,7 @@ class BuildManager:
 
                 lines_to_modify: dict[int, str] = {}
 
-                for node in ast.walk(tree):
+                for node in ImportAnalyzer.iter_import_nodes(tree):
                     if isinstance(node, ast.ImportFrom):
                         if node.module is None:
                             continue
@@ -972,7 +1060,7 @@ class BuildManager:
                 # Track which lines need to be modified
                 lines_to_modify: dict[int, str] = {}
 
-                for node in ast.walk(tree):
+                for node in ImportAnalyzer.iter_import_nodes(tree):
                     if isinstance(node, ast.ImportFrom):
                         if node.module is None:
                             continue
@@ -1256,6 +1344,9 @@ class BuildManager:
 
         self.copied_files.clear()
         self.copied_dirs.clear()
+        self._copied_sources.clear()
+        # The analyzer's file index may still list the removed copies
+        self.finder.analyzer.clear_cache()
 
         # Restore files with modified imports
         for file_path, original_content in self._modified_import_files.items():
@@ -1270,76 +1361,84 @@ class BuildManager:
                     )
         self._modified_import_files.clear()
 
-        # Remove all .egg-info directories in src_dir and project_root
-        self._cleanup_egg_info_dirs()
-
-        # Remove empty directories that may remain after cleanup
-        self._cleanup_empty_dirs()
+        # Remove all .egg-info directories in src_dir and project_root, and empty
+        # directories that may remain in src_dir after cleanup
+        self._cleanup_build_leftovers()
 
-    def _cleanup_egg_info_dirs(self) -> None:
+    def _cleanup_build_leftovers(self) -> None:
         """
-        Remove all .egg-info directories in the source directory and project root.
+        Remove .egg-info directories and empty directories left by the build.
 
-        These directories are created by setuptools during the build process and
-        should be cleaned up after the build completes.
-        """
-        # Search in src_dir and project_root
-        search_dirs = [self.src_dir, self.project_root]
-
-        for search_dir in search_dirs:
-            if not search_dir.exists():
-                continue
-
-            # Find all .egg-info directories
-            for egg_info_dir in search_dir.rglob("*.egg-info"):
-                if egg_info_dir.is_dir():
-                    try:
-                        shutil.rmtree(egg_info_dir)
-                        print(f"Removed .egg-info directory: {egg_info_dir}")
-                    except Exception as e:
-                        print(
-                            f"Warning: Could not remove .egg-info directory {egg_info_dir}: {e}",
-                            file=sys.stderr,
-                        )
+        .egg-info directories are created by setuptools during the build process and
+        are removed anywhere in the project root and the source directory. After
+        removing copied files and directories, some directories in the source directory
+        may also be empty; those are removed too, but never src_dir itself.
 
-    def _cleanup_empty_dirs(self) -> None:
+        Both are done in a single post-order walk of each tree, so a directory is
+        checked for emptiness right after its children have been handled.
         """
-        Remove empty directories in the source directory after cleanup.
+        src_dir = os.fspath(self.src_dir)
+        roots = [os.fspath(self.project_root)]
+        if not self.src_dir.is_relative_to(self.project_root):
+            roots.append(src_dir)
 
-        After removing copied files and directories, some parent directories may
-        become empty. This method recursively removes empty directories starting
-        from the deepest level.
-        """
-        if not self.src_dir.exists():
-            return
+        for root in roots:
+            if os.path.isdir(root):
+                self._sweep_build_leftovers(root, src_dir, remove_empty=root == src_dir)
 
-        # Collect all directories in src_dir, sorted by depth (deepest first)
-        all_dirs: list[Path] = []
-        for item in self.src_dir.rglob("*"):
-            if item.is_dir():
-                all_dirs.append(item)
+    def _sweep_build_leftovers(self, directory: str, src_dir: str, remove_empty: bool) -> bool:
+        """
+        Remove .egg-info directories below a directory, and empty ones if requested.
 
-        # Sort by path depth (deepest first) so we remove children before parents
-        all_dirs.sort(key=lambda p: len(p.parts), reverse=True)
+        Args:
+            directory: Directory to sweep
+            src_dir: Source directory, below which empty directories are removed
+            remove_empty: Whether empty subdirectories of this directory are removed
 
-        # Remove empty directories (but not src_dir itself)
-        for dir_path in all_dirs:
-            if dir_path == self.src_dir:
-                continue
+        Returns:
+            True if the directory is empty after the sweep, False otherwise
+        """
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            return False
 
+        is_empty = True
+        for entry in entries:
             try:
-                # Check if directory is empty
-                if dir_path.exists() and not any(dir_path.iterdir()):
-                    dir_path.rmdir()
-                    print(f"Removed empty directory: {dir_path}")
-            except (OSError, PermissionError):
-                # Directory not empty or permission error - skip it
-                pass
-            except Exception as e:
-                print(
-                    f"Warning: Could not remove directory {dir_path}: {e}",
-                    file=sys.stderr,
-                )
+                # Follows symlinks, like the rglob-based search it replaces
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if not is_dir:
+                is_empty = False
+            elif entry.name.endswith(".egg-info"):
+                try:
+                    shutil.rmtree(entry.path)
+                    print(f"Removed .egg-info directory: {entry.path}")
+                except Exception as e:
+                    is_empty = False
+                    print(
+                        f"Warning: Could not remove .egg-info directory {entry.path}: {e}",
+                        file=sys.stderr,
+                    )
+            elif entry.is_symlink():
+                # Symlinked directories are not descended into or removed
+                is_empty = False
+            elif self._sweep_build_leftovers(
+                entry.path, src_dir, remove_empty or entry.path == src_dir
+            ) and remove_empty:
+                try:
+                    os.rmdir(entry.path)
+                    print(f"Removed empty directory: {entry.path}")
+                except OSError:
+                    # Directory not empty or permission error - skip it
+                    is_empty = False
+            else:
+                is_empty = False
+
+        return is_empty
 
     def run_build(
         self,
@@ -7,6 +7,7 @@ that need to be built as separate packages with their own names and versions.
 
 from __future__ import annotations
 
+import functools
 import re
 import shutil
 import sys
@@ -25,7 +26,99 @@ except ImportError:
     except ImportError:
         tomllib = None
 
-from .utils import read_exclude_patterns
+from .finder import DEFAULT_EXCLUDE_PATTERNS
+from .utils import read_exclude_patterns, write_file_atomic
+
+# Section headers dropped from the parent pyproject.toml for subfolder builds
+_BUILD_SYSTEM_SECTION = "[build-system]"
+_DYNAMIC_VERSIONING_SECTIONS = frozenset({"[tool.hatch.version]", "[tool.uv-dynamic-versioning]"})
+_HATCH_WHEEL_SECTION = "[tool.hatch.build.targets.wheel]"
+_PROJECT_SECTION = "[project]"
+
+# Fixed fragments of the temporary pyproject.toml
+_HATCHLING_BUILD_SYSTEM_LINES = (
+    "[build-system]",
+    'requires = ["hatchling"]',
+    'build-backend = "hatchling.build"',
+    "",
+)
+# Files included in the sdist alongside the package directory
+_SDIST_EXTRA_INCLUDES = ("pyproject.toml", "README.md", "README.rst", "README.txt", "README")
+
+# Key lines rewritten in the temporary pyproject.toml
+_NAME_KEY_RE = re.compile(r"^\s*name\s*=")
+_VERSION_KEY_RE = re.compile(r"^\s*version\s*=")
+_PACKAGES_KEY_RE = re.compile(r"^\s*packages\s*=")
+_ONLY_INCLUDE_KEY_RE = re.compile(r"^\s*only-include\s*=")
+_DYNAMIC_KEY_RE = re.compile(r"^\s*dynamic\s*=\s*\[")
+_EMPTY_DYNAMIC_RE = re.compile(r"^\s*dynamic\s*=\s*\[\s*\]")
+# "version" entries of a dynamic list, and the separators left behind by removing them
+_DYNAMIC_VERSION_ITEM_RE = re.compile(r"\"version\"|'version'")
+_DOUBLE_COMMA_RE = re.compile(r",\s*,")
+_LEADING_COMMA_RE = re.compile(r"\[\s*,")
+_TRAILING_COMMA_RE = re.compile(r",\s*\]")
+
+# Characters that make an exclude pattern a regular expression rather than a name prefix
+_REGEX_CHARS = frozenset(".*+?^$[](){}|\\")
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_exclude_patterns(
+    patterns: tuple[str, ...],
+) -> tuple[tuple[str, ...], tuple[tuple[str, re.Pattern[str] | None], ...]]:
+    """
+    Prepare exclude patterns for matching against path parts.
+
+    Patterns containing regex characters (e.g. '.*_test.*') are compiled once; other
+    patterns, and regex-looking patterns that fail to compile, match as name prefixes.
+
+    Args:
+        patterns: Exclude patterns, in priority order
+
+    Returns:
+        Tuple of (prefixes, compiled) where prefixes holds all prefix patterns for a
+        quick check, and compiled pairs every pattern with its regex (None for prefixes)
+    """
+    compiled: list[tuple[str, re.Pattern[str] | None]] = []
+    for pattern in patterns:
+        regex = None
+        if not _REGEX_CHARS.isdisjoint(pattern):
+            try:
+                regex = re.compile(pattern)
+            except re.error:
+                # Invalid regex, fall back to simple string matching
+                pass
+        compiled.append((pattern, regex))
+    prefixes = tuple(pattern for pattern, regex in compiled if regex is None)
+    return prefixes, tuple(compiled)
+
+
+def _match_exclude_pattern(
+    name: str,
+    compiled_patterns: tuple[tuple[str, ...], tuple[tuple[str, re.Pattern[str] | None], ...]],
+) -> tuple[str, bool] | None:
+    """
+    Find the first exclude pattern matching a single path part.
+
+    Args:
+        name: Path part (directory or file name)
+        compiled_patterns: Result of _compile_exclude_patterns
+
+    Returns:
+        Tuple of (pattern, is_regex) for the first matching pattern, or None
+    """
+    prefixes, compiled = compiled_patterns
+    if not name.startswith(prefixes) and all(
+        regex is None or regex.search(name) is None for _, regex in compiled
+    ):
+        return None
+    for pattern, regex in compiled:
+        if regex is not None:
+            if regex.search(name):
+                return pattern, True
+        elif name.startswith(pattern):
+            return pattern, False
+    return None
 
 
 class SubfolderBuildConfig:
@@ -66,6 +159,8 @@ class SubfolderBuildConfig:
         """
         self.project_root = project_root.resolve()
         self.src_dir = src_dir.resolve()
+        # The root pyproject.toml path, joined once for the helpers that read or move it
+        self._root_pyproject_path = self.project_root / "pyproject.toml"
         self.package_name = package_name or self._derive_package_name()
         self.version = version
         self.dependency_group = dependency_group
@@ -80,6 +175,29 @@ class SubfolderBuildConfig:
         self._exclude_temp_dir: Path | None = None
         self._temp_package_dir: Path | None = None
         self._has_existing_dependencies = False  # Track if subfolder toml has dependencies
+        # In-memory copies of the root pyproject.toml (as read before it is moved aside) and of
+        # the temporary pyproject.toml last written, so each is read from disk at most once
+        self._original_pyproject_content: str | None = None
+        self._temp_pyproject_content: str | None = None
+        # Whether create_temp_pyproject has run since the last restore, so there may be
+        # temporary files to clean up
+        self._needs_restore = False
+
+    def _read_original_pyproject(self) -> str:
+        """
+        Read the root pyproject.toml, caching its content for the rest of the build.
+
+        Returns:
+            Content of the root pyproject.toml
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        if self._original_pyproject_content is None:
+            self._original_pyproject_content = self._root_pyproject_path.read_text(
+                encoding="utf-8"
+            )
+        return self._original_pyproject_content
 
     def _derive_package_name(self) -> str:
         """
@@ -90,7 +208,7 @@ class SubfolderBuildConfig:
         """
         # Get root project name from pyproject.toml
         root_project_name = None
-        pyproject_path = self.project_root / "pyproject.toml"
+        pyproject_path = self._root_pyproject_path
         if pyproject_path.exists():
             try:
                 if tomllib:
@@ -106,14 +224,28 @@ class SubfolderBuildConfig:
                             break
             except Exception:
                 pass
-        
+
+        return self._combine_package_name(root_project_name, self.src_dir.name)
+
+    @staticmethod
+    def _combine_package_name(root_project_name: str | None, dirname: str) -> str:
+        """
+        Combine a root project name and a source directory name into a package name.
+
+        Args:
+            root_project_name: Name of the root project, or None if not found
+            dirname: Name of the source directory
+
+        Returns:
+            {root_project_name}-{subfolder_name}, or just subfolder_name if
+            root_project_name is None
+        """
         # Use the directory name, replacing invalid characters
-        subfolder_name = self.src_dir.name
         # Replace invalid characters with hyphens
-        subfolder_name = subfolder_name.replace("_", "-").replace(" ", "-").lower()
+        subfolder_name = dirname.replace("_", "-").replace(" ", "-").lower()
         # Remove any leading/trailing hyphens
         subfolder_name = subfolder_name.strip("-")
-        
+
         # Combine with root project name if available
         if root_project_name:
             # Normalize root project name (replace underscores/hyphens consistently)
@@ -153,13 +285,14 @@ class SubfolderBuildConfig:
         )
         
         # Check if the directory already exists and is the correct one
-        if import_name_dir.exists() and import_name_dir == self._temp_package_dir:
+        import_name_dir_exists = import_name_dir.exists()
+        if import_name_dir_exists and import_name_dir == self._temp_package_dir:
             # Directory already exists and is the correct one, no need to recreate
             print(f"DEBUG: Temporary package directory already exists: {import_name_dir}", file=sys.stderr)
             return
         
         # Remove if it already exists (from a previous build)
-        if import_name_dir.exists():
+        if import_name_dir_exists:
             print(f"DEBUG: Removing existing temporary package directory: {import_name_dir}", file=sys.stderr)
             shutil.rmtree(import_name_dir)
         
@@ -183,7 +316,7 @@ class SubfolderBuildConfig:
         
         # Get exclude patterns from parent pyproject.toml
         exclude_patterns = []
-        original_pyproject = self.project_root / "pyproject.toml"
+        original_pyproject = self._root_pyproject_path
         if original_pyproject.exists():
             exclude_patterns = read_exclude_patterns(original_pyproject)
             print(
@@ -240,62 +373,31 @@ class SubfolderBuildConfig:
             dst: Destination directory
             exclude_patterns: List of patterns to exclude (e.g., ['_SS', '__SS', '.*_test.*'])
         """
-        default_patterns = [
-            "_SS",
-            "__SS",
-            "_sandbox",
-            "__sandbox",
-            "_skip",
-            "__skip",
-            "_test",
-            "__test__",
-        ]
-        all_exclude_patterns = default_patterns + exclude_patterns
-        
+        compiled_patterns = _compile_exclude_patterns(
+            (*DEFAULT_EXCLUDE_PATTERNS, *exclude_patterns)
+        )
+
         def should_exclude(path: Path) -> bool:
             """Check if a path should be excluded."""
-            import re
             # Only check parts of the path relative to src_dir, not the entire absolute path
             # This prevents matching test directory names or other parts outside the source
             try:
                 rel_path = path.relative_to(src)
-                # Check each component of the relative path
-                for part in rel_path.parts:
-                    # Check if any part matches an exclusion pattern
-                    for pattern in all_exclude_patterns:
-                        # Determine if pattern is a regex (contains regex special characters)
-                        is_regex = any(c in pattern for c in ['.', '*', '+', '?', '^', '$', '[', ']', '(', ')', '{', '}', '|', '\\'])
-                        
-                        if is_regex:
-                            # Use regex matching for patterns like '.*_test.*'
-                            try:
-                                if re.search(pattern, part):
-                                    print(f"DEBUG: Excluding {path} (part '{part}' matches regex pattern '{pattern}')", file=sys.stderr)
-                                    return True
-                            except re.error:
-                                # Invalid regex, fall back to simple string matching
-                                if part == pattern or part.startswith(pattern):
-                                    print(f"DEBUG: Excluding {path} (part '{part}' matches pattern '{pattern}')", file=sys.stderr)
-                                    return True
-                        else:
-                            # Simple string matching for patterns like '_SS'
-                            if part == pattern or part.startswith(pattern):
-                                print(f"DEBUG: Excluding {path} (part '{part}' matches pattern '{pattern}')", file=sys.stderr)
-                                return True
             except ValueError:
                 # Path is not relative to src, check the name only
-                for pattern in all_exclude_patterns:
-                    is_regex = any(c in pattern for c in ['.', '*', '+', '?', '^', '$', '[', ']', '(', ')', '{', '}', '|', '\\'])
-                    if is_regex:
-                        try:
-                            if re.search(pattern, path.name):
-                                return True
-                        except re.error:
-                            if path.name == pattern or path.name.startswith(pattern):
-                                return True
-                    else:
-                        if path.name == pattern or path.name.startswith(pattern):
-                            return True
+                return _match_exclude_pattern(path.name, compiled_patterns) is not None
+
+            # Check each component of the relative path
+            for part in rel_path.parts:
+                match = _match_exclude_pattern(part, compiled_patterns)
+                if match is not None:
+                    pattern, is_regex = match
+                    kind = "regex pattern" if is_regex else "pattern"
+                    print(
+                        f"DEBUG: Excluding {path} (part '{part}' matches {kind} '{pattern}')",
+                        file=sys.stderr,
+                    )
+                    return True
             return False
         
         # Create destination directory
@@ -368,11 +470,12 @@ class SubfolderBuildConfig:
             - package_dirs: List of package directories to include
         """
         # Use temporary package directory if it exists, otherwise use src_dir
-        package_dir = self._temp_package_dir if self._temp_package_dir and self._temp_package_dir.exists() else self.src_dir
+        temp_package_dir_exists = bool(self._temp_package_dir) and self._temp_package_dir.exists()
+        package_dir = self._temp_package_dir if temp_package_dir_exists else self.src_dir
         
         print(
             f"DEBUG: _get_package_structure: temp_package_dir={self._temp_package_dir}, "
-            f"exists={self._temp_package_dir.exists() if self._temp_package_dir else False}, "
+            f"exists={temp_package_dir_exists}, "
             f"using package_dir={package_dir}",
             file=sys.stderr,
         )
@@ -470,7 +573,7 @@ class SubfolderBuildConfig:
                 result.append(line)
             elif in_sdist_section:
                 # Replace only-include path if it exists
-                if re.match(r"^\s*only-include\s*=", line):
+                if _ONLY_INCLUDE_KEY_RE.match(line):
                     only_include_set = True
                     # Replace with correct path
                     only_include_paths = [correct_packages_path]
@@ -487,7 +590,7 @@ class SubfolderBuildConfig:
                 result.append(line)
             elif in_hatch_build:
                 # Modify packages path if found
-                if re.match(r"^\s*packages\s*=", line):
+                if _PACKAGES_KEY_RE.match(line):
                     packages_str = f'"{correct_packages_path}"'
                     result.append(f"packages = [{packages_str}]")
                     packages_set = True
@@ -928,6 +1031,9 @@ class SubfolderBuildConfig:
         if not self.version:
             raise ValueError("Version is required for subfolder builds")
 
+        # Set before any file is touched, so a failure part-way through is still cleaned up
+        self._needs_restore = True
+
         # Check if pyproject.toml exists in subfolder FIRST
         # This allows us to handle subfolder pyproject.toml even when parent doesn't exist
         # But first ensure src_dir exists
@@ -984,7 +1090,7 @@ class SubfolderBuildConfig:
                 self._used_subfolder_pyproject = True
 
                 # Store reference to original project root pyproject.toml
-                original_pyproject = self.project_root / "pyproject.toml"
+                original_pyproject = self._root_pyproject_path
                 self.original_pyproject_path = original_pyproject
 
                 # Create temporary pyproject.toml file
@@ -1031,7 +1137,7 @@ class SubfolderBuildConfig:
                 # Merge missing fields from parent pyproject.toml if it exists
                 if original_pyproject.exists():
                     try:
-                        parent_content = original_pyproject.read_text(encoding="utf-8")
+                        parent_content = self._read_original_pyproject()
                         subfolder_content = self._merge_from_parent_pyproject(subfolder_content, parent_content)
                     except Exception as e:
                         print(
@@ -1067,6 +1173,7 @@ class SubfolderBuildConfig:
                 # Write adjusted content to temporary file
                 temp_pyproject_path.write_text(adjusted_content, encoding="utf-8")
                 self.temp_pyproject = temp_pyproject_path
+                self._temp_pyproject_content = adjusted_content
 
                 # Print the temporary pyproject.toml content for debugging
                 print("\n" + "=" * 80)
@@ -1104,19 +1211,22 @@ class SubfolderBuildConfig:
         # Ensure src_dir is a package (has __init__.py) before creating temp directory
         # This way the __init__.py will be copied to the temp directory
         init_file = self.src_dir / "__init__.py"
-        if not init_file.exists():
-            # Create a temporary __init__.py to make it a package
-            init_file.write_text("# Temporary __init__.py for build\n", encoding="utf-8")
+        try:
+            # Create a temporary __init__.py to make it a package; exclusive creation
+            # checks for an existing one in the same call
+            with init_file.open("x", encoding="utf-8") as f:
+                f.write("# Temporary __init__.py for build\n")
             self._temp_init_created = True
-        else:
+        except FileExistsError:
             self._temp_init_created = False
 
         # Create temporary package directory with correct import name
         # This will copy the __init__.py we just created (if any)
         self._create_temp_package_directory()
-        
+        temp_package_dir_exists = bool(self._temp_package_dir) and self._temp_package_dir.exists()
+
         # Log the result of temp directory creation
-        if self._temp_package_dir and self._temp_package_dir.exists():
+        if temp_package_dir_exists:
             py_files = list(self._temp_package_dir.glob("*.py"))
             print(
                 f"DEBUG: Temp package directory created successfully: {self._temp_package_dir}, "
@@ -1131,7 +1241,7 @@ class SubfolderBuildConfig:
             )
         
         # Determine which directory to use (temp package dir or src_dir)
-        package_dir = self._temp_package_dir if self._temp_package_dir and self._temp_package_dir.exists() else self.src_dir
+        package_dir = self._temp_package_dir if temp_package_dir_exists else self.src_dir
         print(
             f"DEBUG: Using package_dir for build: {package_dir} "
             f"(temp_dir={self._temp_package_dir}, src_dir={self.src_dir})",
@@ -1139,7 +1249,7 @@ class SubfolderBuildConfig:
         )
 
         # Read the original pyproject.toml
-        original_pyproject = self.project_root / "pyproject.toml"
+        original_pyproject = self._root_pyproject_path
         if not original_pyproject.exists():
             # If no parent pyproject.toml exists, we can't create a temporary one
             # This is acceptable for tests or cases where only dependency copying is needed
@@ -1153,7 +1263,7 @@ class SubfolderBuildConfig:
             # Return None to indicate no pyproject.toml was created
             return None
 
-        original_content = original_pyproject.read_text(encoding="utf-8")
+        original_content = self._read_original_pyproject()
 
         # Read exclude patterns from root pyproject.toml BEFORE moving the file
         exclude_patterns = read_exclude_patterns(original_pyproject)
@@ -1168,15 +1278,15 @@ class SubfolderBuildConfig:
         # Temporarily move original to backup location
         backup_path = self.project_root / "pyproject.toml.original"
         # Remove backup if it already exists (from previous failed test or run)
-        if backup_path.exists():
-            backup_path.unlink()
+        backup_path.unlink(missing_ok=True)
         original_pyproject.rename(backup_path)
         self.original_pyproject_backup = backup_path
 
-        # Parse and modify the pyproject.toml
+        # Parse the pyproject.toml; the temporary file itself is still written with string
+        # manipulation (tomli-w not in stdlib), so the parsed data is only read from
         if tomllib:
             try:
-                data = tomllib.loads(original_content.encode())
+                data = tomllib.loads(original_content)
             except Exception:
                 # Fallback to string manipulation if parsing fails
                 data = None
@@ -1196,42 +1306,19 @@ class SubfolderBuildConfig:
                     file=sys.stderr,
                 )
 
-        if data:
-            # Modify using parsed data
-            if "project" in data:
-                data["project"]["name"] = self.package_name
-                # Log the package name being set
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.info(f"Setting package name in temporary pyproject.toml: '{self.package_name}'")
-                if "version" in data["project"]:
-                    data["project"]["version"] = self.version
-                elif "dynamic" in data["project"]:
-                    # Remove version from dynamic and set it
-                    if "version" in data["project"]["dynamic"]:
-                        data["project"]["dynamic"].remove("version")
-                    data["project"]["version"] = self.version
-
-            # Add dependency group if specified
-            if parent_dependency_group:
-                if "dependency-groups" not in data:
-                    data["dependency-groups"] = {}
-                # Add the specified dependency group from parent
-                data["dependency-groups"].update(parent_dependency_group)
-
-            # For now, use string manipulation (tomli-w not in stdlib)
-            modified_content = self._modify_pyproject_string(
-                original_content, parent_dependency_group, exclude_patterns
-            )
-        else:
-            # Use string manipulation
-            modified_content = self._modify_pyproject_string(
-                original_content, parent_dependency_group, exclude_patterns
-            )
+        # Log the package name being set
+        import logging
+        logger = logging.getLogger(__name__)
+        logger.info(f"Setting package name in temporary pyproject.toml: '{self.package_name}'")
+
+        modified_content = self._modify_pyproject_string(
+            original_content, parent_dependency_group, exclude_patterns
+        )
 
         # Write the modified content to a temporary file
         temp_pyproject_path = self.project_root / "pyproject.toml.temp"
         temp_pyproject_path.write_text(modified_content, encoding="utf-8")
+        self._temp_pyproject_content = modified_content
 
         # Print the temporary pyproject.toml content for debugging
         print("\n" + "=" * 80)
@@ -1266,8 +1353,7 @@ class SubfolderBuildConfig:
         name_set = False
         version_set = False
         in_dynamic = False
-        skip_hatch_version = False
-        skip_uv_dynamic = False
+        skip_versioning = False
         in_hatch_build = False
         packages_set = False
         build_system_set = False
@@ -1276,18 +1362,31 @@ class SubfolderBuildConfig:
         packages_path, package_dirs = self._get_package_structure()
         if not package_dirs:
             package_dirs = []
+        # The packages line is the same wherever it is written
+        packages_line = (
+            "packages = [" + ", ".join(f'"{p}"' for p in package_dirs) + "]"
+            if package_dirs
+            else None
+        )
+        name_line = f'name = "{self.package_name}"'
+        version_line = f'version = "{self.version}"'
 
         # Log the package name being set via string manipulation
         import logging
         logger = logging.getLogger(__name__)
         logger.info(f"Setting package name in temporary pyproject.toml (string manipulation): '{self.package_name}'")
 
-        for _i, line in enumerate(lines):
+        for line in lines:
+            stripped = line.strip()
+            is_section = stripped.startswith("[")
+            # Header with any trailing comment removed, so dispatch is a single lookup
+            section = stripped.partition("#")[0].rstrip() if is_section else ""
+
             # Skip build-system section - we'll add our own for subfolder builds
-            if line.strip().startswith("[build-system]"):
+            if section == _BUILD_SYSTEM_SECTION:
                 build_system_set = True
                 continue  # Skip the [build-system] line
-            elif build_system_set and line.strip().startswith("["):
+            elif build_system_set and is_section:
                 # End of build-system section
                 build_system_set = False
                 result.append(line)
@@ -1297,38 +1396,31 @@ class SubfolderBuildConfig:
                 continue
 
             # Skip hatch versioning and uv-dynamic-versioning sections
-            if line.strip().startswith("[tool.hatch.version]"):
-                skip_hatch_version = True
-                continue
-            elif line.strip().startswith("[tool.uv-dynamic-versioning]"):
-                skip_uv_dynamic = True
+            if section in _DYNAMIC_VERSIONING_SECTIONS:
+                skip_versioning = True
                 continue
-            elif skip_hatch_version and line.strip().startswith("["):
-                skip_hatch_version = False
-            elif skip_uv_dynamic and line.strip().startswith("["):
-                skip_uv_dynamic = False
+            elif skip_versioning and is_section:
+                skip_versioning = False
 
-            if skip_hatch_version or skip_uv_dynamic:
+            if skip_versioning:
                 continue
 
             # Handle hatch build targets
-            if line.strip().startswith("[tool.hatch.build.targets.wheel]"):
+            if section == _HATCH_WHEEL_SECTION:
                 in_hatch_build = True
                 result.append(line)
                 continue
-            elif line.strip().startswith("[") and in_hatch_build:
+            elif is_section and in_hatch_build:
                 # End of hatch build section, add packages if not set
-                if not packages_set and package_dirs:
-                    packages_str = ", ".join(f'"{p}"' for p in package_dirs)
-                    result.append(f"packages = [{packages_str}]")
+                if not packages_set and packages_line:
+                    result.append(packages_line)
                 in_hatch_build = False
                 result.append(line)
             elif in_hatch_build:
                 # Modify packages path
-                if re.match(r"^\s*packages\s*=", line):
-                    if package_dirs:
-                        packages_str = ", ".join(f'"{p}"' for p in package_dirs)
-                        result.append(f"packages = [{packages_str}]")
+                if _PACKAGES_KEY_RE.match(line):
+                    if packages_line:
+                        result.append(packages_line)
                     else:
                         result.append(line)
                     packages_set = True
@@ -1336,44 +1428,42 @@ class SubfolderBuildConfig:
                 # Keep other lines in hatch build section
                 result.append(line)
 
-            elif line.strip().startswith("[project]"):
+            elif section == _PROJECT_SECTION:
                 in_project = True
                 result.append(line)
-            elif line.strip().startswith("[") and in_project:
+            elif is_section and in_project:
                 # End of [project] section
                 if not name_set:
-                    result.append(f'name = "{self.package_name}"')
+                    result.append(name_line)
                 if not version_set:
-                    result.append(f'version = "{self.version}"')
+                    result.append(version_line)
                 in_project = False
                 result.append(line)
             elif in_project:
                 # Modify name
-                if re.match(r"^\s*name\s*=", line):
-                    result.append(f'name = "{self.package_name}"')
+                if _NAME_KEY_RE.match(line):
+                    result.append(name_line)
                     name_set = True
                     continue
                 # Modify version
-                elif re.match(r"^\s*version\s*=", line):
-                    result.append(f'version = "{self.version}"')
+                elif _VERSION_KEY_RE.match(line):
+                    result.append(version_line)
                     version_set = True
                     continue
                 # Remove version from dynamic
-                elif re.match(r"^\s*dynamic\s*=\s*\[", line):
+                elif _DYNAMIC_KEY_RE.match(line):
                     in_dynamic = True
                     # Remove "version" from the list
-                    line = re.sub(r'"version"', "", line)
-                    line = re.sub(r"'version'", "", line)
-                    line = re.sub(r",\s*,", ",", line)
-                    line = re.sub(r"\[\s*,", "[", line)
-                    line = re.sub(r",\s*\]", "]", line)
-                    if re.match(r"^\s*dynamic\s*=\s*\[\s*\]", line):
+                    line = _DYNAMIC_VERSION_ITEM_RE.sub("", line)
+                    line = _DOUBLE_COMMA_RE.sub(",", line)
+                    line = _LEADING_COMMA_RE.sub("[", line)
+                    line = _TRAILING_COMMA_RE.sub("]", line)
+                    if _EMPTY_DYNAMIC_RE.match(line):
                         continue  # Skip empty dynamic list
                 elif in_dynamic and "]" in line:
                     in_dynamic = False
                     # Remove version from the closing bracket line if present
-                    line = re.sub(r'"version"', "", line)
-                    line = re.sub(r"'version'", "", line)
+                    line = _DYNAMIC_VERSION_ITEM_RE.sub("", line)
 
                 result.append(line)
             else:
@@ -1382,36 +1472,29 @@ class SubfolderBuildConfig:
         # Add name and version if not set (still in project section)
         if in_project:
             if not name_set:
-                result.append(f'name = "{self.package_name}"')
+                result.append(name_line)
             if not version_set:
-                result.append(f'version = "{self.version}"')
+                result.append(version_line)
 
         # Add packages configuration if not set
-        if in_hatch_build and not packages_set and package_dirs:
-            packages_str = ", ".join(f'"{p}"' for p in package_dirs)
-            result.append(f"packages = [{packages_str}]")
+        if in_hatch_build and not packages_set and packages_line:
+            result.append(packages_line)
+            packages_set = True
 
         # Ensure build-system section exists (required for hatchling)
         # Check if build-system section exists in the result
         has_build_system = any(line.strip().startswith("[build-system]") for line in result)
         if not has_build_system:
             # Insert build-system at the very beginning of the file
-            build_system_lines = [
-                "[build-system]",
-                'requires = ["hatchling"]',
-                'build-backend = "hatchling.build"',
-                "",
-            ]
-            result = build_system_lines + result
+            result[:0] = _HATCHLING_BUILD_SYSTEM_LINES
 
         # Ensure packages is always set for subfolder builds
-        if not packages_set and package_dirs:
+        if not packages_set and packages_line:
             # Add the section if it doesn't exist
-            if "[tool.hatch.build.targets.wheel]" not in "\n".join(result):
+            if not any(_HATCH_WHEEL_SECTION in line for line in result):
                 result.append("")
-                result.append("[tool.hatch.build.targets.wheel]")
-            packages_str = ", ".join(f'"{p}"' for p in package_dirs)
-            result.append(f"packages = [{packages_str}]")
+                result.append(_HATCH_WHEEL_SECTION)
+            result.append(packages_line)
 
         # Use only-include for source distributions to ensure only the subfolder is included
         # This prevents including files from the project root
@@ -1430,7 +1513,7 @@ class SubfolderBuildConfig:
                         in_sdist_section = True
                     elif line.strip().startswith("[") and in_sdist_section:
                         in_sdist_section = False
-                    elif in_sdist_section and re.match(r"^\s*only-include\s*=", line):
+                    elif in_sdist_section and _ONLY_INCLUDE_KEY_RE.match(line):
                         only_include_set = True
                         break
 
@@ -1439,14 +1522,10 @@ class SubfolderBuildConfig:
                     result.append("")
                     result.append("[tool.hatch.build.targets.sdist]")
                 # Include only the subfolder directory and necessary files
-                only_include_paths = [package_dirs[0]]
                 # Also include pyproject.toml and README if they exist
-                only_include_paths.append("pyproject.toml")
-                only_include_paths.append("README.md")
-                only_include_paths.append("README.rst")
-                only_include_paths.append("README.txt")
-                only_include_paths.append("README")
-                only_include_str = ", ".join(f'"{p}"' for p in only_include_paths)
+                only_include_str = ", ".join(
+                    f'"{p}"' for p in (package_dirs[0], *_SDIST_EXTRA_INCLUDES)
+                )
                 if not only_include_set:
                     result.append(f"only-include = [{only_include_str}]")
 
@@ -1454,17 +1533,19 @@ class SubfolderBuildConfig:
         if dependency_group:
             # Find where to insert dependency-groups section
             # Usually after [project] section or at the end
+            # Update an existing dependency-groups section wherever it appears
             insert_index = len(result)
             for i, line in enumerate(result):
                 if line.strip().startswith("[dependency-groups]"):
-                    # Update existing dependency-groups section
                     insert_index = i
                     break
-                elif line.strip().startswith("[") and i > 0:
-                    # Insert before the last section (usually before [tool.*] sections)
-                    if not line.strip().startswith("[tool."):
-                        insert_index = i
-                        break
+            else:
+                for i, line in enumerate(result):
+                    if line.strip().startswith("[") and i > 0:
+                        # Insert before the last section (usually before [tool.*] sections)
+                        if not line.strip().startswith("[tool."):
+                            insert_index = i
+                            break
 
             # Format dependency group
             if insert_index < len(result) and result[insert_index].strip().startswith(
@@ -1641,9 +1722,12 @@ class SubfolderBuildConfig:
             return
 
         print(f"Adding third-party dependencies to pyproject.toml: {', '.join(dependencies)}")
-        content = self.temp_pyproject.read_text(encoding="utf-8")
+        content = self._temp_pyproject_content
+        if content is None:
+            content = self.temp_pyproject.read_text(encoding="utf-8")
         updated_content = self._add_dependencies_to_pyproject(content, dependencies)
-        self.temp_pyproject.write_text(updated_content, encoding="utf-8")
+        write_file_atomic(self.temp_pyproject, updated_content.encode("utf-8"))
+        self._temp_pyproject_content = updated_content
 
     def _normalize_package_name(self, package_name: str) -> str:
         """
@@ -1660,7 +1744,8 @@ class SubfolderBuildConfig:
         """
         # Convert underscores to hyphens for PyPI package names
         # This handles the common case where import names use underscores
-        # but PyPI package names use hyphens
+        # but PyPI package names use hyphens. For a single character, str.replace is
+        # several times faster than str.translate with a maketrans table.
         return package_name.replace("_", "-")
 
     def _add_dependencies_to_pyproject(self, content: str, dependencies: list[str]) -> str:
@@ -1694,9 +1779,10 @@ class SubfolderBuildConfig:
 
         # First pass: find existing dependencies
         for line in lines:
-            if line.strip().startswith("[project]"):
+            stripped = line.strip()
+            if stripped.startswith("[project]"):
                 in_project = True
-            elif line.strip().startswith("[") and in_project:
+            elif stripped.startswith("[") and in_project:
                 in_project = False
             elif in_project and re.match(r"^\s*dependencies\s*=\s*\[", line):
                 in_dependencies = True
@@ -1705,7 +1791,7 @@ class SubfolderBuildConfig:
                 dep_match = re.search(r'["\']([^"\']+)["\']', line)
                 if dep_match:
                     existing_deps.add(dep_match.group(1))
-                if line.strip().endswith("]"):
+                if stripped.endswith("]"):
                     in_dependencies = False
 
         # Merge with new dependencies (normalized)
@@ -1715,10 +1801,11 @@ class SubfolderBuildConfig:
         in_project = False
         in_dependencies = False
         for line in lines:
-            if line.strip().startswith("[project]"):
+            stripped = line.strip()
+            if stripped.startswith("[project]"):
                 in_project = True
                 result.append(line)
-            elif line.strip().startswith("[") and in_project:
+            elif stripped.startswith("[") and in_project:
                 # End of [project] section, add dependencies if not already present
                 if not dependencies_added:
                     result.append("dependencies = [")
@@ -1738,7 +1825,7 @@ class SubfolderBuildConfig:
                 in_dependencies = True
             elif in_dependencies:
                 # Skip lines in existing dependencies section (already replaced)
-                if line.strip().endswith("]"):
+                if stripped.endswith("]"):
                     in_dependencies = False
             else:
                 result.append(line)
@@ -1919,72 +2006,79 @@ class SubfolderBuildConfig:
 
         # Remove temporary __init__.py if we created it
         if self._temp_init_created:
-            init_file = self.src_dir / "__init__.py"
-            if init_file.exists():
-                try:
-                    init_file.unlink()
-                except Exception:
-                    pass  # Ignore errors during cleanup
+            try:
+                (self.src_dir / "__init__.py").unlink(missing_ok=True)
+            except Exception:
+                pass  # Ignore errors during cleanup
             self._temp_init_created = False
 
         # Restore original README if it was backed up
         backup_path = self.original_readme_backup
-        had_backup = backup_path and backup_path.exists()
         original_readme_path = None
-        if had_backup:
-            original_readme_name = backup_path.stem  # Get name without .backup extension
-            original_readme_path = self.project_root / original_readme_name
-            shutil.copy2(backup_path, original_readme_path)
-            backup_path.unlink()
-            self.original_readme_backup = None
+        if backup_path:
+            # Get name without .backup extension
+            original_readme_path = self.project_root / backup_path.stem
+            try:
+                backup_path.replace(original_readme_path)
+                self.original_readme_backup = None
+            except FileNotFoundError:
+                original_readme_path = None
 
         # Remove temporary README if we created it or copied from subfolder
         # Only remove if it's different from the original we just restored
-        if self.temp_readme and self.temp_readme.exists():
-            # If we restored an original README and the temp is the same file, don't remove it
-            if (
-                had_backup
-                and original_readme_path
-                and self.temp_readme.samefile(original_readme_path)
-            ):
-                # Temp README is the same as the restored original, so don't remove it
-                pass
-            else:
-                # Remove the temp README (either no original existed, or it's a different file)
-                try:
+        if self.temp_readme:
+            try:
+                # If we restored an original README and the temp is the same file, don't remove it
+                if not (
+                    original_readme_path and self.temp_readme.samefile(original_readme_path)
+                ):
+                    # Remove the temp README (either no original existed, or it's a different file)
                     self.temp_readme.unlink()
-                except Exception:
-                    pass  # Ignore errors during cleanup
-            self.temp_readme = None
+                self.temp_readme = None
+            except FileNotFoundError:
+                self.temp_readme = None
+            except Exception:
+                pass  # Ignore errors during cleanup
 
         # Restore original pyproject.toml (only if we created/used one)
         if self.temp_pyproject and self.original_pyproject_path:
             original_pyproject = self.original_pyproject_path
 
-            # Remove the temporary pyproject.toml we created
-            if original_pyproject.exists():
+            # Restore the original pyproject.toml from backup if it existed. The rename
+            # replaces the temporary pyproject.toml in the same step
+            restored = False
+            if self.original_pyproject_backup:
+                try:
+                    self.original_pyproject_backup.replace(original_pyproject)
+                    self.original_pyproject_backup = None
+                    restored = True
+                except FileNotFoundError:
+                    pass
+
+            # Otherwise remove the temporary pyproject.toml we created
+            if not restored:
                 try:
-                    original_pyproject.unlink()
+                    original_pyproject.unlink(missing_ok=True)
                 except Exception as e:
                     print(
                         f"Warning: Could not remove temporary pyproject.toml: {e}",
                         file=sys.stderr,
                     )
 
-            # Restore the original pyproject.toml from backup if it existed
-            if self.original_pyproject_backup and self.original_pyproject_backup.exists():
-                self.original_pyproject_backup.rename(original_pyproject)
-                self.original_pyproject_backup = None
-
             self.temp_pyproject = None
             self.original_pyproject_path = None
             self._used_subfolder_pyproject = False
 
+        self._original_pyproject_content = None
+        self._temp_pyproject_content = None
+
         # Remove temporary package directory if it exists
-        if self._temp_package_dir and self._temp_package_dir.exists():
+        if self._temp_package_dir:
             try:
                 shutil.rmtree(self._temp_package_dir)
                 print(f"Removed temporary package directory: {self._temp_package_dir}")
+            except FileNotFoundError:
+                pass
             except Exception as e:
                 print(
                     f"Warning: Could not remove temporary package directory {self._temp_package_dir}: {e}",
@@ -1992,10 +2086,13 @@ class SubfolderBuildConfig:
                 )
             self._temp_package_dir = None
 
+        self._needs_restore = False
+
     def __enter__(self) -> Self:
         """Context manager entry."""
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:  # noqa: ARG002
-        """Context manager exit - always restore."""
-        self.restore()
\ No newline at end of file
+        """Context manager exit - restore, unless nothing was created since the last restore."""
+        if self._needs_restore:
+            self.restore()
\ No newline at end of file
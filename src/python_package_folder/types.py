@@ -12,7 +12,7 @@ from pathlib import Path
 from typing import Literal
 
 
-@dataclass
+@dataclass(slots=True)
 class ImportInfo:
     """
     Information about a detected import statement.
@@ -44,7 +44,7 @@ class ImportInfo:
     resolved_path: Path | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ExternalDependency:
     """
     Information about an external dependency that needs to be copied.
@@ -4,6 +4,10 @@ Utility functions for project discovery and path resolution.
 
 from __future__ import annotations
 
+import os
+import shutil
+import tempfile
+from collections.abc import Callable, Iterator
 from pathlib import Path
 
 try:
@@ -31,20 +35,17 @@ def find_project_root(start_path: Path | None = None) -> Path | None:
     if start_path is None:
         start_path = Path.cwd()
 
-    current = Path(start_path).resolve()
+    current = os.fspath(Path(start_path).resolve())
 
-    # Walk up the directory tree
-    while current != current.parent:
-        pyproject_path = current / "pyproject.toml"
-        if pyproject_path.exists():
-            return current
-        current = current.parent
-
-    # Check the root directory itself
-    if (current / "pyproject.toml").exists():
-        return current
-
-    return None
+    # Walk up the directory tree, root directory included, on strings: a Path is only
+    # created for the directory that is found
+    while True:
+        if os.path.exists(os.path.join(current, "pyproject.toml")):
+            return Path(current)
+        parent = os.path.dirname(current)
+        if parent == current:
+            return None
+        current = parent
 
 
 def find_source_directory(project_root: Path, current_dir: Path | None = None) -> Path | None:
@@ -92,6 +93,84 @@ def find_source_directory(project_root: Path, current_dir: Path | None = None) -
     return None
 
 
+def write_file_atomic(path: Path, data: bytes) -> None:
+    """
+    Replace a file's content so readers never see a partially written file.
+
+    The data is written in a single call to a uniquely named temporary file next to the
+    real file (the symlink target, if path is a symlink), which takes the file's
+    permissions and then replaces it. A hard-linked file is written in place instead,
+    since replacing it would break the link.
+
+    Args:
+        path: File to write, which must exist
+        data: New file content
+    """
+    target = path.resolve()
+    if target.stat().st_nlink > 1:
+        with open(target, "wb", buffering=131072) as f:
+            f.write(data)
+        return
+
+    temp_file = tempfile.NamedTemporaryFile(
+        dir=target.parent,
+        prefix=f"{target.name}.",
+        suffix=".tmp",
+        delete=False,
+        buffering=131072,
+    )
+    try:
+        with temp_file:
+            temp_file.write(data)
+        shutil.copymode(target, temp_file.name)
+        os.replace(temp_file.name, target)
+    except Exception:
+        os.unlink(temp_file.name)
+        raise
+
+
+def iter_python_file_entries(
+    directory: str | os.PathLike[str], is_excluded: Callable[[str], bool] | None = None
+) -> Iterator[os.DirEntry[str]]:
+    """
+    Yield the directory entries of the .py files in a directory tree.
+
+    Walks depth-first in the same order as Path.rglob("*.py") without creating a Path
+    for every entry. Symlinked directories are not descended into, and unreadable
+    directories are skipped. Each directory's files are yielded once its handle is
+    closed.
+
+    Args:
+        directory: Root of the directory tree
+        is_excluded: Called with each entry name below the root; matching directories
+            are not descended into and matching files are skipped
+
+    Yields:
+        Directory entries of the Python files found
+    """
+    stack = [os.fspath(directory)]
+    while stack:
+        subdirs = []
+        python_files = []
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if is_excluded is not None and is_excluded(name):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif name.endswith(".py") and entry.is_file():
+                            python_files.append(entry)
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+        yield from python_files
+        stack.extend(reversed(subdirs))
+
+
 def is_python_package_directory(path: Path) -> bool:
     """
     Check if a directory contains Python package files.
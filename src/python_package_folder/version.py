@@ -7,7 +7,11 @@ in pyproject.toml files.
 
 from __future__ import annotations
 
+import io
+import os
 import re
+import string
+from collections import OrderedDict
 from pathlib import Path
 
 try:
@@ -18,6 +22,62 @@ except ImportError:
     except ImportError:
         tomllib = None
 
+from .utils import write_file_atomic
+
+# Basic PEP 440 validation regex, kept as the reference grammar for _validate_version
+# Allows: 1.2.3, 1.2.3a1, 1.2.3b2, 1.2.3rc1, 1.2.3.post1, 1.2.3.dev1
+# Quantifiers are possessive (Python 3.11+): no valid version needs backtracking.
+# Groups are non-capturing since only a match/no-match answer is ever needed.
+_PEP440_RE = re.compile(
+    r"^(?:\d++!)?+\d++(?:\.\d++)*+(?:[a-zA-Z]++\d++)?+(?:\.post\d++)?+(?:\.dev\d++)?+$"
+)
+
+# Comma clean-up patterns used when removing "version" from a dynamic list
+_DOUBLE_COMMA_RE = re.compile(r",\s*,")
+_LEAD_COMMA_RE = re.compile(r"\[\s*,")
+_TRAIL_COMMA_RE = re.compile(r",\s*\]")
+
+# Headers of the sections dropped when a static version is set
+_DYNAMIC_VERSIONING_SECTIONS = ("[tool.hatch.version]", "[tool.uv-dynamic-versioning]")
+
+# Version assignment, used to read the version when tomllib isn't available
+_VERSION_ASSIGNMENT_RE = re.compile(r'version\s*=\s*["\']([^"\']+)["\']')
+
+# Parsed pyproject.toml files shared by all VersionManager instances, keyed by
+# (path, mtime_ns, size) and evicted least-recently-used beyond _PARSE_CACHE_SIZE entries
+_PARSE_CACHE: OrderedDict[tuple[str, int, int], dict] = OrderedDict()
+_PARSE_CACHE_SIZE = 32
+
+# Characters of a plain release version (e.g. 1.2.3), which can be validated without the regex
+_SIMPLE_VERSION_CHARS = frozenset("0123456789.")
+
+
+def _store_parsed(key: tuple[str, int, int], data: dict) -> None:
+    """Add parsed pyproject.toml data to _PARSE_CACHE, evicting the oldest entry when full."""
+    _PARSE_CACHE[key] = data
+    if len(_PARSE_CACHE) > _PARSE_CACHE_SIZE:
+        _PARSE_CACHE.popitem(last=False)
+
+
+def _assignment_value(stripped: str, key: str) -> str | None:
+    """
+    Get the value text of a 'key = value' line without using a regex.
+
+    Args:
+        stripped: Line with leading whitespace removed
+        key: Key name to look for
+
+    Returns:
+        Text after the '=' with leading whitespace removed, or None if the line
+        does not assign the given key
+    """
+    if not stripped.startswith(key):
+        return None
+    rest = stripped[len(key) :].lstrip()
+    if not rest.startswith("="):
+        return None
+    return rest[1:].lstrip()
+
 
 class VersionManager:
     """
@@ -36,6 +96,78 @@ class VersionManager:
         """
         self.project_root = project_root.resolve()
         self.pyproject_path = self.project_root / "pyproject.toml"
+        # Content and parsed TOML of pyproject.toml, valid while (mtime_ns, size) is unchanged
+        self._cached_stat: tuple[int, int] | None = None
+        self._cached_content: str | None = None
+        self._cached_data: dict | None = None
+
+    def _read_pyproject(self) -> str:
+        """
+        Read pyproject.toml, reusing the cached content if the file has not changed.
+
+        Returns:
+            Content of pyproject.toml
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        # One fstat and one unbuffered read sized from it, instead of stat + read_text
+        fd = os.open(self.pyproject_path, os.O_RDONLY)
+        try:
+            stat = os.fstat(fd)
+            key = (stat.st_mtime_ns, stat.st_size)
+            if self._cached_content is None or key != self._cached_stat:
+                data = os.read(fd, stat.st_size)
+                while chunk := os.read(fd, 65536):
+                    data += chunk
+                content = data.decode("utf-8")
+                if "\r" in content:
+                    # Same newline translation as read_text()
+                    content = content.replace("\r\n", "\n").replace("\r", "\n")
+                self._cached_content = content
+                self._cached_stat = key
+                self._cached_data = None
+        finally:
+            os.close(fd)
+        return self._cached_content
+
+    def _parse_pyproject(self) -> dict:
+        """
+        Parse pyproject.toml with tomllib, reusing the cached result if the file has not changed.
+
+        Returns:
+            Parsed pyproject.toml data
+        """
+        content = self._read_pyproject()
+        if self._cached_data is None:
+            key = (str(self.pyproject_path), *self._cached_stat)
+            data = _PARSE_CACHE.get(key)
+            if data is None:
+                data = tomllib.loads(content)
+                _store_parsed(key, data)
+            else:
+                _PARSE_CACHE.move_to_end(key)
+            self._cached_data = data
+        return self._cached_data
+
+    def _write_pyproject(self, content: str, data: dict | None = None) -> None:
+        """
+        Atomically write pyproject.toml and keep the cache in sync with what was written.
+
+        The content is encoded once and written with write_file_atomic, which keeps a
+        symlinked or hard-linked pyproject.toml and its permissions.
+
+        Args:
+            content: New pyproject.toml content
+            data: Parsed form of content, if already known, so it needn't be parsed again
+        """
+        write_file_atomic(self.pyproject_path, content.encode("utf-8"))
+        stat = self.pyproject_path.stat()
+        self._cached_stat = (stat.st_mtime_ns, stat.st_size)
+        self._cached_content = content
+        self._cached_data = data
+        if data is not None:
+            _store_parsed((str(self.pyproject_path), *self._cached_stat), data)
 
     def get_current_version(self) -> str | None:
         """
@@ -44,20 +176,17 @@ class VersionManager:
         Returns:
             Current version string, or None if not found or using dynamic versioning
         """
-        if not self.pyproject_path.exists():
-            return None
-
+        # A missing pyproject.toml fails the read below, so it isn't checked for first
         try:
             if tomllib:
-                content = self.pyproject_path.read_bytes()
-                data = tomllib.loads(content)
+                data = self._parse_pyproject()
                 project = data.get("project", {})
                 if "version" in project:
                     return project["version"]
             else:
                 # Fallback: simple regex parsing
-                content = self.pyproject_path.read_text(encoding="utf-8")
-                match = re.search(r'version\s*=\s*["\']([^"\']+)["\']', content)
+                content = self._read_pyproject()
+                match = _VERSION_ASSIGNMENT_RE.search(content)
                 if match:
                     return match.group(1)
         except Exception:
@@ -91,16 +220,13 @@ class VersionManager:
                 "Version must be PEP 440 compliant (e.g., '1.2.3', '1.2.3a1', '1.2.3.post1')"
             )
 
-        content = self.pyproject_path.read_text(encoding="utf-8")
-
-        # Remove dynamic versioning if present
-        content = self._remove_dynamic_versioning(content)
+        content = self._read_pyproject()
 
-        # Set static version in [project] section
-        content = self._set_static_version(content, version)
+        # Remove dynamic versioning and set the static version
+        content = self._rewrite_version(content, version)
 
         # Write back to file
-        self.pyproject_path.write_text(content, encoding="utf-8")
+        self._write_pyproject(content)
 
     def _validate_version(self, version: str) -> bool:
         """
@@ -112,86 +238,113 @@ class VersionManager:
         Returns:
             True if version appears valid, False otherwise
         """
-        # Basic PEP 440 validation regex
-        # Allows: 1.2.3, 1.2.3a1, 1.2.3b2, 1.2.3rc1, 1.2.3.post1, 1.2.3.dev1
-        pep440_pattern = r"^(\d+!)?(\d+)(\.\d+)*([a-zA-Z]+\d+)?(\.post\d+)?(\.dev\d+)?$"
-        return bool(re.match(pep440_pattern, version))
+        if version and _SIMPLE_VERSION_CHARS.issuperset(version):
+            # Plain release: digit groups separated by single dots
+            return version[0].isdigit() and version[-1].isdigit() and ".." not in version
+        if not version.isascii() or version.endswith("\n"):
+            # Leave Unicode digits and the regex's trailing-newline tolerance to the regex
+            return _PEP440_RE.match(version) is not None
+
+        # Hand-written equivalent of _PEP440_RE: peel [N!] off the front and
+        # [.postN][.devN] off the back, then check N(.N)*[lettersN]
+        epoch, sep, rest = version.partition("!")
+        if not sep:
+            rest = epoch
+        elif not epoch.isdigit():
+            return False
+
+        for marker in (".dev", ".post"):
+            head, sep, number = rest.rpartition(marker)
+            if sep:
+                if not number.isdigit():
+                    return False
+                rest = head
+
+        *release, last = rest.split(".")
+        if not all(part.isdigit() for part in release):
+            return False
+        pre_release = last.lstrip(string.digits)
+        if len(pre_release) == len(last):
+            return False
+        if not pre_release:
+            return True
+        number = pre_release.lstrip(string.ascii_letters)
+        return len(number) < len(pre_release) and number.isdigit()
+
+    def _rewrite_version(self, content: str, version: str) -> str:
+        """
+        Replace dynamic versioning with a static version in pyproject.toml content.
 
-    def _remove_dynamic_versioning(self, content: str) -> str:
-        """Remove dynamic versioning configuration from pyproject.toml content."""
-        lines = content.split("\n")
-        result = []
-        skip_next = False
-        in_hatch_version = False
-        in_uv_dynamic = False
-
-        for _i, line in enumerate(lines):
-            # Skip lines in sections we want to remove
-            if skip_next:
-                skip_next = False
-                continue
+        Single pass over the lines that drops the [tool.hatch.version] and
+        [tool.uv-dynamic-versioning] sections, removes "version" from the dynamic list,
+        and sets the static version in the [project] section.
 
-            # Track section boundaries
-            if line.strip().startswith("[tool.hatch.version]"):
-                in_hatch_version = True
-                continue
-            elif line.strip().startswith("[tool.uv-dynamic-versioning]"):
-                in_uv_dynamic = True
-                continue
-            elif line.strip().startswith("[") and in_hatch_version:
-                in_hatch_version = False
-            elif line.strip().startswith("[") and in_uv_dynamic:
-                in_uv_dynamic = False
+        Args:
+            content: pyproject.toml content
+            version: Version string to set
 
-            # Skip lines in dynamic versioning sections
-            if in_hatch_version or in_uv_dynamic:
+        Returns:
+            Updated pyproject.toml content
+        """
+        version_line = f'version = "{version}"'
+        result = []
+        result_append = result.append
+        in_versioning_section = False
+        in_project = False
+        version_set = False
+
+        # Scan lines in place with str.find rather than materialising content.split("\n")
+        start = 0
+        end = len(content)
+        while start <= end:
+            newline = content.find("\n", start)
+            if newline == -1:
+                newline = end
+            line = content[start:newline]
+            start = newline + 1
+            stripped = line.strip()
+            is_section = stripped.startswith("[")
+
+            # Drop dynamic versioning sections up to the next section header. Headers
+            # are only matched on section lines, with one startswith for all of them.
+            if is_section:
+                in_versioning_section = stripped.startswith(_DYNAMIC_VERSIONING_SECTIONS)
+            if in_versioning_section:
                 continue
 
             # Remove 'version' from dynamic list if present
-            if re.match(r"^\s*dynamic\s*=\s*\[", line):
-                # Check if version is in the list
-                if "version" in line:
+            if "version" in line:
+                dynamic_value = _assignment_value(stripped, "dynamic")
+                if dynamic_value is not None and dynamic_value.startswith("["):
                     # Remove version from the list
-                    line = re.sub(r'"version"', "", line)
-                    line = re.sub(r"'version'", "", line)
-                    line = re.sub(r",\s*,", ",", line)  # Remove double commas
-                    line = re.sub(r"\[\s*,", "[", line)  # Remove leading comma
-                    line = re.sub(r",\s*\]", "]", line)  # Remove trailing comma
+                    line = line.replace('"version"', "").replace("'version'", "")
+                    line = _DOUBLE_COMMA_RE.sub(",", line)  # Remove double commas
+                    line = _LEAD_COMMA_RE.sub("[", line)  # Remove leading comma
+                    line = _TRAIL_COMMA_RE.sub("]", line)  # Remove trailing comma
                     # If dynamic list is now empty, skip the line
-                    if re.match(r"^\s*dynamic\s*=\s*\[\s*\]", line):
+                    if line.partition("[")[2].lstrip().startswith("]"):
                         continue
 
-            result.append(line)
-
-        return "\n".join(result)
-
-    def _set_static_version(self, content: str, version: str) -> str:
-        """Set static version in [project] section."""
-        lines = content.split("\n")
-        result = []
-        in_project = False
-        version_set = False
-
-        for line in lines:
-            if line.strip().startswith("[project]"):
+            # Set static version in [project] section
+            if is_section and stripped.startswith("[project]"):
                 in_project = True
-                result.append(line)
-            elif line.strip().startswith("[") and in_project:
+                result_append(line)
+            elif is_section and in_project:
                 # End of [project] section, add version if not set
                 if not version_set:
-                    result.append(f'version = "{version}"')
+                    result_append(version_line)
                 in_project = False
-                result.append(line)
-            elif in_project and re.match(r"^\s*version\s*=", line):
+                result_append(line)
+            elif in_project and _assignment_value(stripped, "version") is not None:
                 # Replace existing version
-                result.append(f'version = "{version}"')
+                result_append(version_line)
                 version_set = True
             else:
-                result.append(line)
+                result_append(line)
 
         # If [project] section exists but no version was set, add it
         if in_project and not version_set:
-            result.append(f'version = "{version}"')
+            result_append(version_line)
 
         return "\n".join(result)
 
@@ -203,51 +356,86 @@ class VersionManager:
         Note: This is a best-effort restoration and may not perfectly match
         the original configuration.
         """
-        if not self.pyproject_path.exists():
+        try:
+            content = self._read_pyproject()
+        except FileNotFoundError:
             return
 
-        content = self.pyproject_path.read_text(encoding="utf-8")
-
         # Check if dynamic versioning is already present
         if "[tool.hatch.version]" in content:
             return
 
         # Add dynamic versioning configuration
-        lines = content.split("\n")
-        result = []
+        # Lines keep their newlines, so unchanged lines are emitted as-is into one buffer
+        lines = content.splitlines(keepends=True)
+        buf = io.StringIO()
+        buf_write = buf.write
         project_section_found = False
+        # Lines of the first [project] section, held back until we know whether
+        # dynamic = ["version"] has to be added after its header
+        project_lines: list[str] | None = None
 
-        for i, line in enumerate(lines):
-            result.append(line)
+        for line in lines:
+            stripped = line.strip()
+
+            if project_lines is not None:
+                if stripped.startswith("["):
+                    # End of [project] without dynamic or version: add dynamic after header
+                    self._write_project_section(buf, project_lines, add_dynamic=True)
+                    project_lines = None
+                elif "dynamic" in line or ("version" in line and not stripped.startswith("#")):
+                    # dynamic or version already present: emit the section unchanged
+                    project_lines.append(line)
+                    self._write_project_section(buf, project_lines, add_dynamic=False)
+                    project_lines = None
+                    continue
+                else:
+                    project_lines.append(line)
+                    continue
 
             # Add dynamic = ["version"] after [project] if not present
-            if line.strip().startswith("[project]") and not project_section_found:
+            if stripped.startswith("[project]") and not project_section_found:
                 project_section_found = True
-                # Check next few lines for dynamic or version
-                has_dynamic = False
-                has_version = False
-                for j in range(i + 1, min(i + 10, len(lines))):
-                    if "dynamic" in lines[j] or "version" in lines[j]:
-                        if "dynamic" in lines[j]:
-                            has_dynamic = True
-                        if "version" in lines[j] and not lines[j].strip().startswith("#"):
-                            has_version = True
-                        break
-                    if lines[j].strip().startswith("["):
-                        break
-
-                if not has_dynamic and not has_version:
-                    result.append('dynamic = ["version"]')
+                project_lines = [line]
+                continue
+
+            buf_write(line)
+
+        if project_lines is not None:
+            # [project] runs to the end of the file without dynamic or version
+            self._write_project_section(buf, project_lines, add_dynamic=True)
 
         # Add hatch versioning configuration at the end
         if "[tool.hatch.version]" not in content:
-            result.append("")
-            result.append("[tool.hatch.version]")
-            result.append('source = "uv-dynamic-versioning"')
-            result.append("")
-            result.append("[tool.uv-dynamic-versioning]")
-            result.append('vcs = "git"')
-            result.append('style = "pep440"')
-            result.append("bump = true")
-
-        self.pyproject_path.write_text("\n".join(result), encoding="utf-8")
+            buf_write(
+                "\n"
+                "\n[tool.hatch.version]"
+                '\nsource = "uv-dynamic-versioning"'
+                "\n"
+                "\n[tool.uv-dynamic-versioning]"
+                '\nvcs = "git"'
+                '\nstyle = "pep440"'
+                "\nbump = true"
+            )
+
+        self._write_pyproject(buf.getvalue())
+
+    def _write_project_section(
+        self, buf: io.StringIO, section_lines: list[str], add_dynamic: bool
+    ) -> None:
+        """
+        Write buffered [project] section lines, optionally adding dynamic = ["version"].
+
+        Args:
+            buf: Output buffer
+            section_lines: Lines of the section, header first, with their newlines
+            add_dynamic: Whether to add dynamic = ["version"] right after the header
+        """
+        header, *body = section_lines
+        buf.write(header)
+        if add_dynamic:
+            if header.endswith("\n"):
+                buf.write('dynamic = ["version"]\n')
+            else:
+                buf.write('\ndynamic = ["version"]')
+        buf.writelines(body)
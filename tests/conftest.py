@@ -2,95 +2,217 @@
 
 from __future__ import annotations
 
+import contextlib
+import filecmp
+import os
+import shutil
 import sys
+import tempfile
+from collections.abc import Callable, Iterator
 from pathlib import Path
+from typing import Any
 
 import pytest
 
+from python_package_folder import SubfolderBuildConfig
 
-@pytest.fixture(autouse=True, scope="session")
-def protect_repository_files():
+# Memory-backed file system for test temporary directories, where available
+_SHM_DIR = Path("/dev/shm")
+
+# Parent pyproject.toml of the test project used by the test_subfolder_*.py modules
+_SUBFOLDER_PROJECT_PYPROJECT = b"""[project]
+name = "test-package"
+version = "0.1.0"
+dynamic = ["version"]
+
+[tool.hatch.version]
+source = "uv-dynamic-versioning"
+
+[tool.uv-dynamic-versioning]
+vcs = "git"
+style = "pep440"
+bump = true
+
+[tool.hatch.build.targets.wheel]
+packages = ["src/test_package"]
+
+[dependency-groups]
+dev = [
+    "pytest>=8.0.0",
+    "pytest-cov>=4.0.0",
+]
+test = [
+    "pytest>=8.0.0",
+    "mypy>=1.0.0",
+]
+"""
+
+# Backups of repository files, taken once by the controlling (or only) pytest process
+_REPOSITORY_BACKUPS = pytest.StashKey[tuple[Path, dict[Path, tuple[Path, tuple[int, int]]]]]()
+
+
+def _is_xdist_worker(config: pytest.Config) -> bool:
+    """Whether this process is a pytest-xdist worker rather than the controlling process."""
+    return hasattr(config, "workerinput")
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """
+    Keep tmp_path and tmp_path_factory directories in memory where a tmpfs is available,
+    and back up the repository files that tests must not modify.
+
+    The tests create and walk many small project trees. On Linux, pytest's numbered
+    temporary directories are rooted in /dev/shm instead of the disk-backed temp dir,
+    unless --basetemp or PYTEST_DEBUG_TEMPROOT is given.
+
+    Repository files are backed up once, by the controlling process, before any
+    pytest-xdist worker starts. A per-worker backup could capture a file while a test on
+    another worker has it modified, and then "restore" the modified copy.
+    """
+    if not config.option.basetemp and "PYTEST_DEBUG_TEMPROOT" not in os.environ:
+        if (
+            sys.platform.startswith("linux")
+            and _SHM_DIR.is_dir()
+            and os.access(_SHM_DIR, os.W_OK | os.X_OK)
+        ):
+            os.environ["PYTEST_DEBUG_TEMPROOT"] = str(_SHM_DIR)
+
+    if not _is_xdist_worker(config):
+        config.stash[_REPOSITORY_BACKUPS] = _backup_repository_files()
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    """Restore repository files after all tests, including those on xdist workers, finish."""
+    backups = config.stash.get(_REPOSITORY_BACKUPS, None)
+    if backups is not None:
+        del config.stash[_REPOSITORY_BACKUPS]
+        _restore_repository_files(*backups)
+
+
+def _backup_repository_files() -> tuple[Path, dict[Path, tuple[Path, tuple[int, int]]]]:
     """
-    Automatically protect repository files from test modifications.
+    Back up pyproject.toml and README.md from the repository root.
+
+    Backups are file copies (copyfile uses the kernel's zero-copy path on Linux), and
+    their contents are only read again if the original's (mtime_ns, size) changed during
+    the session.
 
-    This fixture backs up pyproject.toml and README.md at the start of the test session
-    and restores them at the end, ensuring tests never permanently modify repository files.
+    Returns:
+        Tuple of (backup_dir, backups), where backups maps each original path to its
+        backup path and (mtime_ns, size) at backup time
     """
     # Get the repository root (parent of tests directory)
     repo_root = Path(__file__).parent.parent
 
-    pyproject_path = repo_root / "pyproject.toml"
-    readme_path = repo_root / "README.md"
-
-    # Backup original files if they exist
-    pyproject_backup = None
-    readme_backup = None
-    pyproject_existed = pyproject_path.exists()
-    readme_existed = readme_path.exists()
-
-    if pyproject_existed:
-        pyproject_backup = pyproject_path.read_bytes()
-    if readme_existed:
-        readme_backup = readme_path.read_bytes()
-
-    # Yield control to tests
-    yield
-
-    # Restore original files after all tests
-    if pyproject_backup and pyproject_path.exists():
-        try:
-            current_content = pyproject_path.read_bytes()
-            if current_content != pyproject_backup:
-                # File was modified, restore it
-                pyproject_path.write_bytes(pyproject_backup)
+    protected_paths = [repo_root / "pyproject.toml", repo_root / "README.md"]
+
+    backup_dir = Path(tempfile.mkdtemp(prefix="python-package-folder-protected-"))
+    backups: dict[Path, tuple[Path, tuple[int, int]]] = {}
+    for path in protected_paths:
+        if path.exists():
+            stat = path.stat()
+            backup_path = backup_dir / path.name
+            shutil.copyfile(path, backup_path)
+            backups[path] = (backup_path, (stat.st_mtime_ns, stat.st_size))
+    return backup_dir, backups
+
+
+def _restore_repository_files(
+    backup_dir: Path, backups: dict[Path, tuple[Path, tuple[int, int]]]
+) -> None:
+    """
+    Restore repository files backed up by _backup_repository_files, then remove the backups.
+
+    This ensures tests never permanently modify repository files.
+    """
+    for path, (backup_path, backup_stat) in backups.items():
+        if path.exists():
+            try:
+                stat = path.stat()
+                if (stat.st_mtime_ns, stat.st_size) == backup_stat:
+                    # Untouched during the session, no need to read it back
+                    continue
+                if not filecmp.cmp(path, backup_path, shallow=False):
+                    # File was modified, restore it
+                    shutil.copyfile(backup_path, path)
+                    print(
+                        f"Warning: Restored modified {path.name} after test session",
+                        file=sys.stderr,
+                    )
+            except OSError as e:
+                print(
+                    f"Warning: Could not restore {path.name}: {e}",
+                    file=sys.stderr,
+                )
+        else:
+            # File was deleted, restore it
+            try:
+                shutil.copyfile(backup_path, path)
                 print(
-                    "Warning: Restored modified pyproject.toml after test session",
+                    f"Warning: Restored deleted {path.name} after test session",
                     file=sys.stderr,
                 )
-        except OSError as e:
-            print(
-                f"Warning: Could not restore pyproject.toml: {e}",
-                file=sys.stderr,
-            )
-    elif pyproject_backup and not pyproject_path.exists():
-        # File was deleted, restore it
-        try:
-            pyproject_path.write_bytes(pyproject_backup)
-            print(
-                "Warning: Restored deleted pyproject.toml after test session",
-                file=sys.stderr,
-            )
-        except OSError as e:
-            print(
-                f"Warning: Could not restore pyproject.toml: {e}",
-                file=sys.stderr,
-            )
-
-    if readme_backup and readme_path.exists():
-        try:
-            current_content = readme_path.read_bytes()
-            if current_content != readme_backup:
-                # File was modified, restore it
-                readme_path.write_bytes(readme_backup)
+            except OSError as e:
                 print(
-                    "Warning: Restored modified README.md after test session",
+                    f"Warning: Could not restore {path.name}: {e}",
                     file=sys.stderr,
                 )
-        except OSError as e:
-            print(
-                f"Warning: Could not restore README.md: {e}",
-                file=sys.stderr,
-            )
-    elif readme_backup and not readme_path.exists():
-        # File was deleted, restore it
-        try:
-            readme_path.write_bytes(readme_backup)
-            print(
-                "Warning: Restored deleted README.md after test session",
-                file=sys.stderr,
-            )
-        except OSError as e:
-            print(
-                f"Warning: Could not restore README.md: {e}",
-                file=sys.stderr,
-            )
+
+    shutil.rmtree(backup_dir, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def subfolder_project_template(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """
+    Create the test project once for the session.
+
+    Tests get their own copy through test_project_with_pyproject, since most of them
+    modify the project. Tests that only read it, such as SubfolderBuildConfig.__init__
+    tests, may use the template directly.
+    """
+    project_root = tmp_path_factory.mktemp("template") / "test_project"
+    # Creates project_root along with the subfolder
+    subfolder = project_root / "subfolder"
+    subfolder.mkdir(parents=True)
+
+    (project_root / "pyproject.toml").write_bytes(_SUBFOLDER_PROJECT_PYPROJECT)
+    (subfolder / "module.py").write_bytes(b"def func(): pass")
+
+    return project_root
+
+
+@pytest.fixture(scope="session")
+def subfolder_project_pyproject_text() -> str:
+    """The original text of test_project_with_pyproject's pyproject.toml, without reading it."""
+    return _SUBFOLDER_PROJECT_PYPROJECT.decode()
+
+
+@pytest.fixture
+def test_project_with_pyproject(tmp_path: Path, subfolder_project_template: Path) -> Path:
+    """Create a test project with pyproject.toml."""
+    # Files are copied rather than hard-linked: tests rewrite pyproject.toml and module.py
+    # in place, which would otherwise leak into the shared template
+    return Path(
+        shutil.copytree(
+            subfolder_project_template,
+            tmp_path / "test_project",
+            copy_function=shutil.copyfile,
+        )
+    )
+
+
+@pytest.fixture
+def config_factory() -> Iterator[Callable[..., SubfolderBuildConfig]]:
+    """
+    Create SubfolderBuildConfig instances that are restored when the test ends.
+
+    The factory takes SubfolderBuildConfig's arguments. Each config is used as a context
+    manager, so restoring is skipped when the test already restored it, and done even if
+    an assertion failed.
+    """
+    with contextlib.ExitStack() as stack:
+
+        def create(**kwargs: Any) -> SubfolderBuildConfig:
+            return stack.enter_context(SubfolderBuildConfig(**kwargs))
+
+        yield create
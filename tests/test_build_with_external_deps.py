@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
+import ast
+import os
+import shutil
 import sys
+from collections import OrderedDict
 from pathlib import Path
 
 import pytest
@@ -13,37 +17,24 @@ from python_package_folder import (
     ImportAnalyzer,
     ImportInfo,
 )
-
-
-@pytest.fixture
-def test_project_root(tmp_path: Path) -> Path:
-    """Create a temporary test project structure."""
-    project_root = tmp_path / "test_project"
-    project_root.mkdir()
-
-    # Create folder_structure similar to tests/folder_structure
-    folder_structure = project_root / "folder_structure"
-    folder_structure.mkdir()
-
-    # Create some_globals.py (external dependency)
-    (folder_structure / "some_globals.py").write_text('SOME_GLOBAL_VARIABLE = "test_value"')
-
-    # Create utility_folder (external dependency)
-    utility_folder = folder_structure / "utility_folder"
-    utility_folder.mkdir()
-    (utility_folder / "some_utility.py").write_text(
-        "def print_something(to_print: str):\n    print(to_print)"
-    )
-    # Create _SS subdirectory with a file that should be excluded
-    ss_dir = utility_folder / "_SS"
-    ss_dir.mkdir()
-    (ss_dir / "some_superseded_file.py").write_text("def superseded_function():\n    pass")
-
-    # Create subfolder_to_build (target directory)
-    subfolder_to_build = folder_structure / "subfolder_to_build"
-    subfolder_to_build.mkdir()
-    (subfolder_to_build / "some_function.py").write_text(
-        """if True:
+from python_package_folder import analyzer as analyzer_module
+from python_package_folder import manager as manager_module
+
+# Files of the test project, similar to tests/folder_structure, keyed by path
+# relative to the project root
+_TEST_PROJECT_FILES = {
+    # External dependency
+    "folder_structure/some_globals.py": b'SOME_GLOBAL_VARIABLE = "test_value"',
+    # External dependency
+    "folder_structure/utility_folder/some_utility.py": (
+        b"def print_something(to_print: str):\n    print(to_print)"
+    ),
+    # _SS subdirectory with a file that should be excluded
+    "folder_structure/utility_folder/_SS/some_superseded_file.py": (
+        b"def superseded_function():\n    pass"
+    ),
+    # subfolder_to_build (target directory)
+    "folder_structure/subfolder_to_build/some_function.py": b"""if True:
     import sysappend; sysappend.all()
     
 from some_globals import SOME_GLOBAL_VARIABLE
@@ -52,12 +43,50 @@ from folder_structure.utility_folder.some_utility import print_something
 def print_and_return_global_variable():
     print_something(SOME_GLOBAL_VARIABLE)
     return SOME_GLOBAL_VARIABLE
-"""
-    )
+""",
+}
+
+
+def _create_test_project(project_root: Path) -> Path:
+    """Create the test project structure under project_root."""
+    for relative_path, content in _TEST_PROJECT_FILES.items():
+        file_path = project_root / relative_path
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_bytes(content)
 
     return project_root
 
 
+@pytest.fixture(scope="session")
+def shared_test_project_root(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """
+    Create a test project structure once for the session.
+
+    Only for tests that read the tree; tests that write files use test_project_root.
+    """
+    return _create_test_project(tmp_path_factory.mktemp("shared") / "test_project")
+
+
+@pytest.fixture
+def test_project_root(tmp_path: Path, shared_test_project_root: Path) -> Path:
+    """Create a private copy of the test project structure for tests that write files."""
+    # Files are copied rather than hard-linked: code under test rewrites files in
+    # place, which would otherwise leak into the shared tree
+    return Path(
+        shutil.copytree(
+            shared_test_project_root,
+            tmp_path / "test_project",
+            copy_function=shutil.copyfile,
+        )
+    )
+
+
+@pytest.fixture(scope="session")
+def analyzer(shared_test_project_root: Path) -> ImportAnalyzer:
+    """ImportAnalyzer for the shared test project, reusing its stdlib module cache."""
+    return ImportAnalyzer(shared_test_project_root)
+
+
 @pytest.fixture
 def real_test_structure() -> Path:
     """Get the real test folder structure path."""
@@ -67,10 +96,13 @@ def real_test_structure() -> Path:
 class TestImportAnalyzer:
     """Tests for ImportAnalyzer class."""
 
-    def test_find_all_python_files(self, test_project_root: Path) -> None:
+    def test_find_all_python_files(
+        self, shared_test_project_root: Path, analyzer: ImportAnalyzer
+    ) -> None:
         """Test finding all Python files recursively."""
-        analyzer = ImportAnalyzer(test_project_root)
-        python_files = list(analyzer.find_all_python_files(test_project_root / "folder_structure"))
+        python_files = list(
+            analyzer.find_all_python_files(shared_test_project_root / "folder_structure")
+        )
 
         # Should find all Python files including those in _SS (exclusion happens during dependency finding)
         assert len(python_files) >= 3
@@ -80,11 +112,15 @@ class TestImportAnalyzer:
         assert "some_utility.py" in file_names
         # Note: some_superseded_file.py in _SS will be found but excluded during dependency resolution
 
-    def test_extract_imports(self, test_project_root: Path) -> None:
+    def test_extract_imports(
+        self, shared_test_project_root: Path, analyzer: ImportAnalyzer
+    ) -> None:
         """Test extracting imports from a Python file."""
-        analyzer = ImportAnalyzer(test_project_root)
         test_file = (
-            test_project_root / "folder_structure" / "subfolder_to_build" / "some_function.py"
+            shared_test_project_root
+            / "folder_structure"
+            / "subfolder_to_build"
+            / "some_function.py"
         )
 
         imports = analyzer.extract_imports(test_file)
@@ -94,16 +130,228 @@ class TestImportAnalyzer:
         assert "some_globals" in import_names
         assert "folder_structure.utility_folder.some_utility" in import_names
 
-    def test_classify_stdlib_import(self, test_project_root: Path) -> None:
-        """Test classification of standard library imports."""
+    def test_extract_imports_cache_follows_file_contents(self, test_project_root: Path) -> None:
+        """Test that cached imports are fresh objects and track file contents."""
         analyzer = ImportAnalyzer(test_project_root)
-        src_dir = test_project_root / "folder_structure" / "subfolder_to_build"
+        test_file = test_project_root / "folder_structure" / "some_globals.py"
+        test_file.write_text("import json\n")
+
+        first = analyzer.extract_imports(test_file)
+        first[0].classification = "stdlib"
+        second = ImportAnalyzer(test_project_root).extract_imports(test_file)
+
+        assert [imp.module_name for imp in second] == ["json"]
+        assert second[0] is not first[0]
+        assert second[0].classification is None
+
+        test_file.write_text("import json\nfrom os import path\n")
+        third = analyzer.extract_imports(test_file)
+
+        assert [imp.module_name for imp in third] == ["json", "os"]
+        assert third[1].line_number == 2
+
+    def test_extract_imports_without_import_keyword(self, test_project_root: Path) -> None:
+        """Test that files without any import statement yield no imports."""
+        analyzer = ImportAnalyzer(test_project_root)
+        test_file = test_project_root / "folder_structure" / "constants.py"
+        test_file.write_text('"""Constants."""\n\nVALUE = 1\n')
+
+        assert analyzer.extract_imports(test_file) == []
+
+    def test_extract_imports_honours_source_encoding(self, test_project_root: Path) -> None:
+        """Test that files with a BOM or an encoding declaration are parsed."""
+        analyzer = ImportAnalyzer(test_project_root)
+        folder = test_project_root / "folder_structure"
+        bom_file = folder / "bom_module.py"
+        bom_file.write_bytes(b"\xef\xbb\xbfimport json\n")
+        latin1_file = folder / "latin1_module.py"
+        latin1_file.write_bytes(b"# -*- coding: latin-1 -*-\nimport csv\nNAME = '\xe9'\n")
+
+        assert [imp.module_name for imp in analyzer.extract_imports(bom_file)] == ["json"]
+        assert [imp.module_name for imp in analyzer.extract_imports(latin1_file)] == ["csv"]
+
+    def test_extract_imports_nested_statements(self, test_project_root: Path) -> None:
+        """Test that imports inside functions, classes and try/match blocks are found."""
+        analyzer = ImportAnalyzer(test_project_root)
+        test_file = test_project_root / "folder_structure" / "nested_imports.py"
+        test_file.write_text(
+            "try:\n"
+            "    import json\n"
+            "except ImportError:\n"
+            "    import csv\n"
+            "class Loader:\n"
+            "    def load(self, kind):\n"
+            "        match kind:\n"
+            "            case 'toml':\n"
+            "                import tomllib\n"
+            "        from pathlib import Path\n"
+        )
+
+        import_names = {imp.module_name for imp in analyzer.extract_imports(test_file)}
+
+        assert import_names == {"json", "csv", "tomllib", "pathlib"}
+
+        tree = ast.parse(test_file.read_bytes())
+        assert list(ImportAnalyzer.iter_import_nodes(tree)) == [
+            node for node in ast.walk(tree) if isinstance(node, (ast.Import, ast.ImportFrom))
+        ]
+
+    def test_extract_imports_clear_cache(self, test_project_root: Path) -> None:
+        """Test that clear_cache makes the analyzer look at files again."""
+        analyzer = ImportAnalyzer(test_project_root)
+        test_file = test_project_root / "folder_structure" / "some_globals.py"
+        test_file.write_text("import abc\n")
+        stat = test_file.stat()
+        analyzer.extract_imports(test_file)
+
+        # Same size and modification time: only clear_cache reveals the new contents
+        test_file.write_text("import csv\n")
+        os.utime(test_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        assert [imp.module_name for imp in analyzer.extract_imports(test_file)] == ["abc"]
+
+        analyzer.clear_cache()
+        assert [imp.module_name for imp in analyzer.extract_imports(test_file)] == ["csv"]
+
+    def test_iter_python_files_matches_find_all_python_files(
+        self, shared_test_project_root: Path, analyzer: ImportAnalyzer
+    ) -> None:
+        """The generator should yield the same files, in the same order, as the list."""
+        directory = shared_test_project_root / "folder_structure"
+        python_files = analyzer.iter_python_files(directory)
+
+        assert not isinstance(python_files, list)
+        assert list(python_files) == analyzer.find_all_python_files(directory)
+
+    def test_find_files_named_matches_rglob(self, test_project_root: Path) -> None:
+        """Test that the indexed file search matches rglob and is refreshed by clear_cache."""
+        analyzer = ImportAnalyzer(test_project_root)
+        folder = test_project_root / "folder_structure"
+
+        for name in ("some_utility.py", "some_superseded_file.py", "missing.py"):
+            assert analyzer._find_files_named(folder, name) == list(folder.rglob(name))
+
+        new_file = folder / "subfolder_to_build" / "nested" / "some_utility.py"
+        new_file.parent.mkdir()
+        new_file.write_text("")
+        assert new_file not in analyzer._find_files_named(folder, "some_utility.py")
+
+        analyzer.clear_cache()
+        assert analyzer._find_files_named(folder, "some_utility.py") == list(
+            folder.rglob("some_utility.py")
+        )
+
+    def test_prefetch_imports_fills_caches(
+        self, test_project_root: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that prefetched imports are served by extract_imports."""
+        monkeypatch.setattr(analyzer_module, "_PREFETCH_MIN_FILES", 2)
+        analyzer = ImportAnalyzer(test_project_root)
+        folder = test_project_root / "folder_structure" / "prefetched"
+        folder.mkdir()
+        for index in range(3):
+            (folder / f"module_{index}.py").write_text(f"import json\nVALUE = {index}\n")
+        (folder / "broken.py").write_text("import (\n")
+        python_files = analyzer.find_all_python_files(folder)
+
+        analyzer.prefetch_imports(python_files)
+        assert len(analyzer._imports_cache) == 3
+        monkeypatch.setattr(analyzer_module, "_parse_import_entries", None)
+
+        for file_path in python_files:
+            if file_path.name != "broken.py":
+                imports = analyzer.extract_imports(file_path)
+                assert [imp.module_name for imp in imports] == ["json"]
+
+    def test_extract_imports_uses_disk_cache(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that imports parsed by one process are read back from the disk cache."""
+        monkeypatch.setenv(analyzer_module._DISK_CACHE_DIR_ENV, str(tmp_path / "cache"))
+        module = tmp_path / "module.py"
+        module.write_bytes(b"import json\nfrom os import path\n")
+
+        ImportAnalyzer(tmp_path).extract_imports(module)
+        assert len(list((tmp_path / "cache").iterdir())) == 1
+
+        # A new process starts with an empty in-memory cache
+        monkeypatch.setattr(analyzer_module, "_IMPORTS_CACHE", OrderedDict())
+        monkeypatch.setattr(analyzer_module, "_parse_import_entries", None)
+        imports = ImportAnalyzer(tmp_path).extract_imports(module)
+        assert [(imp.module_name, imp.import_type) for imp in imports] == [
+            ("json", "import"),
+            ("os", "from"),
+        ]
+
+        analyzer_module.clear_disk_cache()
+        assert not (tmp_path / "cache").exists()
+
+    def test_disk_cache_is_opt_in_and_bounded(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the disk cache is off by default and evicts its oldest entries."""
+        monkeypatch.delenv(analyzer_module._DISK_CACHE_DIR_ENV, raising=False)
+        monkeypatch.setattr(analyzer_module, "_IMPORTS_CACHE", OrderedDict())
+        monkeypatch.setattr(analyzer_module, "_DISK_CACHE_MAX_ENTRIES", 4)
+        module = tmp_path / "module.py"
+        module.write_bytes(b"import json\n")
+
+        ImportAnalyzer(tmp_path).extract_imports(module)
+        assert analyzer_module._disk_cache_dir() is None
+
+        cache_dir = tmp_path / "cache"
+        monkeypatch.setenv(analyzer_module._DISK_CACHE_DIR_ENV, str(cache_dir))
+        for i in range(6):
+            module.write_bytes(f"import json  # {i}\n".encode())
+            ImportAnalyzer(tmp_path).extract_imports(module)
+            assert len(list(cache_dir.iterdir())) <= 4
+
+        analyzer_module.clear_disk_cache()
+
+    def test_classify_stdlib_import(
+        self, shared_test_project_root: Path, analyzer: ImportAnalyzer
+    ) -> None:
+        """Test classification of standard library imports."""
+        src_dir = shared_test_project_root / "folder_structure" / "subfolder_to_build"
 
         imp = ImportInfo(module_name="os", import_type="import", line_number=1)
         analyzer.classify_import(imp, src_dir)
 
         assert imp.classification == "stdlib"
 
+    def test_classify_builtin_stdlib_import(
+        self, shared_test_project_root: Path, analyzer: ImportAnalyzer
+    ) -> None:
+        """Test classification of stdlib modules without a .py file (built-in or C)."""
+        src_dir = shared_test_project_root / "folder_structure" / "subfolder_to_build"
+
+        for module_name in ("math", "_thread", "xml.etree.ElementTree", *sys.builtin_module_names):
+            imp = ImportInfo(module_name=module_name, import_type="import", line_number=1)
+            analyzer.classify_import(imp, src_dir)
+
+            assert imp.classification == "stdlib"
+
+    def test_is_third_party_caches_module_lookups(
+        self, shared_test_project_root: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that module lookups are kept by the analyzer until clear_cache()."""
+        lookups: list[str] = []
+        find_spec = analyzer_module.importlib.util.find_spec
+
+        def counting_find_spec(name: str) -> object:
+            lookups.append(name)
+            return find_spec(name)
+
+        monkeypatch.setattr(analyzer_module.importlib.util, "find_spec", counting_find_spec)
+        analyzer = ImportAnalyzer(shared_test_project_root)
+
+        assert analyzer.is_third_party("pytest")
+        assert analyzer.is_third_party("pytest.mark")
+        assert lookups == ["pytest"]
+
+        analyzer.clear_cache()
+        assert analyzer.is_third_party("pytest")
+        assert lookups == ["pytest", "pytest"]
+
     def test_classify_local_import(self, test_project_root: Path) -> None:
         """Test classification of local imports within src_dir."""
         analyzer = ImportAnalyzer(test_project_root)
@@ -124,10 +372,11 @@ class TestImportAnalyzer:
         assert imp.classification == "local"
         assert imp.resolved_path == local_file
 
-    def test_classify_external_import(self, test_project_root: Path) -> None:
+    def test_classify_external_import(
+        self, shared_test_project_root: Path, analyzer: ImportAnalyzer
+    ) -> None:
         """Test classification of external imports outside src_dir."""
-        analyzer = ImportAnalyzer(test_project_root)
-        src_dir = test_project_root / "folder_structure" / "subfolder_to_build"
+        src_dir = shared_test_project_root / "folder_structure" / "subfolder_to_build"
 
         imp = ImportInfo(
             module_name="some_globals",
@@ -141,10 +390,11 @@ class TestImportAnalyzer:
         assert imp.resolved_path is not None
         assert imp.resolved_path.name == "some_globals.py"
 
-    def test_resolve_relative_import(self, test_project_root: Path) -> None:
+    def test_resolve_relative_import(
+        self, shared_test_project_root: Path, analyzer: ImportAnalyzer
+    ) -> None:
         """Test resolving relative imports."""
-        analyzer = ImportAnalyzer(test_project_root)
-        src_dir = test_project_root / "folder_structure" / "subfolder_to_build"
+        src_dir = shared_test_project_root / "folder_structure" / "subfolder_to_build"
 
         # Test relative import
         imp = ImportInfo(
@@ -162,10 +412,10 @@ class TestImportAnalyzer:
 class TestExternalDependencyFinder:
     """Tests for ExternalDependencyFinder class."""
 
-    def test_find_external_dependencies(self, test_project_root: Path) -> None:
+    def test_find_external_dependencies(self, shared_test_project_root: Path) -> None:
         """Test finding external dependencies."""
-        src_dir = test_project_root / "folder_structure" / "subfolder_to_build"
-        finder = ExternalDependencyFinder(test_project_root, src_dir)
+        src_dir = shared_test_project_root / "folder_structure" / "subfolder_to_build"
+        finder = ExternalDependencyFinder(shared_test_project_root, src_dir)
 
         python_files = list(finder.analyzer.find_all_python_files(src_dir))
         external_deps = finder.find_external_dependencies(python_files)
@@ -181,24 +431,48 @@ class TestExternalDependencyFinder:
             assert not dep.source_path.is_relative_to(src_dir)
             assert dep.target_path.is_relative_to(src_dir)
 
-    def test_determine_target_path_file(self, test_project_root: Path) -> None:
-        """Test determining target path for a file dependency."""
+    def test_find_external_dependencies_classifies_each_module_once(
+        self, test_project_root: Path
+    ) -> None:
+        """Test that a module imported from several files is resolved only once."""
         src_dir = test_project_root / "folder_structure" / "subfolder_to_build"
+        (src_dir / "other_function.py").write_text(
+            "from some_globals import SOME_GLOBAL_VARIABLE\n"
+        )
         finder = ExternalDependencyFinder(test_project_root, src_dir)
+        resolved_modules = []
+        resolve_local_import = finder.analyzer.resolve_local_import
+
+        def counting_resolve_local_import(import_info: ImportInfo, src: Path) -> Path | None:
+            resolved_modules.append(import_info.module_name)
+            return resolve_local_import(import_info, src)
 
-        source_file = test_project_root / "folder_structure" / "some_globals.py"
+        finder.analyzer.resolve_local_import = counting_resolve_local_import
+        external_deps = finder.find_external_dependencies(
+            finder.analyzer.find_all_python_files(src_dir)
+        )
+
+        assert resolved_modules.count("some_globals") == 1
+        assert "some_globals" in {dep.import_name for dep in external_deps}
+
+    def test_determine_target_path_file(self, shared_test_project_root: Path) -> None:
+        """Test determining target path for a file dependency."""
+        src_dir = shared_test_project_root / "folder_structure" / "subfolder_to_build"
+        finder = ExternalDependencyFinder(shared_test_project_root, src_dir)
+
+        source_file = shared_test_project_root / "folder_structure" / "some_globals.py"
         target = finder._determine_target_path(source_file, "some_globals")
 
         assert target is not None
         assert target.is_relative_to(src_dir)
         assert target.name == "some_globals.py"
 
-    def test_determine_target_path_directory(self, test_project_root: Path) -> None:
+    def test_determine_target_path_directory(self, shared_test_project_root: Path) -> None:
         """Test determining target path for a directory dependency."""
-        src_dir = test_project_root / "folder_structure" / "subfolder_to_build"
-        finder = ExternalDependencyFinder(test_project_root, src_dir)
+        src_dir = shared_test_project_root / "folder_structure" / "subfolder_to_build"
+        finder = ExternalDependencyFinder(shared_test_project_root, src_dir)
 
-        source_dir = test_project_root / "folder_structure" / "utility_folder"
+        source_dir = shared_test_project_root / "folder_structure" / "utility_folder"
         target = finder._determine_target_path(source_dir, "folder_structure.utility_folder")
 
         assert target is not None
@@ -260,6 +534,72 @@ class TestBuildManager:
             f"Copied paths should be consistent between calls. First: {copied_paths1}, Second: {copied_paths2}"
         )
 
+    def test_copy_dependency_skips_already_copied(self, test_project_root: Path) -> None:
+        """Test that dependencies copied by prepare_build are not copied again."""
+        src_dir = test_project_root / "folder_structure" / "subfolder_to_build"
+        manager = BuildManager(test_project_root, src_dir)
+
+        external_deps = manager.prepare_build()
+        copied_files = list(manager.copied_files)
+        copied_dirs = list(manager.copied_dirs)
+        for dep in external_deps:
+            manager._copy_dependency(dep)
+
+        assert manager.copied_files == copied_files
+        assert manager.copied_dirs == copied_dirs
+
+        manager.cleanup()
+        assert not any(path.exists() for path in copied_files + copied_dirs)
+
+    def test_copy_file_keeps_contents_and_metadata(self, tmp_path: Path) -> None:
+        """Test that dependency files are copied with their contents and timestamps."""
+        source = tmp_path / "source.py"
+        source.write_bytes(b"VALUE = 1\n" * 1000)
+        os.utime(source, ns=(1_000_000_000, 2_000_000_000))
+        target = tmp_path / "target.py"
+
+        manager_module._copy_file(source, target)
+        source.write_bytes(b"VALUE = 2\n")
+
+        assert target.read_bytes() == b"VALUE = 1\n" * 1000
+        assert target.stat().st_mtime_ns == 2_000_000_000
+
+        manager_module._copy_file(source, target)
+        assert target.read_bytes() == b"VALUE = 2\n"
+        with pytest.raises(shutil.SameFileError):
+            manager_module._copy_file(source, source)
+
+    def test_copy_file_clones_once_per_file_system(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a failed clone is not retried and leaves no file behind on errors."""
+        if manager_module.fcntl is None or not sys.platform.startswith("linux"):
+            pytest.skip("Cloning is only attempted on Linux")
+        monkeypatch.setattr(manager_module, "_UNCLONABLE_DEVICES", set())
+        clone_attempts = []
+
+        def failing_ioctl(fd: int, request: int, arg: int) -> None:
+            clone_attempts.append(request)
+            raise OSError("not supported")
+
+        monkeypatch.setattr(manager_module.fcntl, "ioctl", failing_ioctl)
+        source = tmp_path / "source.py"
+        source.write_bytes(b"VALUE = 1\n")
+
+        for index in range(3):
+            manager_module._copy_file(source, tmp_path / f"target_{index}.py")
+            assert (tmp_path / f"target_{index}.py").read_bytes() == b"VALUE = 1\n"
+        assert len(clone_attempts) == 1
+
+        def failing_copy2(src: Path, dst: Path) -> None:
+            raise OSError("disk full")
+
+        monkeypatch.setattr(manager_module, "_UNCLONABLE_DEVICES", set())
+        monkeypatch.setattr(manager_module.shutil, "copy2", failing_copy2)
+        with pytest.raises(OSError, match="disk full"):
+            manager_module._copy_file(source, tmp_path / "failed.py")
+        assert not (tmp_path / "failed.py").exists()
+
     def test_cleanup_removes_copied_files(self, test_project_root: Path) -> None:
         """Test that cleanup removes all copied files."""
         src_dir = test_project_root / "folder_structure" / "subfolder_to_build"
@@ -605,6 +945,18 @@ class TestRealFolderStructure:
 class TestExclusionPatterns:
     """Tests for exclusion pattern functionality."""
 
+    def test_find_all_python_files_skips_excluded_directories(
+        self, shared_test_project_root: Path
+    ) -> None:
+        """Test that the file search does not enter directories matching exclude patterns."""
+        folder = shared_test_project_root / "folder_structure"
+        analyzer = ImportAnalyzer(shared_test_project_root, exclude_patterns=["_SS"])
+
+        file_names = {f.name for f in analyzer.find_all_python_files(folder)}
+
+        assert "some_utility.py" in file_names
+        assert "some_superseded_file.py" not in file_names
+
     def test_exclude_ss_directories(self, test_project_root: Path) -> None:
         """Test that _SS directories are excluded from copying."""
         src_dir = test_project_root / "folder_structure" / "subfolder_to_build"
@@ -774,11 +1126,12 @@ from some_globals import SOME_GLOBAL_VARIABLE
 
         manager.cleanup()
 
-    def test_finder_excludes_ss_paths(self, test_project_root: Path) -> None:
+    def test_finder_excludes_ss_paths(
+        self, shared_test_project_root: Path, analyzer: ImportAnalyzer
+    ) -> None:
         """Test that ExternalDependencyFinder excludes _SS paths."""
-        src_dir = test_project_root / "folder_structure" / "subfolder_to_build"
-        finder = ExternalDependencyFinder(test_project_root, src_dir)
-        analyzer = ImportAnalyzer(test_project_root)
+        src_dir = shared_test_project_root / "folder_structure" / "subfolder_to_build"
+        finder = ExternalDependencyFinder(shared_test_project_root, src_dir)
 
         python_files = list(analyzer.find_all_python_files(src_dir))
         external_deps = finder.find_external_dependencies(python_files)
@@ -793,16 +1146,47 @@ from some_globals import SOME_GLOBAL_VARIABLE
                     f"Path component should not start with _SS: {part}"
                 )
 
+    def test_prefixed_module_dependencies_are_copied(self, tmp_path: Path) -> None:
+        """Test that imports of shipped modules named like exclude patterns are copied."""
+        project_root = tmp_path / "project"
+        src_dir = project_root / "src" / "pkg"
+        src_dir.mkdir(parents=True)
+        (src_dir / "__init__.py").write_text("")
+        (src_dir / "_skip_helpers.py").write_text("from shared.util import X\n")
+        shared_dir = project_root / "shared"
+        shared_dir.mkdir()
+        (shared_dir / "__init__.py").write_text("")
+        (shared_dir / "util.py").write_text("X = 1\n")
+
+        finder = ExternalDependencyFinder(project_root, src_dir)
+        python_files = ImportAnalyzer(project_root).find_all_python_files(src_dir)
+        external_deps = finder.find_external_dependencies(python_files)
+        assert [dep.source_path for dep in external_deps] == [shared_dir.resolve()]
+
+        manager = BuildManager(project_root, src_dir)
+        manager.prepare_build()
+        try:
+            assert (src_dir / "shared" / "util.py").exists()
+        finally:
+            manager.cleanup()
+
 
 class TestEdgeCases:
     """Tests for edge cases and error handling."""
 
-    def test_nonexistent_src_dir(self, test_project_root: Path) -> None:
+    def test_nonexistent_src_dir(self, shared_test_project_root: Path) -> None:
         """Test error handling for nonexistent src_dir."""
-        nonexistent = test_project_root / "nonexistent"
+        nonexistent = shared_test_project_root / "nonexistent"
 
         with pytest.raises(ValueError, match="Source directory not found"):
-            BuildManager(test_project_root, nonexistent)
+            BuildManager(shared_test_project_root, nonexistent)
+
+    def test_src_dir_is_a_file(self, shared_test_project_root: Path) -> None:
+        """Test error handling for a src_dir that is not a directory."""
+        src_file = shared_test_project_root / "folder_structure" / "some_globals.py"
+
+        with pytest.raises(ValueError, match="Source path is not a directory"):
+            BuildManager(shared_test_project_root, src_file)
 
     def test_file_with_syntax_error(self, test_project_root: Path) -> None:
         """Test handling of files with syntax errors."""
@@ -828,10 +1212,11 @@ class TestEdgeCases:
 
         assert len(python_files) == 0
 
-    def test_import_from_nonexistent_module(self, test_project_root: Path) -> None:
+    def test_import_from_nonexistent_module(
+        self, shared_test_project_root: Path, analyzer: ImportAnalyzer
+    ) -> None:
         """Test classification of imports from nonexistent modules."""
-        analyzer = ImportAnalyzer(test_project_root)
-        src_dir = test_project_root / "folder_structure" / "subfolder_to_build"
+        src_dir = shared_test_project_root / "folder_structure" / "subfolder_to_build"
 
         imp = ImportInfo(
             module_name="nonexistent_module_xyz123",
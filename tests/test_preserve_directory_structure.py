@@ -2,33 +2,22 @@
 
 from __future__ import annotations
 
+import shutil
+from collections.abc import Iterator
 from pathlib import Path
 
 import pytest
 
-from python_package_folder import BuildManager, ExternalDependencyFinder
+from python_package_folder import BuildManager, ExternalDependency, ExternalDependencyFinder
 
+# Subfolder being built in every test, relative to the project root
+_SUBFOLDER_TO_BUILD = Path("src", "integration", "empty_drawing_detection")
 
-@pytest.fixture
-def test_project_with_models_structure(tmp_path: Path) -> Path:
-    """Create a test project with models/ structure under src/."""
-    project_root = tmp_path / "test_project"
-    project_root.mkdir()
-
-    # Create src directory
-    src_dir = project_root / "src"
-    src_dir.mkdir()
-
-    # Create models/Information_extraction/_shared_ie/ structure
-    models_dir = src_dir / "models"
-    models_dir.mkdir()
-    info_extraction_dir = models_dir / "Information_extraction"
-    info_extraction_dir.mkdir()
-    shared_ie_dir = info_extraction_dir / "_shared_ie"
-    shared_ie_dir.mkdir()
-    (shared_ie_dir / "__init__.py").write_text("")
-    (shared_ie_dir / "ie_enums.py").write_text(
-        """from enum import Enum
+# Files of the models/ test project, keyed by path relative to the project root
+_MODELS_STRUCTURE_FILES = {
+    # models/Information_extraction/_shared_ie/ structure
+    "src/models/Information_extraction/_shared_ie/__init__.py": b"",
+    "src/models/Information_extraction/_shared_ie/ie_enums.py": b"""from enum import Enum
 
 class TitleblockPlacement(Enum):
     TOP = "top"
@@ -37,25 +26,13 @@ class TitleblockPlacement(Enum):
 class EmptyDrawingLikelihood(Enum):
     HIGH = "high"
     LOW = "low"
-"""
-    )
-
-    # Create data/spreadsheet_creation/ structure
-    data_dir = src_dir / "data"
-    data_dir.mkdir()
-    spreadsheet_creation_dir = data_dir / "spreadsheet_creation"
-    spreadsheet_creation_dir.mkdir()
-    (spreadsheet_creation_dir / "spreadsheet_formatting_dataclasses.py").write_text(
-        """class DataClass:
+""",
+    # data/spreadsheet_creation/ structure
+    "src/data/spreadsheet_creation/spreadsheet_formatting_dataclasses.py": b"""class DataClass:
     pass
-"""
-    )
-
-    # Create subfolder_to_build
-    subfolder = src_dir / "integration" / "empty_drawing_detection"
-    subfolder.mkdir(parents=True)
-    (subfolder / "detect_empty_drawings.py").write_text(
-        """from models.Information_extraction._shared_ie.ie_enums import (
+""",
+    # subfolder_to_build
+    "src/integration/empty_drawing_detection/detect_empty_drawings.py": b"""from models.Information_extraction._shared_ie.ie_enums import (
     TitleblockPlacement,
     EmptyDrawingLikelihood,
 )
@@ -63,19 +40,82 @@ from data.spreadsheet_creation.spreadsheet_formatting_dataclasses import DataCla
 
 def analyze_folder():
     return TitleblockPlacement.TOP, EmptyDrawingLikelihood.HIGH, DataClass()
+""",
+}
+
+
+def _create_project_with_models_structure(project_root: Path) -> Path:
+    """Create a test project with models/ structure under src/ under project_root."""
+    # Each file's directory is created with all its parents in one call
+    for relative_path, content in _MODELS_STRUCTURE_FILES.items():
+        file_path = project_root / relative_path
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_bytes(content)
+
+    return project_root
+
+
+@pytest.fixture(scope="module")
+def shared_project_with_models_structure(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """
+    Create the models/ test project once for the module.
+
+    Only for tests that read the tree; the build tests use prepared_build.
+    """
+    return _create_project_with_models_structure(
+        tmp_path_factory.mktemp("models_structure") / "test_project"
+    )
+
+
+@pytest.fixture(scope="module")
+def prepared_build(
+    tmp_path_factory: pytest.TempPathFactory, shared_project_with_models_structure: Path
+) -> Iterator[tuple[BuildManager, list[ExternalDependency]]]:
+    """
+    Run prepare_build once on a copy of the models/ test project.
+
+    Yields the manager and the external dependencies it found, and cleans up after the
+    last test of the module, even if an assertion failed.
+    """
+    # Files are copied rather than hard-linked: prepare_build rewrites files in place,
+    # which would otherwise leak into the shared tree
+    project_root = Path(
+        shutil.copytree(
+            shared_project_with_models_structure,
+            tmp_path_factory.mktemp("prepared_build") / "test_project",
+            copy_function=shutil.copyfile,
+        )
+    )
+    src_dir = project_root / _SUBFOLDER_TO_BUILD
+
+    # Create pyproject.toml for the test
+    (project_root / "pyproject.toml").write_bytes(
+        b"""[project]
+name = "test-package"
+version = "0.1.0"
+
+[tool.hatch.build.targets.wheel]
+packages = ["src/test_package"]
 """
     )
 
-    return project_root
+    manager = BuildManager(project_root, src_dir)
+
+    # Prepare build
+    external_deps = manager.prepare_build(version="1.0.0", package_name="test-package")
+
+    yield manager, external_deps
+
+    manager.cleanup()
 
 
 class TestPreserveDirectoryStructure:
     """Tests for preserving directory structure when copying external dependencies."""
 
-    def test_models_structure_preserved(self, test_project_with_models_structure: Path) -> None:
+    def test_models_structure_preserved(self, shared_project_with_models_structure: Path) -> None:
         """Test that models/ structure is preserved when copying."""
-        project_root = test_project_with_models_structure
-        src_dir = project_root / "src" / "integration" / "empty_drawing_detection"
+        project_root = shared_project_with_models_structure
+        src_dir = project_root / _SUBFOLDER_TO_BUILD
 
         finder = ExternalDependencyFinder(project_root, src_dir)
 
@@ -95,19 +135,18 @@ class TestPreserveDirectoryStructure:
         assert target is not None
         assert target.is_relative_to(src_dir)
         # Should preserve the structure: models/Information_extraction/_shared_ie/ie_enums.py
-        assert "models" in str(target)
-        assert "Information_extraction" in str(target)
-        assert "_shared_ie" in str(target)
-        assert target.name == "ie_enums.py"
         # Full path should be: src/integration/empty_drawing_detection/models/Information_extraction/_shared_ie/ie_enums.py
-        expected_parts = ["models", "Information_extraction", "_shared_ie", "ie_enums.py"]
-        for part in expected_parts:
-            assert part in str(target)
+        assert target.relative_to(src_dir).parts == (
+            "models",
+            "Information_extraction",
+            "_shared_ie",
+            "ie_enums.py",
+        )
 
-    def test_data_structure_preserved(self, test_project_with_models_structure: Path) -> None:
+    def test_data_structure_preserved(self, shared_project_with_models_structure: Path) -> None:
         """Test that data/ structure is preserved when copying."""
-        project_root = test_project_with_models_structure
-        src_dir = project_root / "src" / "integration" / "empty_drawing_detection"
+        project_root = shared_project_with_models_structure
+        src_dir = project_root / _SUBFOLDER_TO_BUILD
 
         finder = ExternalDependencyFinder(project_root, src_dir)
 
@@ -126,54 +165,42 @@ class TestPreserveDirectoryStructure:
         assert target is not None
         assert target.is_relative_to(src_dir)
         # Should preserve the structure: data/spreadsheet_creation/spreadsheet_formatting_dataclasses.py
-        assert "data" in str(target)
-        assert "spreadsheet_creation" in str(target)
-        assert target.name == "spreadsheet_formatting_dataclasses.py"
-
-    def test_build_manager_preserves_structure(
-        self, test_project_with_models_structure: Path
-    ) -> None:
-        """Test that BuildManager preserves directory structure when copying."""
-        project_root = test_project_with_models_structure
-        src_dir = project_root / "src" / "integration" / "empty_drawing_detection"
-
-        # Create pyproject.toml for the test
-        (project_root / "pyproject.toml").write_text(
-            """[project]
-name = "test-package"
-version = "0.1.0"
-
-[tool.hatch.build.targets.wheel]
-packages = ["src/test_package"]
-"""
+        assert target.relative_to(src_dir).parts == (
+            "data",
+            "spreadsheet_creation",
+            "spreadsheet_formatting_dataclasses.py",
         )
 
-        manager = BuildManager(project_root, src_dir)
-
-        # Prepare build
-        external_deps = manager.prepare_build(version="1.0.0", package_name="test-package")
+    def test_build_manager_finds_external_dependencies(
+        self, prepared_build: tuple[BuildManager, list[ExternalDependency]]
+    ) -> None:
+        """Test that BuildManager finds models and data as external dependencies."""
+        _, external_deps = prepared_build
 
-        # Should find models and data as external dependencies
         models_deps = [dep for dep in external_deps if "models" in dep.import_name.lower()]
         data_deps = [dep for dep in external_deps if "data" in dep.import_name.lower()]
 
         assert len(models_deps) > 0, "models dependencies should be found"
         assert len(data_deps) > 0, "data dependencies should be found"
 
-        # Verify models structure was copied with full path
+    def test_build_manager_preserves_structure(
+        self, prepared_build: tuple[BuildManager, list[ExternalDependency]]
+    ) -> None:
+        """Test that BuildManager preserves directory structure when copying."""
+        manager, _ = prepared_build
+
+        # Verify models and data structures were copied with full paths, listing the
+        # copied tree once
         # Use manager.src_dir which may point to temp package directory
         package_dir = manager.src_dir
-        models_path = package_dir / "models" / "Information_extraction" / "_shared_ie" / "ie_enums.py"
-        assert models_path.exists(), (
-            "models/Information_extraction/_shared_ie/ie_enums.py should be copied with full structure"
-        )
-
-        # Verify data structure was copied with full path
-        data_path = (
-            package_dir / "data" / "spreadsheet_creation" / "spreadsheet_formatting_dataclasses.py"
-        )
-        assert data_path.exists(), (
-            "data/spreadsheet_creation/spreadsheet_formatting_dataclasses.py should be copied with full structure"
+        copied_files = {
+            path.relative_to(package_dir).as_posix() for path in package_dir.rglob("*.py")
+        }
+        expected_files = {
+            "models/Information_extraction/_shared_ie/ie_enums.py",
+            "data/spreadsheet_creation/spreadsheet_formatting_dataclasses.py",
+        }
+        missing_files = expected_files - copied_files
+        assert not missing_files, (
+            f"{sorted(missing_files)} should be copied with full structure, found {sorted(copied_files)}"
         )
-
-        manager.cleanup()
@@ -2,12 +2,19 @@
 
 from __future__ import annotations
 
+import subprocess
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 from python_package_folder import Publisher, Repository
+from python_package_folder import publisher as publisher_module
+
+
+def _ok() -> subprocess.CompletedProcess[str]:
+    """Successful subprocess.run result with no output, to return from mocks."""
+    return subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr="")
 
 
 @pytest.fixture
@@ -82,18 +89,18 @@ class TestPublisher:
 
         assert url == custom_url
 
-    @patch("python_package_folder.publisher.subprocess.run")
+    @patch.object(publisher_module.subprocess, "run")
     def test_check_twine_installed(self, mock_run: MagicMock, test_dist_dir: Path) -> None:
         """Test checking if twine is installed."""
         publisher = Publisher(repository=Repository.PYPI, dist_dir=test_dist_dir)
 
-        mock_run.return_value = MagicMock(returncode=0)
+        mock_run.return_value = _ok()
         result = publisher._check_twine_installed()
 
         assert result is True
         mock_run.assert_called_once()
 
-    @patch("python_package_folder.publisher.subprocess.run")
+    @patch.object(publisher_module.subprocess, "run")
     def test_check_twine_not_installed(self, mock_run: MagicMock, test_dist_dir: Path) -> None:
         """Test when twine is not installed."""
         publisher = Publisher(repository=Repository.PYPI, dist_dir=test_dist_dir)
@@ -103,7 +110,9 @@ class TestPublisher:
 
         assert result is False
 
-    def test_publish_filters_by_package_name(self, test_dist_dir: Path) -> None:
+    def test_publish_filters_by_package_name(
+        self, test_dist_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Test that publish filters files by package name."""
         publisher = Publisher(
             repository=Repository.PYPI,
@@ -113,22 +122,27 @@ class TestPublisher:
         )
 
         # Mock subprocess to capture command
-        with patch("python_package_folder.publisher.subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(returncode=0)
-
-            # Mock credentials
-            with patch.object(publisher, "_get_credentials", return_value=("user", "pass")):
-                publisher.publish()
-
-            # Check that only package-1.0.0 files are in the command
-            call_args = mock_run.call_args[0][0]
-            file_args = [arg for arg in call_args if str(test_dist_dir) in str(arg)]
-
-            assert len(file_args) == 2  # wheel and source dist
-            assert all("package-1.0.0" in str(f) for f in file_args)
-            assert not any("other-package" in str(f) for f in file_args)
-
-    def test_publish_filters_exact_version(self, test_dist_dir: Path) -> None:
+        mock_run = MagicMock(return_value=_ok())
+        monkeypatch.setattr(publisher_module.subprocess, "run", mock_run)
+        # Mock credentials
+        monkeypatch.setattr(publisher, "_get_credentials", lambda: ("user", "pass"))
+
+        publisher.publish()
+
+        # Check that only package-1.0.0 files are in the command
+        dist_str = str(test_dist_dir)
+        call_strs = [str(arg) for arg in mock_run.call_args[0][0]]
+        file_args = [arg for arg in call_strs if dist_str in arg]
+        # Newline-separated, so a substring never spans two file names
+        joined_file_args = "\n".join(file_args)
+
+        assert len(file_args) == 2  # wheel and source dist
+        assert all("package-1.0.0" in f for f in file_args)
+        assert "other-package" not in joined_file_args
+
+    def test_publish_filters_exact_version(
+        self, test_dist_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Test that publish filters files by exact version (not partial matches)."""
         publisher = Publisher(
             repository=Repository.PYPI,
@@ -137,22 +151,26 @@ class TestPublisher:
             version="1.0.1",
         )
 
-        with patch("python_package_folder.publisher.subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(returncode=0)
+        mock_run = MagicMock(return_value=_ok())
+        monkeypatch.setattr(publisher_module.subprocess, "run", mock_run)
+        monkeypatch.setattr(publisher, "_get_credentials", lambda: ("user", "pass"))
 
-            with patch.object(publisher, "_get_credentials", return_value=("user", "pass")):
-                publisher.publish()
+        publisher.publish()
 
-            call_args = mock_run.call_args[0][0]
-            file_args = [arg for arg in call_args if str(test_dist_dir) in str(arg)]
+        dist_str = str(test_dist_dir)
+        call_strs = [str(arg) for arg in mock_run.call_args[0][0]]
+        file_args = [arg for arg in call_strs if dist_str in arg]
+        joined_file_args = "\n".join(file_args)
 
-            # Should only include 1.0.1 files, not 1.0.0 or 1.0.10
-            assert all("1.0.1" in str(f) for f in file_args)
-            assert not any("1.0.0" in str(f) for f in file_args)
-            assert not any("1.0.10" in str(f) for f in file_args)
-            assert len(file_args) == 2  # wheel and source dist
+        # Should only include 1.0.1 files, not 1.0.0 or 1.0.10
+        assert all("1.0.1" in f for f in file_args)
+        assert "1.0.0" not in joined_file_args
+        assert "1.0.10" not in joined_file_args
+        assert len(file_args) == 2  # wheel and source dist
 
-    def test_publish_filters_by_version(self, test_dist_dir: Path) -> None:
+    def test_publish_filters_by_version(
+        self, test_dist_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Test that publish filters files by version."""
         publisher = Publisher(
             repository=Repository.PYPI,
@@ -161,39 +179,44 @@ class TestPublisher:
             version="1.0.0",
         )
 
-        with patch("python_package_folder.publisher.subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(returncode=0)
+        mock_run = MagicMock(return_value=_ok())
+        monkeypatch.setattr(publisher_module.subprocess, "run", mock_run)
+        monkeypatch.setattr(publisher, "_get_credentials", lambda: ("user", "pass"))
 
-            with patch.object(publisher, "_get_credentials", return_value=("user", "pass")):
-                publisher.publish()
+        publisher.publish()
 
-            call_args = mock_run.call_args[0][0]
-            file_args = [arg for arg in call_args if str(test_dist_dir) in str(arg)]
+        dist_str = str(test_dist_dir)
+        call_strs = [str(arg) for arg in mock_run.call_args[0][0]]
+        file_args = [arg for arg in call_strs if dist_str in arg]
+        joined_file_args = "\n".join(file_args)
 
-            # Should only include 1.0.0 files, not 1.0.1, 1.0.10, or 2.0.0
-            assert all("1.0.0" in str(f) for f in file_args)
-            assert not any("1.0.1" in str(f) for f in file_args)
-            assert not any("1.0.10" in str(f) for f in file_args)
-            assert not any("2.0.0" in str(f) for f in file_args)
+        # Should only include 1.0.0 files, not 1.0.1, 1.0.10, or 2.0.0
+        assert all("1.0.0" in f for f in file_args)
+        assert "1.0.1" not in joined_file_args
+        assert "1.0.10" not in joined_file_args
+        assert "2.0.0" not in joined_file_args
 
-    def test_publish_no_filtering(self, test_dist_dir: Path) -> None:
+    def test_publish_no_filtering(
+        self, test_dist_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Test that publish includes all files when no filter specified."""
         publisher = Publisher(
             repository=Repository.PYPI,
             dist_dir=test_dist_dir,
         )
 
-        with patch("python_package_folder.publisher.subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(returncode=0)
+        mock_run = MagicMock(return_value=_ok())
+        monkeypatch.setattr(publisher_module.subprocess, "run", mock_run)
+        monkeypatch.setattr(publisher, "_get_credentials", lambda: ("user", "pass"))
 
-            with patch.object(publisher, "_get_credentials", return_value=("user", "pass")):
-                publisher.publish()
+        publisher.publish()
 
-            call_args = mock_run.call_args[0][0]
-            file_args = [arg for arg in call_args if str(test_dist_dir) in str(arg)]
+        dist_str = str(test_dist_dir)
+        call_strs = [str(arg) for arg in mock_run.call_args[0][0]]
+        file_args = [arg for arg in call_strs if dist_str in arg]
 
-            # Should include all distribution files (6 files: 4 wheels + 2 source dists)
-            assert len(file_args) == 6
+        # Should include all distribution files (6 files: 4 wheels + 2 source dists)
+        assert len(file_args) == 6
 
     def test_publish_raises_when_no_files(self, tmp_path: Path) -> None:
         """Test that publish raises when no distribution files found."""
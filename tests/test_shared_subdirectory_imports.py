@@ -2,53 +2,91 @@
 
 from __future__ import annotations
 
+import shutil
+from collections.abc import Iterator
 from pathlib import Path
 
 import pytest
 
-from python_package_folder import BuildManager, ImportAnalyzer, ImportInfo
+from python_package_folder import BuildManager, ExternalDependency, ImportAnalyzer, ImportInfo
 
+# Subfolder being built in every test, relative to the project root
+_SUBFOLDER_TO_BUILD = Path("src", "integration", "empty_drawing_detection")
 
-@pytest.fixture
-def test_project_with_shared(tmp_path: Path) -> Path:
-    """Create a test project with _shared subdirectory."""
-    project_root = tmp_path / "test_project"
-    project_root.mkdir()
-
-    # Create src directory
-    src_dir = project_root / "src"
-    src_dir.mkdir()
-
-    # Create _shared directory with better_enum.py
-    shared_dir = src_dir / "_shared"
-    shared_dir.mkdir()
-    (shared_dir / "better_enum.py").write_text(
-        """class Enum:
+# Files of the _shared test project, keyed by path relative to the project root
+_SHARED_PROJECT_FILES = {
+    # _shared directory with better_enum.py
+    "src/_shared/better_enum.py": b"""class Enum:
     pass
-"""
-    )
-
-    # Create subfolder_to_build
-    subfolder = src_dir / "integration" / "empty_drawing_detection"
-    subfolder.mkdir(parents=True)
-    (subfolder / "module.py").write_text(
-        """from better_enum import Enum
+""",
+    # subfolder_to_build
+    "src/integration/empty_drawing_detection/module.py": b"""from better_enum import Enum
 
 def use_enum():
     return Enum
-"""
-    )
+""",
+}
+
+
+def _create_project_with_shared(project_root: Path) -> Path:
+    """Create a test project with _shared subdirectory under project_root."""
+    # Each file's directory is created with all its parents in one call
+    for relative_path, content in _SHARED_PROJECT_FILES.items():
+        file_path = project_root / relative_path
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_bytes(content)
 
     return project_root
 
 
+@pytest.fixture(scope="module")
+def shared_project_with_shared(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """
+    Create the _shared test project once for the module.
+
+    Only for tests that read the tree; the build tests use prepared_build.
+    """
+    return _create_project_with_shared(tmp_path_factory.mktemp("shared") / "test_project")
+
+
+@pytest.fixture(scope="module")
+def prepared_build(
+    tmp_path_factory: pytest.TempPathFactory, shared_project_with_shared: Path
+) -> Iterator[tuple[BuildManager, list[ExternalDependency]]]:
+    """
+    Run prepare_build once on a copy of the _shared test project.
+
+    Yields the manager and the external dependencies it found, and cleans up after the
+    last test of the module, even if an assertion failed.
+    """
+    # Files are copied rather than hard-linked: prepare_build rewrites files in place,
+    # which would otherwise leak into the shared tree
+    project_root = Path(
+        shutil.copytree(
+            shared_project_with_shared,
+            tmp_path_factory.mktemp("prepared_build") / "test_project",
+            copy_function=shutil.copyfile,
+        )
+    )
+    src_dir = project_root / _SUBFOLDER_TO_BUILD
+
+    manager = BuildManager(project_root, src_dir)
+
+    # Prepare build
+    external_deps = manager.prepare_build(version="1.0.0", package_name="test-package")
+
+    yield manager, external_deps
+
+    manager.cleanup()
+
+
 class TestSharedSubdirectoryImports:
     """Tests for imports from _shared subdirectories."""
 
-    def test_resolve_better_enum_from_shared(self, test_project_with_shared: Path) -> None:
+    def test_resolve_better_enum_from_shared(self, shared_project_with_shared: Path) -> None:
         """Test that better_enum is resolved from src/_shared/better_enum.py."""
-        project_root = test_project_with_shared
-        src_dir = project_root / "src" / "integration" / "empty_drawing_detection"
+        project_root = shared_project_with_shared
+        src_dir = project_root / _SUBFOLDER_TO_BUILD
 
         analyzer = ImportAnalyzer(project_root)
 
@@ -71,37 +109,43 @@ class TestSharedSubdirectoryImports:
         assert "_shared" in str(import_info.resolved_path)
         assert import_info.resolved_path.exists()
 
-    def test_better_enum_copied_not_added_as_dependency(
-        self, test_project_with_shared: Path
+    def test_better_enum_found_as_external_dependency(
+        self, prepared_build: tuple[BuildManager, list[ExternalDependency]]
     ) -> None:
-        """Test that better_enum is copied as external dependency, not added as third-party."""
-        project_root = test_project_with_shared
-        src_dir = project_root / "src" / "integration" / "empty_drawing_detection"
+        """Test that better_enum is found as an external dependency to copy."""
+        _, external_deps = prepared_build
 
-        manager = BuildManager(project_root, src_dir)
-
-        # Prepare build
-        external_deps = manager.prepare_build(version="1.0.0", package_name="test-package")
-
-        # Should find better_enum as an external dependency to copy
         better_enum_deps = [dep for dep in external_deps if "better_enum" in dep.import_name]
         assert len(better_enum_deps) > 0, "better_enum should be found as external dependency"
 
+    def test_shared_directory_copied_to_subfolder(
+        self, prepared_build: tuple[BuildManager, list[ExternalDependency]]
+    ) -> None:
+        """Test that the _shared directory containing better_enum.py is copied."""
+        manager, _ = prepared_build
+        src_dir = manager.project_root / _SUBFOLDER_TO_BUILD
+
         # Verify _shared directory was copied (which contains better_enum.py)
-        copied_shared_dir = src_dir / "_shared"
-        assert copied_shared_dir.exists(), "_shared directory should be copied to subfolder"
-        copied_file = copied_shared_dir / "better_enum.py"
-        assert copied_file.exists(), "better_enum.py should be in copied _shared directory"
+        copied_files = {path.relative_to(src_dir).as_posix() for path in src_dir.rglob("*.py")}
+        assert "_shared/better_enum.py" in copied_files, (
+            f"better_enum.py should be in copied _shared directory, found {sorted(copied_files)}"
+        )
+
+    def test_better_enum_copied_not_added_as_dependency(
+        self, prepared_build: tuple[BuildManager, list[ExternalDependency]]
+    ) -> None:
+        """Test that better_enum is copied as external dependency, not added as third-party."""
+        manager, _ = prepared_build
 
         # Check that subfolder_config exists (for subfolder builds)
         if manager.subfolder_config:
-            # Read the temporary pyproject.toml
-            pyproject_path = project_root / "pyproject.toml"
-            if pyproject_path.exists():
-                content = pyproject_path.read_text()
-                # Should NOT have better-enum or better_enum in dependencies
-                # (it should be copied, not added as dependency)
-                assert '"better-enum"' not in content
-                assert '"better_enum"' not in content
-
-        manager.cleanup()
+            # Read the temporary pyproject.toml, in a single call; nothing to check if the
+            # build did not create one
+            try:
+                content = (manager.project_root / "pyproject.toml").read_text()
+            except FileNotFoundError:
+                content = ""
+            # Should NOT have better-enum or better_enum in dependencies
+            # (it should be copied, not added as dependency)
+            assert '"better-enum"' not in content
+            assert '"better_enum"' not in content
@@ -2,63 +2,111 @@
 
 from __future__ import annotations
 
+import shutil
+from collections.abc import Iterator
 from pathlib import Path
 
 import pytest
 
-from python_package_folder import BuildManager, ImportAnalyzer, ImportInfo
+from python_package_folder import BuildManager, ExternalDependency, ImportAnalyzer, ImportInfo
 
+# Subfolder being built in every test, relative to the project root
+_SUBFOLDER_TO_BUILD = Path("src", "integration", "empty_drawing_detection")
 
-@pytest.fixture
-def test_project_with_spreadsheet_creation(tmp_path: Path) -> Path:
-    """Create a test project with spreadsheet_creation subdirectory."""
-    project_root = tmp_path / "test_project"
-    project_root.mkdir()
-
-    # Create src directory
-    src_dir = project_root / "src"
-    src_dir.mkdir()
-
-    # Create data/spreadsheet_creation directory with files
-    data_dir = src_dir / "data"
-    data_dir.mkdir()
-    spreadsheet_creation_dir = data_dir / "spreadsheet_creation"
-    spreadsheet_creation_dir.mkdir()
-    (spreadsheet_creation_dir / "spreadsheet_formatting_dataclasses.py").write_text(
-        """class DataClass:
+# Files of the spreadsheet_creation test project, keyed by path relative to the
+# project root
+_SPREADSHEET_CREATION_FILES = {
+    # data/spreadsheet_creation directory with files
+    "src/data/spreadsheet_creation/spreadsheet_formatting_dataclasses.py": b"""class DataClass:
     pass
-"""
-    )
-    (spreadsheet_creation_dir / "spreadsheet_utils.py").write_text(
-        """def util_func():
+""",
+    "src/data/spreadsheet_creation/spreadsheet_utils.py": b"""def util_func():
     pass
-"""
-    )
-
-    # Create subfolder_to_build
-    subfolder = src_dir / "integration" / "empty_drawing_detection"
-    subfolder.mkdir(parents=True)
-    (subfolder / "module.py").write_text(
-        """from spreadsheet_formatting_dataclasses import DataClass
+""",
+    # subfolder_to_build
+    "src/integration/empty_drawing_detection/module.py": b"""from spreadsheet_formatting_dataclasses import DataClass
 from spreadsheet_utils import util_func
 
 def use_spreadsheet():
     return DataClass, util_func
+""",
+}
+
+
+def _create_project_with_spreadsheet_creation(project_root: Path) -> Path:
+    """Create a test project with spreadsheet_creation subdirectory under project_root."""
+    # Each file's directory is created with all its parents in one call
+    for relative_path, content in _SPREADSHEET_CREATION_FILES.items():
+        file_path = project_root / relative_path
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_bytes(content)
+
+    return project_root
+
+
+@pytest.fixture(scope="module")
+def shared_project_with_spreadsheet_creation(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """
+    Create the spreadsheet_creation test project once for the module.
+
+    Only for tests that read the tree; the build tests use prepared_build.
+    """
+    return _create_project_with_spreadsheet_creation(
+        tmp_path_factory.mktemp("spreadsheet_creation") / "test_project"
+    )
+
+
+@pytest.fixture(scope="module")
+def prepared_build(
+    tmp_path_factory: pytest.TempPathFactory, shared_project_with_spreadsheet_creation: Path
+) -> Iterator[tuple[BuildManager, list[ExternalDependency]]]:
+    """
+    Run prepare_build once on a copy of the spreadsheet_creation test project.
+
+    Yields the manager and the external dependencies it found, and cleans up after the
+    last test of the module, even if an assertion failed.
+    """
+    # Files are copied rather than hard-linked: prepare_build rewrites files in place,
+    # which would otherwise leak into the shared tree
+    project_root = Path(
+        shutil.copytree(
+            shared_project_with_spreadsheet_creation,
+            tmp_path_factory.mktemp("prepared_build") / "test_project",
+            copy_function=shutil.copyfile,
+        )
+    )
+    src_dir = project_root / _SUBFOLDER_TO_BUILD
+
+    # Create pyproject.toml for the test
+    (project_root / "pyproject.toml").write_bytes(
+        b"""[project]
+name = "test-package"
+version = "0.1.0"
+
+[tool.hatch.build.targets.wheel]
+packages = ["src/test_package"]
 """
     )
 
-    return project_root
+    manager = BuildManager(project_root, src_dir)
+
+    # Prepare build
+    external_deps = manager.prepare_build(version="1.0.0", package_name="test-package")
+
+    yield manager, external_deps
+
+    manager.cleanup()
 
 
 class TestSpreadsheetCreationImports:
     """Tests for imports from spreadsheet_creation subdirectory."""
 
     def test_resolve_spreadsheet_formatting_dataclasses(
-        self, test_project_with_spreadsheet_creation: Path
+        self, shared_project_with_spreadsheet_creation: Path
     ) -> None:
         """Test that spreadsheet_formatting_dataclasses is resolved from data/spreadsheet_creation."""
-        project_root = test_project_with_spreadsheet_creation
-        src_dir = project_root / "src" / "integration" / "empty_drawing_detection"
+        project_root = shared_project_with_spreadsheet_creation
+        src_dir = project_root / _SUBFOLDER_TO_BUILD
 
         analyzer = ImportAnalyzer(project_root)
 
@@ -81,10 +129,12 @@ class TestSpreadsheetCreationImports:
         assert "spreadsheet_creation" in str(import_info.resolved_path)
         assert import_info.resolved_path.exists()
 
-    def test_resolve_spreadsheet_utils(self, test_project_with_spreadsheet_creation: Path) -> None:
+    def test_resolve_spreadsheet_utils(
+        self, shared_project_with_spreadsheet_creation: Path
+    ) -> None:
         """Test that spreadsheet_utils is resolved from data/spreadsheet_creation."""
-        project_root = test_project_with_spreadsheet_creation
-        src_dir = project_root / "src" / "integration" / "empty_drawing_detection"
+        project_root = shared_project_with_spreadsheet_creation
+        src_dir = project_root / _SUBFOLDER_TO_BUILD
 
         analyzer = ImportAnalyzer(project_root)
 
@@ -106,30 +156,12 @@ class TestSpreadsheetCreationImports:
         assert "spreadsheet_creation" in str(import_info.resolved_path)
         assert import_info.resolved_path.exists()
 
-    def test_spreadsheet_modules_copied_not_added_as_dependencies(
-        self, test_project_with_spreadsheet_creation: Path
+    def test_spreadsheet_modules_found_as_external_dependencies(
+        self, prepared_build: tuple[BuildManager, list[ExternalDependency]]
     ) -> None:
-        """Test that spreadsheet modules are copied, not added as dependencies."""
-        project_root = test_project_with_spreadsheet_creation
-        src_dir = project_root / "src" / "integration" / "empty_drawing_detection"
+        """Test that spreadsheet modules are found as external dependencies to copy."""
+        _, external_deps = prepared_build
 
-        # Create pyproject.toml for the test
-        (project_root / "pyproject.toml").write_text(
-            """[project]
-name = "test-package"
-version = "0.1.0"
-
-[tool.hatch.build.targets.wheel]
-packages = ["src/test_package"]
-"""
-        )
-
-        manager = BuildManager(project_root, src_dir)
-
-        # Prepare build
-        external_deps = manager.prepare_build(version="1.0.0", package_name="test-package")
-
-        # Should find spreadsheet modules as external dependencies to copy
         spreadsheet_deps = [
             dep for dep in external_deps if "spreadsheet" in dep.import_name.lower()
         ]
@@ -137,31 +169,44 @@ packages = ["src/test_package"]
             "spreadsheet modules should be found as external dependencies"
         )
 
+    def test_spreadsheet_creation_copied_with_structure(
+        self, prepared_build: tuple[BuildManager, list[ExternalDependency]]
+    ) -> None:
+        """Test that the spreadsheet_creation directory is copied with its structure."""
+        manager, _ = prepared_build
+
         # Verify spreadsheet_creation directory was copied with full structure preserved
         # Import is "data.spreadsheet_creation.spreadsheet_formatting_dataclasses", so structure should be preserved
         # Use manager.src_dir which may point to temp package directory
         package_dir = manager.src_dir
-        copied_dir = package_dir / "data" / "spreadsheet_creation"
-        assert copied_dir.exists(), (
-            f"spreadsheet_creation directory should be copied with structure at {copied_dir}"
-        )
-        assert (copied_dir / "spreadsheet_formatting_dataclasses.py").exists(), (
-            "spreadsheet_formatting_dataclasses.py should be copied"
-        )
-        assert (copied_dir / "spreadsheet_utils.py").exists(), (
-            "spreadsheet_utils.py should be copied"
+        copied_files = {
+            path.relative_to(package_dir).as_posix() for path in package_dir.rglob("*.py")
+        }
+        expected_files = {
+            "data/spreadsheet_creation/spreadsheet_formatting_dataclasses.py",
+            "data/spreadsheet_creation/spreadsheet_utils.py",
+        }
+        missing_files = expected_files - copied_files
+        assert not missing_files, (
+            f"{sorted(missing_files)} should be copied with structure, found {sorted(copied_files)}"
         )
 
+    def test_spreadsheet_modules_copied_not_added_as_dependencies(
+        self, prepared_build: tuple[BuildManager, list[ExternalDependency]]
+    ) -> None:
+        """Test that spreadsheet modules are copied, not added as dependencies."""
+        manager, _ = prepared_build
+
         # Check that subfolder_config exists (for subfolder builds)
         if manager.subfolder_config:
-            # Read the temporary pyproject.toml
-            pyproject_path = project_root / "pyproject.toml"
-            if pyproject_path.exists():
-                content = pyproject_path.read_text()
-                # Should NOT have spreadsheet-formatting-dataclasses or spreadsheet-utils in dependencies
-                assert '"spreadsheet-formatting-dataclasses"' not in content
-                assert '"spreadsheet-utils"' not in content
-                assert '"spreadsheet_formatting_dataclasses"' not in content
-                assert '"spreadsheet_utils"' not in content
-
-        manager.cleanup()
+            # Read the temporary pyproject.toml, in a single call; nothing to check if the
+            # build did not create one
+            try:
+                content = (manager.project_root / "pyproject.toml").read_text()
+            except FileNotFoundError:
+                content = ""
+            # Should NOT have spreadsheet-formatting-dataclasses or spreadsheet-utils in dependencies
+            assert '"spreadsheet-formatting-dataclasses"' not in content
+            assert '"spreadsheet-utils"' not in content
+            assert '"spreadsheet_formatting_dataclasses"' not in content
+            assert '"spreadsheet_utils"' not in content
@@ -16,59 +16,54 @@ File: tests/test_subfolder_build_config.py
 
 from __future__ import annotations
 
+import shutil
 import subprocess
 import sys
 import tempfile
+import tomllib
 import venv
 import zipfile
+from collections.abc import Callable, Iterator
 from pathlib import Path
+from typing import Any
 
 import pytest
 
 from python_package_folder import BuildManager, SubfolderBuildConfig
 
+# Project root for tests that only inspect attributes set by SubfolderBuildConfig.__init__
+_MISSING_PROJECT_ROOT = Path("/nonexistent/test_project")
 
-@pytest.fixture
-def test_project_with_pyproject(tmp_path: Path) -> Path:
-    """Create a test project with pyproject.toml."""
-    project_root = tmp_path / "test_project"
-    project_root.mkdir()
 
-    # Create pyproject.toml
-    pyproject_content = """[project]
-name = "test-package"
-version = "0.1.0"
-dynamic = ["version"]
-
-[tool.hatch.version]
-source = "uv-dynamic-versioning"
-
-[tool.uv-dynamic-versioning]
-vcs = "git"
-style = "pep440"
-bump = true
+@pytest.fixture(scope="module")
+def created_temp_pyproject(
+    tmp_path_factory: pytest.TempPathFactory, subfolder_project_template: Path
+) -> Iterator[tuple[SubfolderBuildConfig, dict[str, Any]]]:
+    """
+    Run create_temp_pyproject once, with the dev dependency group, on a copy of the test project.
 
-[tool.hatch.build.targets.wheel]
-packages = ["src/test_package"]
+    Only for tests that inspect the result; yields the config and the parsed temporary
+    pyproject.toml, and restores the project after the last test of the module.
+    """
+    project_root = Path(
+        shutil.copytree(
+            subfolder_project_template,
+            tmp_path_factory.mktemp("created_temp_pyproject") / "test_project",
+            copy_function=shutil.copyfile,
+        )
+    )
+    config = SubfolderBuildConfig(
+        project_root=project_root,
+        src_dir=project_root / "subfolder",
+        version="2.0.0",
+        dependency_group="dev",
+    )
 
-[dependency-groups]
-dev = [
-    "pytest>=8.0.0",
-    "pytest-cov>=4.0.0",
-]
-test = [
-    "pytest>=8.0.0",
-    "mypy>=1.0.0",
-]
-"""
-    (project_root / "pyproject.toml").write_text(pyproject_content)
+    pyproject_path = config.create_temp_pyproject()
 
-    # Create subfolder
-    subfolder = project_root / "subfolder"
-    subfolder.mkdir(exist_ok=True)
-    (subfolder / "module.py").write_text("def func(): pass")
+    yield config, tomllib.loads(pyproject_path.read_text())
 
-    return project_root
+    config.restore()
 
 
 class TestSubfolderBuildConfig:
@@ -86,11 +81,12 @@ class TestSubfolderBuildConfig:
     and temporary file management should go in this class.
     """
 
-    def test_init_with_defaults(self, test_project_with_pyproject: Path) -> None:
+    def test_init_with_defaults(self, subfolder_project_template: Path) -> None:
         """Test initialization with default package name."""
+        # __init__ only reads the project, so the shared template needn't be copied
         config = SubfolderBuildConfig(
-            project_root=test_project_with_pyproject,
-            src_dir=test_project_with_pyproject / "subfolder",
+            project_root=subfolder_project_template,
+            src_dir=subfolder_project_template / "subfolder",
             version="1.0.0",
         )
 
@@ -98,56 +94,74 @@ class TestSubfolderBuildConfig:
         assert config.version == "1.0.0"
         assert config.dependency_group is None
 
-    def test_init_with_custom_name(self, test_project_with_pyproject: Path) -> None:
-        """Test initialization with custom package name."""
+    @pytest.mark.parametrize(
+        ("extra_kwargs", "expected_dependency_group"),
+        [({}, None), ({"dependency_group": "dev"}, "dev")],
+        ids=["custom_name", "dependency_group"],
+    )
+    def test_init_with_custom_name(
+        self, extra_kwargs: dict[str, str], expected_dependency_group: str | None
+    ) -> None:
+        """Test initialization with custom package name, with and without dependency group."""
+        # With an explicit package name, __init__ doesn't read the project, so it needn't exist
         config = SubfolderBuildConfig(
-            project_root=test_project_with_pyproject,
-            src_dir=test_project_with_pyproject / "subfolder",
+            project_root=_MISSING_PROJECT_ROOT,
+            src_dir=_MISSING_PROJECT_ROOT / "subfolder",
             package_name="custom-package",
             version="1.0.0",
+            **extra_kwargs,
         )
 
         assert config.package_name == "custom-package"
         assert config.version == "1.0.0"
+        assert config.dependency_group == expected_dependency_group
 
-    def test_init_with_dependency_group(self, test_project_with_pyproject: Path) -> None:
-        """Test initialization with dependency group."""
-        config = SubfolderBuildConfig(
-            project_root=test_project_with_pyproject,
-            src_dir=test_project_with_pyproject / "subfolder",
-            version="1.0.0",
-            dependency_group="dev",
-        )
-
-        assert config.dependency_group == "dev"
-
-    def test_create_temp_pyproject(self, test_project_with_pyproject: Path) -> None:
+    def test_create_temp_pyproject(
+        self, created_temp_pyproject: tuple[SubfolderBuildConfig, dict[str, Any]]
+    ) -> None:
         """Test creating temporary pyproject.toml."""
-        config = SubfolderBuildConfig(
-            project_root=test_project_with_pyproject,
-            src_dir=test_project_with_pyproject / "subfolder",
-            version="2.0.0",
-        )
+        config, data = created_temp_pyproject
 
-        pyproject_path = config.create_temp_pyproject()
-
-        assert pyproject_path.exists()
-        content = pyproject_path.read_text()
+        # Other tests read the content config kept in memory instead of the file
+        assert config._temp_pyproject_content == (config.project_root / "pyproject.toml").read_text()
 
         # Check package name and version are set
-        assert 'name = "test-package-subfolder"' in content
-        assert 'version = "2.0.0"' in content
+        assert data["project"]["name"] == "test-package-subfolder"
+        assert data["project"]["version"] == "2.0.0"
 
         # Check dynamic versioning is removed
-        assert 'dynamic = ["version"]' not in content
-        assert "[tool.hatch.version]" not in content
-        assert "[tool.uv-dynamic-versioning]" not in content
+        assert "version" not in data["project"].get("dynamic", [])
+        assert "version" not in data["tool"]["hatch"]
+        assert "uv-dynamic-versioning" not in data["tool"]
 
     def test_create_temp_pyproject_with_dependency_group(
-        self, test_project_with_pyproject: Path
+        self, created_temp_pyproject: tuple[SubfolderBuildConfig, dict[str, Any]]
     ) -> None:
         """Test creating temporary pyproject.toml with dependency group."""
-        config = SubfolderBuildConfig(
+        _, data = created_temp_pyproject
+
+        # Check only the dependency group is included
+        assert data["dependency-groups"] == {"dev": ["pytest>=8.0.0", "pytest-cov>=4.0.0"]}
+
+    def test_create_temp_pyproject_with_dependency_group_before_other_sections(
+        self, test_project_with_pyproject: Path, config_factory: Callable[..., SubfolderBuildConfig]
+    ) -> None:
+        """Test the dependency group replaces an existing section followed by [build-system]."""
+        (test_project_with_pyproject / "pyproject.toml").write_bytes(
+            b"""[project]
+name = "test-package"
+dynamic = ["version"]
+
+[dependency-groups]
+dev = ["pytest>=8.0.0"]
+lint = ["ruff"]
+
+[build-system]
+requires = ["hatchling"]
+build-backend = "hatchling.build"
+"""
+        )
+        config = config_factory(
             project_root=test_project_with_pyproject,
             src_dir=test_project_with_pyproject / "subfolder",
             version="2.0.0",
@@ -155,38 +169,57 @@ class TestSubfolderBuildConfig:
         )
 
         pyproject_path = config.create_temp_pyproject()
-        content = pyproject_path.read_text()
+        data = tomllib.loads(pyproject_path.read_text())
 
-        # Check dependency group is included
-        assert "[dependency-groups]" in content
-        assert "dev = [" in content
-        assert '"pytest>=8.0.0"' in content
+        assert data["dependency-groups"] == {"dev": ["pytest>=8.0.0"]}
+        assert data["project"]["version"] == "2.0.0"
 
-    def test_create_temp_pyproject_creates_init(self, test_project_with_pyproject: Path) -> None:
-        """Test that __init__.py is created if missing."""
-        subfolder = test_project_with_pyproject / "subfolder"
-        config = SubfolderBuildConfig(
+    def test_create_temp_pyproject_with_wheel_section_last(
+        self, test_project_with_pyproject: Path, config_factory: Callable[..., SubfolderBuildConfig]
+    ) -> None:
+        """Test packages is written once when the wheel section ends the file without it."""
+        (test_project_with_pyproject / "pyproject.toml").write_bytes(
+            b"""[project]
+name = "test-package"
+version = "0.1.0"
+
+[tool.hatch.build.targets.wheel]
+sources = ["src"]
+"""
+        )
+        config = config_factory(
             project_root=test_project_with_pyproject,
-            src_dir=subfolder,
-            version="1.0.0",
+            src_dir=test_project_with_pyproject / "subfolder",
+            version="2.0.0",
         )
 
-        # Ensure __init__.py doesn't exist
-        init_file = subfolder / "__init__.py"
-        if init_file.exists():
-            init_file.unlink()
+        pyproject_path = config.create_temp_pyproject()
+        data = tomllib.loads(pyproject_path.read_text())
 
-        config.create_temp_pyproject()
+        wheel = data["tool"]["hatch"]["build"]["targets"]["wheel"]
+        assert wheel["packages"] == ["test_package_subfolder"]
+
+    def test_create_temp_pyproject_creates_init(
+        self, created_temp_pyproject: tuple[SubfolderBuildConfig, dict[str, Any]]
+    ) -> None:
+        """Test that __init__.py is created if missing."""
+        # The test project's subfolder has no __init__.py
+        config, _ = created_temp_pyproject
 
         # Check __init__.py was created
-        assert init_file.exists()
+        assert (config.src_dir / "__init__.py").exists()
         assert config._temp_init_created
 
-    def test_restore_pyproject(self, test_project_with_pyproject: Path) -> None:
+    def test_restore_pyproject(
+        self,
+        test_project_with_pyproject: Path,
+        subfolder_project_pyproject_text: str,
+        config_factory: Callable[..., SubfolderBuildConfig],
+    ) -> None:
         """Test restoring original pyproject.toml."""
-        original_content = (test_project_with_pyproject / "pyproject.toml").read_text()
+        original_content = subfolder_project_pyproject_text
 
-        config = SubfolderBuildConfig(
+        config = config_factory(
             project_root=test_project_with_pyproject,
             src_dir=test_project_with_pyproject / "subfolder",
             version="1.0.0",
@@ -202,7 +235,9 @@ class TestSubfolderBuildConfig:
         # Check backup is removed
         assert not (test_project_with_pyproject / "pyproject.toml.original").exists()
 
-    def test_restore_removes_temp_init(self, test_project_with_pyproject: Path) -> None:
+    def test_restore_removes_temp_init(
+        self, test_project_with_pyproject: Path, config_factory: Callable[..., SubfolderBuildConfig]
+    ) -> None:
         """Test that restore removes temporary __init__.py."""
         subfolder = test_project_with_pyproject / "subfolder"
         init_file = subfolder / "__init__.py"
@@ -211,7 +246,7 @@ class TestSubfolderBuildConfig:
         if init_file.exists():
             init_file.unlink()
 
-        config = SubfolderBuildConfig(
+        config = config_factory(
             project_root=test_project_with_pyproject,
             src_dir=subfolder,
             version="1.0.0",
@@ -225,15 +260,17 @@ class TestSubfolderBuildConfig:
         # Check __init__.py was removed
         assert not init_file.exists()
 
-    def test_restore_preserves_existing_init(self, test_project_with_pyproject: Path) -> None:
+    def test_restore_preserves_existing_init(
+        self, test_project_with_pyproject: Path, config_factory: Callable[..., SubfolderBuildConfig]
+    ) -> None:
         """Test that restore preserves existing __init__.py."""
         subfolder = test_project_with_pyproject / "subfolder"
         init_file = subfolder / "__init__.py"
 
         # Create existing __init__.py
-        init_file.write_text("# Original content")
+        init_file.write_bytes(b"# Original content")
 
-        config = SubfolderBuildConfig(
+        config = config_factory(
             project_root=test_project_with_pyproject,
             src_dir=subfolder,
             version="1.0.0",
@@ -246,9 +283,11 @@ class TestSubfolderBuildConfig:
         assert init_file.exists()
         assert init_file.read_text() == "# Original content"
 
-    def test_context_manager(self, test_project_with_pyproject: Path) -> None:
+    def test_context_manager(
+        self, test_project_with_pyproject: Path, subfolder_project_pyproject_text: str
+    ) -> None:
         """Test using SubfolderBuildConfig as context manager."""
-        original_content = (test_project_with_pyproject / "pyproject.toml").read_text()
+        original_content = subfolder_project_pyproject_text
 
         with SubfolderBuildConfig(
             project_root=test_project_with_pyproject,
@@ -264,64 +303,68 @@ class TestSubfolderBuildConfig:
         assert restored_content == original_content
 
     def test_missing_dependency_group_warning(
-        self, test_project_with_pyproject: Path, capsys: pytest.CaptureFixture[str]
+        self,
+        test_project_with_pyproject: Path,
+        config_factory: Callable[..., SubfolderBuildConfig],
     ) -> None:
-        """Test warning when dependency group doesn't exist."""
-        config = SubfolderBuildConfig(
+        """Test that a dependency group missing from the parent doesn't stop the build."""
+        config = config_factory(
             project_root=test_project_with_pyproject,
             src_dir=test_project_with_pyproject / "subfolder",
             version="1.0.0",
             dependency_group="nonexistent",
         )
 
-        # Create temp pyproject - this should print a warning
-        config.create_temp_pyproject()
+        # Create temp pyproject - this prints a warning, which is non-fatal
+        pyproject_path = config.create_temp_pyproject()
 
-        # The warning is printed to stderr during create_temp_pyproject
-        # Since capsys might not capture it properly, we'll just verify
-        # that the build still works (warning is non-fatal)
         assert config.temp_pyproject is not None
+        data = tomllib.loads(pyproject_path.read_text())
+        assert "nonexistent" not in data.get("dependency-groups", {})
 
-    def test_version_required(self, test_project_with_pyproject: Path) -> None:
+    def test_version_required(self, subfolder_project_template: Path) -> None:
         """Test that version is required."""
+        # create_temp_pyproject fails before writing anything, so the template isn't modified
         config = SubfolderBuildConfig(
-            project_root=test_project_with_pyproject,
-            src_dir=test_project_with_pyproject / "subfolder",
+            project_root=subfolder_project_template,
+            src_dir=subfolder_project_template / "subfolder",
         )
 
         with pytest.raises(ValueError, match="Version is required"):
             config.create_temp_pyproject()
 
-    def test_package_name_derivation(self, test_project_with_pyproject: Path) -> None:
+    def test_package_name_derivation(self, subfolder_project_template: Path) -> None:
         """Test package name derivation from root project name and directory name."""
-        # Test with underscores
-        subfolder = test_project_with_pyproject / "subfolder_to_build"
-        subfolder.mkdir(exist_ok=True)
+        # Only the root pyproject.toml is read, so the subfolder needn't exist
         config = SubfolderBuildConfig(
-            project_root=test_project_with_pyproject,
-            src_dir=subfolder,
+            project_root=subfolder_project_template,
+            src_dir=subfolder_project_template / "subfolder_to_build",
             version="1.0.0",
         )
         assert config.package_name == "test-package-subfolder-to-build"
 
-        # Test with spaces
-        subfolder2 = test_project_with_pyproject / "subfolder with spaces"
-        subfolder2.mkdir()
-        config2 = SubfolderBuildConfig(
-            project_root=test_project_with_pyproject,
-            src_dir=subfolder2,
-            version="1.0.0",
-        )
-        assert config2.package_name == "test-package-subfolder-with-spaces"
+    @pytest.mark.parametrize(
+        ("root_project_name", "dirname", "expected"),
+        [
+            ("test-package", "subfolder_to_build", "test-package-subfolder-to-build"),
+            ("test-package", "subfolder with spaces", "test-package-subfolder-with-spaces"),
+            ("Test_Package", "_Subfolder_", "test-package-subfolder"),
+            (None, "subfolder_to_build", "subfolder-to-build"),
+        ],
+    )
+    def test_combine_package_name(
+        self, root_project_name: str | None, dirname: str, expected: str
+    ) -> None:
+        """Test combining root project and directory names without touching the filesystem."""
+        assert SubfolderBuildConfig._combine_package_name(root_project_name, dirname) == expected
     
     def test_package_name_derivation_no_root_project(self, tmp_path: Path) -> None:
         """Test package name derivation when root project name is not found (fallback)."""
         # Create a project without pyproject.toml
         project_root = tmp_path / "test_project_no_pyproject"
-        project_root.mkdir()
-        
         subfolder = project_root / "subfolder"
-        subfolder.mkdir(exist_ok=True)
+        # Creates project_root along with the subfolder
+        subfolder.mkdir(parents=True)
         
         config = SubfolderBuildConfig(
             project_root=project_root,
@@ -332,51 +375,54 @@ class TestSubfolderBuildConfig:
         assert config.package_name == "subfolder"
 
 
-def test_readme_handling_with_existing_readme(test_project_with_pyproject: Path):
+def test_readme_handling_with_existing_readme(
+    test_project_with_pyproject: Path, config_factory: Callable[..., SubfolderBuildConfig]
+):
     """Test that subfolder README is used when it exists."""
     project_root = test_project_with_pyproject
     subfolder = project_root / "subfolder"
 
     # Create README in subfolder
     subfolder_readme = subfolder / "README.md"
-    subfolder_readme.write_text("# Subfolder Package\n\nThis is the subfolder README.")
+    subfolder_readme.write_bytes(b"# Subfolder Package\n\nThis is the subfolder README.")
 
     # Create README in project root
     project_readme = project_root / "README.md"
-    project_readme.write_text("# Parent Package\n\nThis is the parent README.")
+    project_readme.write_bytes(b"# Parent Package\n\nThis is the parent README.")
 
-    config = SubfolderBuildConfig(
+    config = config_factory(
         project_root=project_root,
         src_dir=subfolder,
         version="1.0.0",
     )
 
-    try:
-        config.create_temp_pyproject()
+    config.create_temp_pyproject()
 
-        # Check that subfolder README was copied to project root
-        assert (project_root / "README.md").exists()
-        content = (project_root / "README.md").read_text()
-        assert "Subfolder Package" in content
-        assert "This is the subfolder README" in content
-        assert "Parent Package" not in content
-
-        # Check that backup was created
-        assert (project_root / "README.md.backup").exists()
-        backup_content = (project_root / "README.md.backup").read_text()
-        assert "Parent Package" in backup_content
-    finally:
-        config.restore()
+    # Check that subfolder README was copied to project root
+    assert (project_root / "README.md").exists()
+    content = (project_root / "README.md").read_text()
+    assert "Subfolder Package" in content
+    assert "This is the subfolder README" in content
+    assert "Parent Package" not in content
+
+    # Check that backup was created
+    assert (project_root / "README.md.backup").exists()
+    backup_content = (project_root / "README.md.backup").read_text()
+    assert "Parent Package" in backup_content
+
+    config.restore()
 
-        # Verify original README was restored
-        assert (project_root / "README.md").exists()
-        restored_content = (project_root / "README.md").read_text()
-        assert "Parent Package" in restored_content
-        assert "Subfolder Package" not in restored_content
-        assert not (project_root / "README.md.backup").exists()
+    # Verify original README was restored
+    assert (project_root / "README.md").exists()
+    restored_content = (project_root / "README.md").read_text()
+    assert "Parent Package" in restored_content
+    assert "Subfolder Package" not in restored_content
+    assert not (project_root / "README.md.backup").exists()
 
 
-def test_readme_handling_without_readme(test_project_with_pyproject: Path):
+def test_readme_handling_without_readme(
+    test_project_with_pyproject: Path, config_factory: Callable[..., SubfolderBuildConfig]
+):
     """Test that minimal README is created when subfolder has no README."""
     project_root = test_project_with_pyproject
     subfolder = project_root / "subfolder"
@@ -385,29 +431,25 @@ def test_readme_handling_without_readme(test_project_with_pyproject: Path):
     assert not (subfolder / "README.md").exists()
     assert not (subfolder / "README.rst").exists()
 
-    config = SubfolderBuildConfig(
+    config = config_factory(
         project_root=project_root,
         src_dir=subfolder,
         version="1.0.0",
     )
 
-    try:
-        config.create_temp_pyproject()
-
-        # Check that minimal README was created
-        assert (project_root / "README.md").exists()
-        content = (project_root / "README.md").read_text()
-        assert content.strip() == f"# {subfolder.name}"
-    finally:
-        config.restore()
-
-        # Verify README was removed if it didn't exist before
-        if not (project_root / "README.md.backup").exists():
-            # No backup means no original README, so temp should be removed
-            assert (
-                not (project_root / "README.md").exists()
-                or (project_root / "README.md").read_text() != f"# {subfolder.name}\n"
-            )
+    config.create_temp_pyproject()
 
+    # Check that minimal README was created
+    assert (project_root / "README.md").exists()
+    content = (project_root / "README.md").read_text()
+    assert content.strip() == f"# {subfolder.name}"
 
+    config.restore()
 
+    # Verify README was removed if it didn't exist before
+    if not (project_root / "README.md.backup").exists():
+        # No backup means no original README, so temp should be removed
+        assert (
+            not (project_root / "README.md").exists()
+            or (project_root / "README.md").read_text() != f"# {subfolder.name}\n"
+        )
@@ -25,54 +25,9 @@ import venv
 import zipfile
 from pathlib import Path
 
-import pytest
-
 from python_package_folder import BuildManager, SubfolderBuildConfig
 
 
-@pytest.fixture
-def test_project_with_pyproject(tmp_path: Path) -> Path:
-    """Create a test project with pyproject.toml."""
-    project_root = tmp_path / "test_project"
-    project_root.mkdir()
-
-    # Create pyproject.toml
-    pyproject_content = """[project]
-name = "test-package"
-version = "0.1.0"
-dynamic = ["version"]
-
-[tool.hatch.version]
-source = "uv-dynamic-versioning"
-
-[tool.uv-dynamic-versioning]
-vcs = "git"
-style = "pep440"
-bump = true
-
-[tool.hatch.build.targets.wheel]
-packages = ["src/test_package"]
-
-[dependency-groups]
-dev = [
-    "pytest>=8.0.0",
-    "pytest-cov>=4.0.0",
-]
-test = [
-    "pytest>=8.0.0",
-    "mypy>=1.0.0",
-]
-"""
-    (project_root / "pyproject.toml").write_text(pyproject_content)
-
-    # Create subfolder
-    subfolder = project_root / "subfolder"
-    subfolder.mkdir(exist_ok=True)
-    (subfolder / "module.py").write_text("def func(): pass")
-
-    return project_root
-
-
 class TestSrcRootFileImports:
     """
     Tests for importing files from src/ root (like _globals.py) when building subfolders.
@@ -104,8 +59,8 @@ class TestSrcRootFileImports:
         src_dir.mkdir(exist_ok=True)
         
         # Create _globals.py at src/ root
-        (src_dir / "_globals.py").write_text(
-            """TEST_DATA_PATH = "/path/to/test/data"
+        (src_dir / "_globals.py").write_bytes(
+            b"""TEST_DATA_PATH = "/path/to/test/data"
 ROOT_SOURCE_CODE_PATH = "/path/to/source"
 """
         )
@@ -113,11 +68,11 @@ ROOT_SOURCE_CODE_PATH = "/path/to/source"
         # Create src/_shared subfolder
         shared_dir = src_dir / "_shared"
         shared_dir.mkdir()
-        (shared_dir / "__init__.py").write_text("# Shared utilities")
+        (shared_dir / "__init__.py").write_bytes(b"# Shared utilities")
         
         # Create testing_utils.py that imports _globals (matching user's scenario)
-        (shared_dir / "testing_utils.py").write_text(
-            """if True:
+        (shared_dir / "testing_utils.py").write_bytes(
+            b"""if True:
     import sysappend; sysappend.all()
     
 import inspect
@@ -187,16 +142,16 @@ def get_test_data_path():
         src_dir.mkdir(exist_ok=True)
         
         # Create multiple files at src/ root
-        (src_dir / "_globals.py").write_text("GLOBAL_VAR = 42")
-        (src_dir / "_config.py").write_text("CONFIG_VALUE = 'test'")
-        (src_dir / "_constants.py").write_text("PI = 3.14159")
+        (src_dir / "_globals.py").write_bytes(b"GLOBAL_VAR = 42")
+        (src_dir / "_config.py").write_bytes(b"CONFIG_VALUE = 'test'")
+        (src_dir / "_constants.py").write_bytes(b"PI = 3.14159")
         
         # Create subfolder that imports all of them
         subfolder = project_root / "subfolder"
         subfolder.mkdir(exist_ok=True)
-        (subfolder / "__init__.py").write_text("# Package init")
-        (subfolder / "module.py").write_text(
-            """from _globals import GLOBAL_VAR
+        (subfolder / "__init__.py").write_bytes(b"# Package init")
+        (subfolder / "module.py").write_bytes(
+            b"""from _globals import GLOBAL_VAR
 from _config import CONFIG_VALUE
 from _constants import PI
 
@@ -244,14 +199,14 @@ def get_all_values():
         src_dir.mkdir(exist_ok=True)
         
         # Create _globals.py at src/ root
-        (src_dir / "_globals.py").write_text("TEST_VALUE = 123")
+        (src_dir / "_globals.py").write_bytes(b"TEST_VALUE = 123")
         
         # Create src/_shared subfolder
         shared_dir = src_dir / "_shared"
         shared_dir.mkdir()
-        (shared_dir / "__init__.py").write_text("# Shared")
-        (shared_dir / "utils.py").write_text(
-            "from _globals import TEST_VALUE\ndef get_value(): return TEST_VALUE"
+        (shared_dir / "__init__.py").write_bytes(b"# Shared")
+        (shared_dir / "utils.py").write_bytes(
+            b"from _globals import TEST_VALUE\ndef get_value(): return TEST_VALUE"
         )
         
         import zipfile
@@ -313,11 +268,11 @@ def get_all_values():
         src_dir.mkdir(exist_ok=True)
         
         # Create _config.py that _globals.py imports
-        (src_dir / "_config.py").write_text("CONFIG_SETTING = 'production'")
+        (src_dir / "_config.py").write_bytes(b"CONFIG_SETTING = 'production'")
         
         # Create _globals.py that imports _config
-        (src_dir / "_globals.py").write_text(
-            """from _config import CONFIG_SETTING
+        (src_dir / "_globals.py").write_bytes(
+            b"""from _config import CONFIG_SETTING
 
 TEST_DATA_PATH = "/path/to/data"
 """
@@ -327,9 +282,9 @@ TEST_DATA_PATH = "/path/to/data"
         # (to ensure both are found, since we don't recursively analyze copied deps)
         subfolder = project_root / "subfolder"
         subfolder.mkdir(exist_ok=True)
-        (subfolder / "__init__.py").write_text("# Package init")
-        (subfolder / "module.py").write_text(
-            """from _globals import TEST_DATA_PATH, CONFIG_SETTING
+        (subfolder / "__init__.py").write_bytes(b"# Package init")
+        (subfolder / "module.py").write_bytes(
+            b"""from _globals import TEST_DATA_PATH, CONFIG_SETTING
 from _config import CONFIG_SETTING as CONFIG
 """
         )
@@ -378,9 +333,9 @@ from _config import CONFIG_SETTING as CONFIG
         # Create subfolder that tries to import _globals (but it doesn't exist)
         subfolder = project_root / "subfolder"
         subfolder.mkdir(exist_ok=True)
-        (subfolder / "__init__.py").write_text("# Package init")
-        (subfolder / "module.py").write_text(
-            "from _globals import MISSING_VAR  # This file doesn't exist"
+        (subfolder / "__init__.py").write_bytes(b"# Package init")
+        (subfolder / "module.py").write_bytes(
+            b"from _globals import MISSING_VAR  # This file doesn't exist"
         )
         
         # Build the subfolder - should not crash
@@ -410,9 +365,9 @@ from _config import CONFIG_SETTING as CONFIG
         subfolder = project_root / "subfolder"
 
         # Create a module that imports third-party submodules
-        (subfolder / "__init__.py").write_text("# Package init")
-        (subfolder / "module.py").write_text(
-            """import torch
+        (subfolder / "__init__.py").write_bytes(b"# Package init")
+        (subfolder / "module.py").write_bytes(
+            b"""import torch
 import torch.utils
 import torch.utils.data
 from torchvision import datasets
@@ -474,23 +429,23 @@ from torchvision import datasets
         # Create nested directory structure
         nested_dir = subfolder / "PytorchCoco"
         nested_dir.mkdir(parents=True)
-        (nested_dir / "__init__.py").write_text("# Nested package")
+        (nested_dir / "__init__.py").write_bytes(b"# Nested package")
 
         # Create external dependency at root level
         external_dir = project_root / "src" / "_shared"
         external_dir.mkdir(parents=True)
-        (external_dir / "__init__.py").write_text("# External shared module")
-        (external_dir / "image_utils.py").write_text("def save_cropped_image(): pass")
+        (external_dir / "__init__.py").write_bytes(b"# External shared module")
+        (external_dir / "image_utils.py").write_bytes(b"def save_cropped_image(): pass")
 
         # Create a module in nested directory that imports from root level
-        (nested_dir / "dataset_dataclasses.py").write_text(
-            "from _shared.image_utils import save_cropped_image"
+        (nested_dir / "dataset_dataclasses.py").write_bytes(
+            b"from _shared.image_utils import save_cropped_image"
         )
 
         # Also create a file at root level for comparison
-        (subfolder / "__init__.py").write_text("# Package init")
-        (subfolder / "root_module.py").write_text(
-            "from _shared.image_utils import save_cropped_image"
+        (subfolder / "__init__.py").write_bytes(b"# Package init")
+        (subfolder / "root_module.py").write_bytes(
+            b"from _shared.image_utils import save_cropped_image"
         )
 
         # Build the subfolder
@@ -557,9 +512,9 @@ class TestImportConversion:
         subfolder = project_root / "subfolder"
 
         # Create a module that imports third-party packages
-        (subfolder / "__init__.py").write_text("# Package init")
-        (subfolder / "module.py").write_text(
-            """import torch
+        (subfolder / "__init__.py").write_bytes(b"# Package init")
+        (subfolder / "module.py").write_bytes(
+            b"""import torch
 import torch.utils.data
 from torchvision import datasets
 import numpy as np
@@ -20,59 +20,84 @@ File: tests/test_subfolder_pyproject_toml.py
 
 from __future__ import annotations
 
+import functools
+import os
+import re
 import subprocess
 import sys
 import tempfile
+import tomllib
 import venv
 import zipfile
+from collections.abc import Callable
 from pathlib import Path
 
 import pytest
 
 from python_package_folder import BuildManager, SubfolderBuildConfig
 
+# Smallest subfolder pyproject.toml, for tests that only need one to exist
+_MINIMAL_SUBFOLDER_PYPROJECT = b"""[project]
+name = "subfolder-package"
+version = "3.0.0"
+"""
 
-@pytest.fixture
-def test_project_with_pyproject(tmp_path: Path) -> Path:
-    """Create a test project with pyproject.toml."""
-    project_root = tmp_path / "test_project"
-    project_root.mkdir()
-
-    # Create pyproject.toml
-    pyproject_content = """[project]
-name = "test-package"
-version = "0.1.0"
-dynamic = ["version"]
+# Snippets expected in, and not expected in, the temporary pyproject.toml of
+# test_e2e_version_mismatch_scenario, built with derived version 1.3.0
+_E2E_VERSION_MISMATCH_PRESENT = (
+    # Version was updated to derived version
+    'version = "1.3.0"',
+    # Other fields are preserved
+    'name = "test-project-shared"',
+    'description = "Shared utilities"',
+    'requires-python = ">=3.12"',
+    "loguru>=0.7.3",
+    "pydantic>=2.11.5",
+    # URLs are preserved
+    'Homepage = "https://example.com"',
+    'Repository = "https://github.com/example/test-project"',
+)
+_E2E_VERSION_MISMATCH_ABSENT = ('version = "1.2.0"',)
 
-[tool.hatch.version]
-source = "uv-dynamic-versioning"
 
-[tool.uv-dynamic-versioning]
-vcs = "git"
-style = "pep440"
-bump = true
+def _dir_entries(directory: Path) -> set[str]:
+    """Return the names in directory, listed once instead of checking each path exists."""
+    with os.scandir(directory) as entries:
+        return {entry.name for entry in entries}
 
-[tool.hatch.build.targets.wheel]
-packages = ["src/test_package"]
 
-[dependency-groups]
-dev = [
-    "pytest>=8.0.0",
-    "pytest-cov>=4.0.0",
-]
-test = [
-    "pytest>=8.0.0",
-    "mypy>=1.0.0",
-]
-"""
-    (project_root / "pyproject.toml").write_text(pyproject_content)
-
-    # Create subfolder
-    subfolder = project_root / "subfolder"
-    subfolder.mkdir(exist_ok=True)
-    (subfolder / "module.py").write_text("def func(): pass")
+@functools.cache
+def _needle_scanner(needles: tuple[str, ...]) -> tuple[re.Pattern[str], frozenset[str]]:
+    """
+    Compile a pattern that finds all of needles in one scan of a string.
 
-    return project_root
+    Returns:
+        Tuple of (pattern, shadowable) where pattern matches at every position where a
+        needle starts (longest needle first), and shadowable holds the needles that are a
+        prefix of a longer needle, so can be hidden by it at the same position
+    """
+    ordered = sorted(set(needles), key=len, reverse=True)
+    # A zero-width lookahead matches at every position, so overlapping needles are all found
+    pattern = re.compile("(?=(" + "|".join(map(re.escape, ordered)) + "))")
+    shadowable = frozenset(
+        needle
+        for needle in ordered
+        if any(other != needle and other.startswith(needle) for other in ordered)
+    )
+    return pattern, shadowable
+
+
+def _assert_needles(
+    content: str, present: tuple[str, ...] = (), absent: tuple[str, ...] = ()
+) -> None:
+    """Assert that each of present occurs in content and none of absent does."""
+    pattern, shadowable = _needle_scanner((*present, *absent))
+    found = set(pattern.findall(content))
+    found.update(needle for needle in shadowable - found if needle in content)
+    missing = [needle for needle in present if needle not in found]
+    unexpected = [needle for needle in absent if needle in found]
+    assert not missing, f"Missing from content: {missing}"
+    assert not unexpected, f"Unexpected in content: {unexpected}"
 
 
 class TestSubfolderBuildWithPyprojectToml:
@@ -90,13 +115,17 @@ class TestSubfolderBuildWithPyprojectToml:
     in the subfolder directory should go in this class.
     """
 
-    def test_uses_subfolder_pyproject_toml(self, test_project_with_pyproject: Path) -> None:
+    def test_uses_subfolder_pyproject_toml(
+        self,
+        test_project_with_pyproject: Path,
+        config_factory: Callable[..., SubfolderBuildConfig],
+    ) -> None:
         """Test that subfolder's pyproject.toml is used when it exists."""
         project_root = test_project_with_pyproject
         subfolder = project_root / "subfolder"
 
         # Create pyproject.toml in subfolder
-        subfolder_pyproject_content = """[project]
+        subfolder_pyproject_content = b"""[project]
 name = "subfolder-package"
 version = "3.0.0"
 description = "Subfolder package"
@@ -104,9 +133,9 @@ description = "Subfolder package"
 [dependencies]
 requests = ">=2.0.0"
 """
-        (subfolder / "pyproject.toml").write_text(subfolder_pyproject_content)
+        (subfolder / "pyproject.toml").write_bytes(subfolder_pyproject_content)
 
-        config = SubfolderBuildConfig(
+        config = config_factory(
             project_root=project_root,
             src_dir=subfolder,
             version="1.0.0",  # This should be ignored since subfolder has its own pyproject.toml
@@ -119,18 +148,16 @@ requests = ">=2.0.0"
         assert pyproject_path.exists()
         assert pyproject_path == project_root / "pyproject.toml"
         content = pyproject_path.read_text()
+        # Other tests read the content config kept in memory instead of the file
+        assert config._temp_pyproject_content == content
+        data = tomllib.loads(content)
 
         # Should use subfolder's pyproject.toml content, not create from parent
-        assert 'name = "subfolder-package"' in content
+        assert data["project"]["name"] == "subfolder-package"
         # Version should be updated to match the derived version (1.0.0), not the original (3.0.0)
-        assert 'version = "1.0.0"' in content
-        assert 'version = "3.0.0"' not in content  # Original version should be replaced
-        assert 'description = "Subfolder package"' in content
-        assert 'requests = ">=2.0.0"' in content
-
-        # Should not have parent's package name
-        assert 'name = "test-package"' not in content
-        assert 'name = "subfolder"' not in content
+        assert data["project"]["version"] == "1.0.0"
+        assert data["project"]["description"] == "Subfolder package"
+        assert data["dependencies"]["requests"] == ">=2.0.0"
 
         # Verify original was moved to backup location
         assert (project_root / "pyproject.toml.original").exists()
@@ -140,21 +167,21 @@ requests = ">=2.0.0"
         # Verify flag is set
         assert config._used_subfolder_pyproject is True
 
-        # Cleanup
-        config.restore()
-
-    def test_restore_subfolder_pyproject_toml(self, test_project_with_pyproject: Path) -> None:
+    def test_restore_subfolder_pyproject_toml(
+        self,
+        test_project_with_pyproject: Path,
+        config_factory: Callable[..., SubfolderBuildConfig],
+        subfolder_project_pyproject_text: str,
+    ) -> None:
         """Test that original pyproject.toml is restored after using subfolder's."""
         project_root = test_project_with_pyproject
         subfolder = project_root / "subfolder"
-        original_content = (project_root / "pyproject.toml").read_text()
+        original_content = subfolder_project_pyproject_text
 
         # Create pyproject.toml in subfolder
-        (subfolder / "pyproject.toml").write_text(
-            '[project]\nname = "subfolder-package"\nversion = "3.0.0"\n'
-        )
+        (subfolder / "pyproject.toml").write_bytes(_MINIMAL_SUBFOLDER_PYPROJECT)
 
-        config = SubfolderBuildConfig(
+        config = config_factory(
             project_root=project_root,
             src_dir=subfolder,
             version="1.0.0",
@@ -175,19 +202,22 @@ requests = ">=2.0.0"
         # Verify backup is removed
         assert not (project_root / "pyproject.toml.original").exists()
 
-    def test_root_pyproject_toml_never_modified(self, test_project_with_pyproject: Path) -> None:
+    def test_root_pyproject_toml_never_modified(
+        self,
+        test_project_with_pyproject: Path,
+        config_factory: Callable[..., SubfolderBuildConfig],
+        subfolder_project_pyproject_text: str,
+    ) -> None:
         """Test that root pyproject.toml is never modified, only moved and restored."""
         project_root = test_project_with_pyproject
         subfolder = project_root / "subfolder"
         original_pyproject = project_root / "pyproject.toml"
-        original_content = original_pyproject.read_text()
+        original_content = subfolder_project_pyproject_text
 
         # Create pyproject.toml in subfolder
-        (subfolder / "pyproject.toml").write_text(
-            '[project]\nname = "subfolder-package"\nversion = "3.0.0"\n'
-        )
+        (subfolder / "pyproject.toml").write_bytes(_MINIMAL_SUBFOLDER_PYPROJECT)
 
-        config = SubfolderBuildConfig(
+        config = config_factory(
             project_root=project_root,
             src_dir=subfolder,
             version="1.0.0",
@@ -211,79 +241,6 @@ requests = ">=2.0.0"
         # Verify backup is removed
         assert not (project_root / "pyproject.toml.original").exists()
 
-    def test_subfolder_pyproject_toml_without_parent_backup(
-        self, test_project_with_pyproject: Path
-    ) -> None:
-        """Test using subfolder pyproject.toml when parent doesn't exist initially."""
-        project_root = test_project_with_pyproject
-        subfolder = project_root / "subfolder"
-
-        # Remove parent pyproject.toml temporarily
-        parent_pyproject = project_root / "pyproject.toml"
-        original_content = parent_pyproject.read_text()
-        parent_pyproject.unlink()
-
-        # Create pyproject.toml in subfolder
-        subfolder_pyproject_content = """[project]
-name = "subfolder-package"
-version = "3.0.0"
-"""
-        (subfolder / "pyproject.toml").write_text(subfolder_pyproject_content)
-
-        config = SubfolderBuildConfig(
-            project_root=project_root,
-            src_dir=subfolder,
-            version="1.0.0",
-        )
-
-        pyproject_path = config.create_temp_pyproject()
-
-        # Should still work - copy subfolder pyproject.toml to project root
-        assert pyproject_path is not None
-        assert pyproject_path.exists()
-        content = pyproject_path.read_text()
-        assert 'name = "subfolder-package"' in content
-
-        # No backup should be created since parent didn't exist
-        assert not (project_root / "pyproject.toml.original").exists()
-
-        # Restore original for cleanup
-        parent_pyproject.write_text(original_content)
-        config.restore()
-
-    def test_third_party_dependencies_added(self, test_project_with_pyproject: Path) -> None:
-        """Test that third-party dependencies are added to temporary pyproject.toml."""
-        project_root = test_project_with_pyproject
-        subfolder = project_root / "subfolder"
-
-        # Create a Python file that imports a third-party package
-        (subfolder / "module.py").write_text("import pypdf\nimport requests\n")
-
-        config = SubfolderBuildConfig(
-            project_root=project_root,
-            src_dir=subfolder,
-            version="1.0.0",
-            package_name="test-package",
-        )
-
-        config.create_temp_pyproject()
-
-        # Add third-party dependencies
-        config.add_third_party_dependencies(["pypdf", "requests"])
-
-        # Verify dependencies were added
-        pyproject_path = project_root / "pyproject.toml"
-        assert pyproject_path.exists()
-        content = pyproject_path.read_text()
-
-        # Check that dependencies section exists and contains the packages
-        assert "dependencies = [" in content
-        assert '"pypdf"' in content or "'pypdf'" in content
-        assert '"requests"' in content or "'requests'" in content
-
-        # Cleanup
-        config.restore()
-
 
 
 class TestSubfolderBuildWithoutParentPyproject:
@@ -302,67 +259,60 @@ class TestSubfolderBuildWithoutParentPyproject:
     """
     """Tests for subfolder builds when parent pyproject.toml doesn't exist."""
 
-    def test_no_parent_pyproject_returns_none(self, tmp_path: Path) -> None:
-        """Test that create_temp_pyproject returns None when no parent pyproject.toml exists."""
+    @pytest.mark.parametrize(
+        "has_subfolder_pyproject",
+        [
+            pytest.param(False, id="no_parent_no_sub"),
+            pytest.param(True, id="no_parent_with_sub"),
+        ],
+    )
+    def test_no_parent_pyproject(
+        self,
+        tmp_path: Path,
+        config_factory: Callable[..., SubfolderBuildConfig],
+        has_subfolder_pyproject: bool,
+    ) -> None:
+        """
+        Test create_temp_pyproject when the project root has no pyproject.toml.
+
+        The subfolder's pyproject.toml is used if it has one; otherwise None is returned.
+        """
         project_root = tmp_path / "test_project"
-        project_root.mkdir()
 
         # Don't create pyproject.toml in project root
         subfolder = project_root / "subfolder"
-        subfolder.mkdir(exist_ok=True)
-        (subfolder / "module.py").write_text("def func(): pass")
+        # Creates project_root along with the subfolder
+        subfolder.mkdir(parents=True)
+        (subfolder / "module.py").write_bytes(b"def func(): pass")
+        if has_subfolder_pyproject:
+            (subfolder / "pyproject.toml").write_bytes(_MINIMAL_SUBFOLDER_PYPROJECT)
 
-        config = SubfolderBuildConfig(
+        config = config_factory(
             project_root=project_root,
             src_dir=subfolder,
             version="1.0.0",
         )
 
-        # Should return None and not raise
+        # Should not raise
         result = config.create_temp_pyproject()
-        assert result is None
-
-        # No pyproject.toml should be created in project root
-        assert not (project_root / "pyproject.toml").exists()
-
-        # No backup should exist
-        assert not (project_root / "pyproject.toml.backup").exists()
 
-        # But README handling should still work
-        assert (project_root / "README.md").exists()
-
-    def test_no_parent_pyproject_with_subfolder_pyproject(self, tmp_path: Path) -> None:
-        """Test that subfolder pyproject.toml is still used even without parent."""
-        project_root = tmp_path / "test_project"
-        project_root.mkdir()
+        entries = _dir_entries(project_root)
 
-        subfolder = project_root / "subfolder"
-        subfolder.mkdir(exist_ok=True)
-
-        # Create pyproject.toml in subfolder
-        subfolder_pyproject_content = """[project]
-name = "subfolder-package"
-version = "3.0.0"
-"""
-        (subfolder / "pyproject.toml").write_text(subfolder_pyproject_content)
-
-        config = SubfolderBuildConfig(
-            project_root=project_root,
-            src_dir=subfolder,
-            version="1.0.0",
-        )
-
-        # Should work - use subfolder's pyproject.toml
-        result = config.create_temp_pyproject()
-        assert result is not None
-        assert result == project_root / "pyproject.toml"
-        assert result.exists()
-
-        content = result.read_text()
-        assert 'name = "subfolder-package"' in content
+        if has_subfolder_pyproject:
+            # Should use subfolder's pyproject.toml
+            assert result == project_root / "pyproject.toml"
+            assert 'name = "subfolder-package"' in result.read_text()
+        else:
+            # Should return None, and no pyproject.toml should be created in project root
+            assert result is None
+            assert "pyproject.toml" not in entries
 
         # No backup since parent didn't exist
-        assert not (project_root / "pyproject.toml.backup").exists()
+        assert "pyproject.toml.original" not in entries
+        assert "pyproject.toml.backup" not in entries
+
+        # README handling should still work
+        assert "README.md" in entries
 
 
 
@@ -384,7 +334,7 @@ class TestSubfolderBuildTemporaryPyprojectCreation:
     """Tests verifying temporary pyproject.toml creation from parent."""
 
     def test_temporary_pyproject_has_correct_structure(
-        self, test_project_with_pyproject: Path
+        self, test_project_with_pyproject: Path, config_factory: Callable[..., SubfolderBuildConfig]
     ) -> None:
         """Test that temporary pyproject.toml has correct package structure."""
         project_root = test_project_with_pyproject
@@ -395,7 +345,7 @@ class TestSubfolderBuildTemporaryPyprojectCreation:
         if subfolder_pyproject.exists():
             subfolder_pyproject.unlink()
 
-        config = SubfolderBuildConfig(
+        config = config_factory(
             project_root=project_root,
             src_dir=subfolder,
             version="2.5.0",
@@ -406,32 +356,34 @@ class TestSubfolderBuildTemporaryPyprojectCreation:
 
         assert pyproject_path is not None
         assert pyproject_path.exists()
-        content = pyproject_path.read_text()
+        data = tomllib.loads(pyproject_path.read_text())
 
         # Verify package name and version
-        assert 'name = "my-custom-package"' in content
-        assert 'version = "2.5.0"' in content
+        assert data["project"]["name"] == "my-custom-package"
+        assert data["project"]["version"] == "2.5.0"
 
         # Verify dynamic versioning is removed
-        assert 'dynamic = ["version"]' not in content
+        assert "version" not in data["project"].get("dynamic", [])
+        assert "version" not in data["tool"]["hatch"]
+        assert "uv-dynamic-versioning" not in data["tool"]
 
         # Verify build-system section is added (required for hatchling)
-        assert "[build-system]" in content
-        assert 'requires = ["hatchling"]' in content
-        assert 'build-backend = "hatchling.build"' in content
-        assert "[tool.hatch.version]" not in content
-        assert "[tool.uv-dynamic-versioning]" not in content
+        assert data["build-system"] == {
+            "requires": ["hatchling"],
+            "build-backend": "hatchling.build",
+        }
 
         # Verify packages path is set correctly (should use import name, not temp directory name)
-        assert '"my_custom_package"' in content or "'my_custom_package'" in content
+        assert data["tool"]["hatch"]["build"]["targets"]["wheel"]["packages"] == [
+            "my_custom_package"
+        ]
 
         # Verify backup was created
         assert (project_root / "pyproject.toml.original").exists()
 
-        # Cleanup
-        config.restore()
-
-    def test_file_exclusion_patterns_added(self, test_project_with_pyproject: Path) -> None:
+    def test_file_exclusion_patterns_added(
+        self, test_project_with_pyproject: Path, config_factory: Callable[..., SubfolderBuildConfig]
+    ) -> None:
         """Test that file exclusion patterns are added to temporary pyproject.toml."""
         project_root = test_project_with_pyproject
         subfolder = project_root / "subfolder"
@@ -446,15 +398,15 @@ class TestSubfolderBuildTemporaryPyprojectCreation:
         (project_root / "reports").mkdir()
         (project_root / "scripts").mkdir()
         (project_root / "tests").mkdir()
-        (project_root / "Dockerfile").write_text("# Dockerfile")
-        (project_root / ".gitignore").write_text("*.pyc")
+        (project_root / "Dockerfile").write_bytes(b"# Dockerfile")
+        (project_root / ".gitignore").write_bytes(b"*.pyc")
 
         # Ensure no pyproject.toml in subfolder
         subfolder_pyproject = subfolder / "pyproject.toml"
         if subfolder_pyproject.exists():
             subfolder_pyproject.unlink()
 
-        config = SubfolderBuildConfig(
+        config = config_factory(
             project_root=project_root,
             src_dir=subfolder,
             version="1.0.0",
@@ -465,7 +417,7 @@ class TestSubfolderBuildTemporaryPyprojectCreation:
 
         assert pyproject_path is not None
         assert pyproject_path.exists()
-        content = pyproject_path.read_text()
+        content = config._temp_pyproject_content
 
         # Verify [tool.hatch.build.targets.sdist] section exists
         assert "[tool.hatch.build.targets.sdist]" in content
@@ -487,11 +439,8 @@ class TestSubfolderBuildTemporaryPyprojectCreation:
         assert '"data"' not in content or '"data"' not in content.split("only-include")[1]
         assert '"docs"' not in content or '"docs"' not in content.split("only-include")[1]
 
-        # Cleanup
-        config.restore()
-
     def test_file_exclusion_patterns_with_subfolder_pyproject(
-        self, test_project_with_pyproject: Path
+        self, test_project_with_pyproject: Path, config_factory: Callable[..., SubfolderBuildConfig]
     ) -> None:
         """Test that file exclusion patterns are added when subfolder has its own pyproject.toml."""
         project_root = test_project_with_pyproject
@@ -503,14 +452,14 @@ class TestSubfolderBuildTemporaryPyprojectCreation:
         (project_root / "docs").mkdir()
 
         # Create pyproject.toml in subfolder
-        subfolder_pyproject_content = """[project]
+        subfolder_pyproject_content = b"""[project]
 name = "subfolder-package"
 version = "1.0.0"
 description = "Subfolder package"
 """
-        (subfolder / "pyproject.toml").write_text(subfolder_pyproject_content)
+        (subfolder / "pyproject.toml").write_bytes(subfolder_pyproject_content)
 
-        config = SubfolderBuildConfig(
+        config = config_factory(
             project_root=project_root,
             src_dir=subfolder,
             version="2.0.0",  # Should be ignored since subfolder has its own
@@ -520,7 +469,7 @@ description = "Subfolder package"
 
         assert pyproject_path is not None
         assert pyproject_path.exists()
-        content = pyproject_path.read_text()
+        content = config._temp_pyproject_content
 
         # Verify [tool.hatch.build.targets.sdist] section exists
         assert "[tool.hatch.build.targets.sdist]" in content
@@ -534,18 +483,17 @@ description = "Subfolder package"
         # Verify necessary files are included
         assert '"pyproject.toml"' in content
 
-        # Cleanup
-        config.restore()
-
-    def test_third_party_dependencies_added(self, test_project_with_pyproject: Path) -> None:
+    def test_third_party_dependencies_added(
+        self, test_project_with_pyproject: Path, config_factory: Callable[..., SubfolderBuildConfig]
+    ) -> None:
         """Test that third-party dependencies are added to temporary pyproject.toml."""
         project_root = test_project_with_pyproject
         subfolder = project_root / "subfolder"
 
         # Create a Python file that imports a third-party package
-        (subfolder / "module.py").write_text("import pypdf\nimport requests\n")
+        (subfolder / "module.py").write_bytes(b"import pypdf\nimport requests\n")
 
-        config = SubfolderBuildConfig(
+        config = config_factory(
             project_root=project_root,
             src_dir=subfolder,
             version="1.0.0",
@@ -567,17 +515,14 @@ description = "Subfolder package"
         assert '"pypdf"' in content or "'pypdf'" in content
         assert '"requests"' in content or "'requests'" in content
 
-        # Cleanup
-        config.restore()
-
     def test_temporary_pyproject_preserves_other_sections(
-        self, test_project_with_pyproject: Path
+        self, test_project_with_pyproject: Path, config_factory: Callable[..., SubfolderBuildConfig]
     ) -> None:
         """Test that temporary pyproject.toml preserves other sections from parent."""
         project_root = test_project_with_pyproject
         subfolder = project_root / "subfolder"
 
-        config = SubfolderBuildConfig(
+        config = config_factory(
             project_root=project_root,
             src_dir=subfolder,
             version="1.0.0",
@@ -585,23 +530,25 @@ description = "Subfolder package"
 
         pyproject_path = config.create_temp_pyproject()
         assert pyproject_path is not None
-        content = pyproject_path.read_text()
+        content = config._temp_pyproject_content
 
         # Should preserve dependency-groups section (if not filtered)
         # Note: dependency-groups are only added if dependency_group parameter is provided
         # But other tool sections should be preserved
         assert "[tool.hatch.build.targets.wheel]" in content or "packages" in content
 
-        # Cleanup
-        config.restore()
-
-    def test_temporary_pyproject_restoration(self, test_project_with_pyproject: Path) -> None:
+    def test_temporary_pyproject_restoration(
+        self,
+        test_project_with_pyproject: Path,
+        subfolder_project_pyproject_text: str,
+        config_factory: Callable[..., SubfolderBuildConfig],
+    ) -> None:
         """Test that temporary pyproject.toml is properly restored."""
         project_root = test_project_with_pyproject
         subfolder = project_root / "subfolder"
-        original_content = (project_root / "pyproject.toml").read_text()
+        original_content = subfolder_project_pyproject_text
 
-        config = SubfolderBuildConfig(
+        config = config_factory(
             project_root=project_root,
             src_dir=subfolder,
             version="1.0.0",
@@ -624,7 +571,10 @@ description = "Subfolder package"
         assert 'name = "test-package"' in restored_content
 
     def test_build_system_section_replaces_setuptools(
-        self, test_project_with_pyproject: Path
+        self,
+        test_project_with_pyproject: Path,
+        subfolder_project_pyproject_text: str,
+        config_factory: Callable[..., SubfolderBuildConfig],
     ) -> None:
         """Test that build-system section replaces existing setuptools configuration."""
         project_root = test_project_with_pyproject
@@ -632,65 +582,57 @@ description = "Subfolder package"
 
         # Modify parent pyproject.toml to have setuptools build-system
         pyproject_path = project_root / "pyproject.toml"
-        original_content = pyproject_path.read_text()
+        original_content = subfolder_project_pyproject_text
         modified_content = (
             original_content
             + '\n[build-system]\nrequires = ["setuptools"]\nbuild-backend = "setuptools.build_meta"\n'
         )
         pyproject_path.write_text(modified_content)
 
-        try:
-            config = SubfolderBuildConfig(
-                project_root=project_root,
-                src_dir=subfolder,
-                version="1.0.0",
-            )
-
-            pyproject_path = config.create_temp_pyproject()
-            content = pyproject_path.read_text()
+        config = config_factory(
+            project_root=project_root,
+            src_dir=subfolder,
+            version="1.0.0",
+        )
 
-            # Verify build-system section uses hatchling, not setuptools
-            assert "[build-system]" in content
-            assert 'requires = ["hatchling"]' in content
-            assert 'build-backend = "hatchling.build"' in content
-            assert "setuptools" not in content or 'build-backend = "setuptools' not in content
+        config.create_temp_pyproject()
+        content = config._temp_pyproject_content
 
-            config.restore()
-        finally:
-            # Restore original content
-            pyproject_path.write_text(original_content)
+        # Verify build-system section uses hatchling, not setuptools
+        assert "[build-system]" in content
+        assert 'requires = ["hatchling"]' in content
+        assert 'build-backend = "hatchling.build"' in content
+        assert "setuptools" not in content or 'build-backend = "setuptools' not in content
 
     def test_build_system_section_with_subfolder_pyproject(
-        self, test_project_with_pyproject: Path
+        self, test_project_with_pyproject: Path, config_factory: Callable[..., SubfolderBuildConfig]
     ) -> None:
         """Test that build-system section is added when using subfolder's pyproject.toml."""
         project_root = test_project_with_pyproject
         subfolder = project_root / "subfolder"
 
         # Create pyproject.toml in subfolder without build-system
-        subfolder_pyproject_content = """[project]
+        subfolder_pyproject_content = b"""[project]
 name = "subfolder-package"
 version = "3.0.0"
 description = "Subfolder package"
 """
-        (subfolder / "pyproject.toml").write_text(subfolder_pyproject_content)
+        (subfolder / "pyproject.toml").write_bytes(subfolder_pyproject_content)
 
-        config = SubfolderBuildConfig(
+        config = config_factory(
             project_root=project_root,
             src_dir=subfolder,
             version="1.0.0",
         )
 
-        pyproject_path = config.create_temp_pyproject()
-        content = pyproject_path.read_text()
+        config.create_temp_pyproject()
+        content = config._temp_pyproject_content
 
         # Verify build-system section is added
         assert "[build-system]" in content
         assert 'requires = ["hatchling"]' in content
         assert 'build-backend = "hatchling.build"' in content
 
-        config.restore()
-
 
 
 class TestSubfolderPyprojectTomlVersionHandling:
@@ -710,22 +652,22 @@ class TestSubfolderPyprojectTomlVersionHandling:
     """Tests for version handling when subfolder has its own pyproject.toml."""
 
     def test_version_updated_when_different_from_derived(
-        self, test_project_with_pyproject: Path
+        self, test_project_with_pyproject: Path, config_factory: Callable[..., SubfolderBuildConfig]
     ) -> None:
         """Test that version in subfolder toml is updated to match derived version."""
         project_root = test_project_with_pyproject
         subfolder = project_root / "subfolder"
 
         # Create subfolder pyproject.toml with different version
-        subfolder_pyproject = """[project]
+        subfolder_pyproject = b"""[project]
 name = "my-package"
 version = "2.0.0"
 description = "Test package"
 """
-        (subfolder / "pyproject.toml").write_text(subfolder_pyproject)
-        (subfolder / "__init__.py").write_text("# Package")
+        (subfolder / "pyproject.toml").write_bytes(subfolder_pyproject)
+        (subfolder / "__init__.py").write_bytes(b"# Package")
 
-        config = SubfolderBuildConfig(
+        config = config_factory(
             project_root=project_root,
             src_dir=subfolder,
             version="1.5.0",  # Derived version
@@ -734,28 +676,29 @@ description = "Test package"
         pyproject_path = config.create_temp_pyproject()
         assert pyproject_path is not None
 
-        content = pyproject_path.read_text()
+        content = config._temp_pyproject_content
         # Version should be updated to derived version
         assert 'version = "1.5.0"' in content
         assert 'version = "2.0.0"' not in content
 
-        config.restore()
-
     def test_version_warning_when_different(
-        self, test_project_with_pyproject: Path, capsys
+        self,
+        test_project_with_pyproject: Path,
+        capsys,
+        config_factory: Callable[..., SubfolderBuildConfig],
     ) -> None:
         """Test that warning is shown when version differs."""
         project_root = test_project_with_pyproject
         subfolder = project_root / "subfolder"
 
-        subfolder_pyproject = """[project]
+        subfolder_pyproject = b"""[project]
 name = "my-package"
 version = "2.0.0"
 """
-        (subfolder / "pyproject.toml").write_text(subfolder_pyproject)
-        (subfolder / "__init__.py").write_text("# Package")
+        (subfolder / "pyproject.toml").write_bytes(subfolder_pyproject)
+        (subfolder / "__init__.py").write_bytes(b"# Package")
 
-        config = SubfolderBuildConfig(
+        config = config_factory(
             project_root=project_root,
             src_dir=subfolder,
             version="1.5.0",
@@ -769,24 +712,22 @@ version = "2.0.0"
         assert "2.0.0" in captured.err
         assert "1.5.0" in captured.err
 
-        config.restore()
-
     def test_version_added_when_missing(
-        self, test_project_with_pyproject: Path
+        self, test_project_with_pyproject: Path, config_factory: Callable[..., SubfolderBuildConfig]
     ) -> None:
         """Test that version is added if missing from subfolder toml."""
         project_root = test_project_with_pyproject
         subfolder = project_root / "subfolder"
 
         # Subfolder toml without version
-        subfolder_pyproject = """[project]
+        subfolder_pyproject = b"""[project]
 name = "my-package"
 description = "Test package"
 """
-        (subfolder / "pyproject.toml").write_text(subfolder_pyproject)
-        (subfolder / "__init__.py").write_text("# Package")
+        (subfolder / "pyproject.toml").write_bytes(subfolder_pyproject)
+        (subfolder / "__init__.py").write_bytes(b"# Package")
 
-        config = SubfolderBuildConfig(
+        config = config_factory(
             project_root=project_root,
             src_dir=subfolder,
             version="1.0.0",
@@ -795,12 +736,10 @@ description = "Test package"
         pyproject_path = config.create_temp_pyproject()
         assert pyproject_path is not None
 
-        content = pyproject_path.read_text()
+        content = config._temp_pyproject_content
         # Version should be added
         assert 'version = "1.0.0"' in content
 
-        config.restore()
-
 
 
 class TestSubfolderPyprojectTomlNameHandling:
@@ -819,20 +758,23 @@ class TestSubfolderPyprojectTomlNameHandling:
     """Tests for name field handling when subfolder has its own pyproject.toml."""
 
     def test_name_warning_when_different_but_uses_subfolder_name(
-        self, test_project_with_pyproject: Path, capsys
+        self,
+        test_project_with_pyproject: Path,
+        capsys,
+        config_factory: Callable[..., SubfolderBuildConfig],
     ) -> None:
         """Test that warning is shown but subfolder name is used."""
         project_root = test_project_with_pyproject
         subfolder = project_root / "subfolder"
 
-        subfolder_pyproject = """[project]
+        subfolder_pyproject = b"""[project]
 name = "custom-package-name"
 version = "1.0.0"
 """
-        (subfolder / "pyproject.toml").write_text(subfolder_pyproject)
-        (subfolder / "__init__.py").write_text("# Package")
+        (subfolder / "pyproject.toml").write_bytes(subfolder_pyproject)
+        (subfolder / "__init__.py").write_bytes(b"# Package")
 
-        config = SubfolderBuildConfig(
+        config = config_factory(
             project_root=project_root,
             src_dir=subfolder,
             package_name="derived-package-name",  # Different from subfolder
@@ -842,7 +784,7 @@ version = "1.0.0"
         pyproject_path = config.create_temp_pyproject()
         assert pyproject_path is not None
 
-        content = pyproject_path.read_text()
+        content = config._temp_pyproject_content
         # Should use subfolder's name, not derived
         assert 'name = "custom-package-name"' in content
         assert 'name = "derived-package-name"' not in content
@@ -853,8 +795,6 @@ version = "1.0.0"
         assert "custom-package-name" in captured.err
         assert "derived-package-name" in captured.err
 
-        config.restore()
-
 
 
 class TestSubfolderPyprojectTomlDependenciesHandling:
@@ -874,13 +814,16 @@ class TestSubfolderPyprojectTomlDependenciesHandling:
     """Tests for dependencies handling when subfolder has its own pyproject.toml."""
 
     def test_automatic_dependency_detection_skipped_when_dependencies_exist(
-        self, test_project_with_pyproject: Path, capsys
+        self,
+        test_project_with_pyproject: Path,
+        capsys,
+        config_factory: Callable[..., SubfolderBuildConfig],
     ) -> None:
         """Test that automatic dependency detection is skipped when dependencies exist."""
         project_root = test_project_with_pyproject
         subfolder = project_root / "subfolder"
 
-        subfolder_pyproject = """[project]
+        subfolder_pyproject = b"""[project]
 name = "my-package"
 version = "1.0.0"
 dependencies = [
@@ -888,11 +831,11 @@ dependencies = [
     "pydantic>=2.0.0",
 ]
 """
-        (subfolder / "pyproject.toml").write_text(subfolder_pyproject)
-        (subfolder / "__init__.py").write_text("# Package")
-        (subfolder / "module.py").write_text("import numpy\nimport pandas")
+        (subfolder / "pyproject.toml").write_bytes(subfolder_pyproject)
+        (subfolder / "__init__.py").write_bytes(b"# Package")
+        (subfolder / "module.py").write_bytes(b"import numpy\nimport pandas")
 
-        config = SubfolderBuildConfig(
+        config = config_factory(
             project_root=project_root,
             src_dir=subfolder,
             version="1.0.0",
@@ -918,25 +861,23 @@ dependencies = [
         assert "Skipping automatic dependency detection" in captured2.err
         assert "already has dependencies defined" in captured2.err
 
-        config.restore()
-
     def test_automatic_dependency_detection_when_dependencies_empty(
-        self, test_project_with_pyproject: Path
+        self, test_project_with_pyproject: Path, config_factory: Callable[..., SubfolderBuildConfig]
     ) -> None:
         """Test that automatic dependency detection works when dependencies field is empty."""
         project_root = test_project_with_pyproject
         subfolder = project_root / "subfolder"
 
-        subfolder_pyproject = """[project]
+        subfolder_pyproject = b"""[project]
 name = "my-package"
 version = "1.0.0"
 dependencies = []
 """
-        (subfolder / "pyproject.toml").write_text(subfolder_pyproject)
-        (subfolder / "__init__.py").write_text("# Package")
-        (subfolder / "module.py").write_text("import numpy")
+        (subfolder / "pyproject.toml").write_bytes(subfolder_pyproject)
+        (subfolder / "__init__.py").write_bytes(b"# Package")
+        (subfolder / "module.py").write_bytes(b"import numpy")
 
-        config = SubfolderBuildConfig(
+        config = config_factory(
             project_root=project_root,
             src_dir=subfolder,
             version="1.0.0",
@@ -955,23 +896,21 @@ dependencies = []
             # but it verifies the logic doesn't skip when dependencies is empty
             assert "numpy" in content.lower() or "dependencies" in content.lower()
 
-        config.restore()
-
     def test_automatic_dependency_detection_when_dependencies_missing(
-        self, test_project_with_pyproject: Path
+        self, test_project_with_pyproject: Path, config_factory: Callable[..., SubfolderBuildConfig]
     ) -> None:
         """Test that automatic dependency detection works when dependencies field is missing."""
         project_root = test_project_with_pyproject
         subfolder = project_root / "subfolder"
 
-        subfolder_pyproject = """[project]
+        subfolder_pyproject = b"""[project]
 name = "my-package"
 version = "1.0.0"
 """
-        (subfolder / "pyproject.toml").write_text(subfolder_pyproject)
-        (subfolder / "__init__.py").write_text("# Package")
+        (subfolder / "pyproject.toml").write_bytes(subfolder_pyproject)
+        (subfolder / "__init__.py").write_bytes(b"# Package")
 
-        config = SubfolderBuildConfig(
+        config = config_factory(
             project_root=project_root,
             src_dir=subfolder,
             version="1.0.0",
@@ -988,8 +927,6 @@ version = "1.0.0"
             content = pyproject_path.read_text()
             assert "numpy" in content.lower() or "dependencies" in content.lower()
 
-        config.restore()
-
 
 
 class TestSubfolderPyprojectTomlParentMerging:
@@ -1009,13 +946,13 @@ class TestSubfolderPyprojectTomlParentMerging:
     """Tests for merging fields from parent pyproject.toml."""
 
     def test_missing_fields_filled_from_parent(
-        self, test_project_with_pyproject: Path
+        self, test_project_with_pyproject: Path, config_factory: Callable[..., SubfolderBuildConfig]
     ) -> None:
         """Test that missing fields are filled from parent pyproject.toml."""
         project_root = test_project_with_pyproject
         
         # Update parent pyproject.toml with more fields
-        parent_content = """[project]
+        parent_content = b"""[project]
 name = "test-package"
 version = "0.1.0"
 description = "Parent package description"
@@ -1025,19 +962,19 @@ authors = [
 keywords = ["test", "package"]
 requires-python = ">=3.11"
 """
-        (project_root / "pyproject.toml").write_text(parent_content)
+        (project_root / "pyproject.toml").write_bytes(parent_content)
 
         subfolder = project_root / "subfolder"
         
         # Subfolder toml with minimal fields
-        subfolder_pyproject = """[project]
+        subfolder_pyproject = b"""[project]
 name = "subfolder-package"
 version = "1.0.0"
 """
-        (subfolder / "pyproject.toml").write_text(subfolder_pyproject)
-        (subfolder / "__init__.py").write_text("# Package")
+        (subfolder / "pyproject.toml").write_bytes(subfolder_pyproject)
+        (subfolder / "__init__.py").write_bytes(b"# Package")
 
-        config = SubfolderBuildConfig(
+        config = config_factory(
             project_root=project_root,
             src_dir=subfolder,
             version="1.0.0",
@@ -1046,7 +983,7 @@ version = "1.0.0"
         pyproject_path = config.create_temp_pyproject()
         assert pyproject_path is not None
 
-        content = pyproject_path.read_text()
+        content = config._temp_pyproject_content
         # Should have subfolder's name and version (not merged)
         assert 'name = "subfolder-package"' in content
         assert 'version = "1.0.0"' in content
@@ -1054,8 +991,6 @@ version = "1.0.0"
         # Note: Full merging requires tomli-w, so we can't easily test all fields
         # But we verify the merge function is called and doesn't error
 
-        config.restore()
-
 
 
 class TestSubfolderPyprojectTomlE2E:
@@ -1088,7 +1023,7 @@ class TestSubfolderPyprojectTomlE2E:
         project_root.mkdir()
 
         # Create parent pyproject.toml
-        parent_pyproject = """[project]
+        parent_pyproject = b"""[project]
 name = "test-project"
 version = "0.1.0"
 description = "Test project"
@@ -1097,13 +1032,13 @@ description = "Test project"
 requires = ["hatchling"]
 build-backend = "hatchling.build"
 """
-        (project_root / "pyproject.toml").write_text(parent_pyproject)
+        (project_root / "pyproject.toml").write_bytes(parent_pyproject)
 
         # Create subfolder with its own pyproject.toml
         subfolder = project_root / "src" / "_shared"
         subfolder.mkdir(parents=True)
         
-        subfolder_pyproject = """[project]
+        subfolder_pyproject = b"""[project]
 name = "test-project-shared"
 version = "1.2.0"
 description = "Shared utilities"
@@ -1118,9 +1053,9 @@ dependencies = [
 Homepage = "https://example.com"
 Repository = "https://github.com/example/test-project"
 """
-        (subfolder / "pyproject.toml").write_text(subfolder_pyproject)
-        (subfolder / "__init__.py").write_text("# Shared utilities package")
-        (subfolder / "utils.py").write_text("def helper(): return 'help'")
+        (subfolder / "pyproject.toml").write_bytes(subfolder_pyproject)
+        (subfolder / "__init__.py").write_bytes(b"# Shared utilities package")
+        (subfolder / "utils.py").write_bytes(b"def helper(): return 'help'")
 
         # Build with derived version 1.3.0
         manager = BuildManager(project_root=project_root, src_dir=subfolder)
@@ -1138,20 +1073,9 @@ Repository = "https://github.com/example/test-project"
             assert temp_pyproject.exists()
             content = temp_pyproject.read_text()
 
-            # Verify version was updated to derived version
-            assert 'version = "1.3.0"' in content
-            assert 'version = "1.2.0"' not in content
-
-            # Verify other fields are preserved
-            assert 'name = "test-project-shared"' in content
-            assert 'description = "Shared utilities"' in content
-            assert 'requires-python = ">=3.12"' in content
-            assert 'loguru>=0.7.3' in content
-            assert 'pydantic>=2.11.5' in content
-
-            # Verify URLs are preserved
-            assert 'Homepage = "https://example.com"' in content
-            assert 'Repository = "https://github.com/example/test-project"' in content
+            _assert_needles(
+                content, present=_E2E_VERSION_MISMATCH_PRESENT, absent=_E2E_VERSION_MISMATCH_ABSENT
+            )
 
             # Verify dependencies detection was skipped (since dependencies exist)
             assert manager.subfolder_config._has_existing_dependencies is True
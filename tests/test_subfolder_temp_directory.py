@@ -24,54 +24,9 @@ import venv
 import zipfile
 from pathlib import Path
 
-import pytest
-
 from python_package_folder import BuildManager, SubfolderBuildConfig
 
 
-@pytest.fixture
-def test_project_with_pyproject(tmp_path: Path) -> Path:
-    """Create a test project with pyproject.toml."""
-    project_root = tmp_path / "test_project"
-    project_root.mkdir()
-
-    # Create pyproject.toml
-    pyproject_content = """[project]
-name = "test-package"
-version = "0.1.0"
-dynamic = ["version"]
-
-[tool.hatch.version]
-source = "uv-dynamic-versioning"
-
-[tool.uv-dynamic-versioning]
-vcs = "git"
-style = "pep440"
-bump = true
-
-[tool.hatch.build.targets.wheel]
-packages = ["src/test_package"]
-
-[dependency-groups]
-dev = [
-    "pytest>=8.0.0",
-    "pytest-cov>=4.0.0",
-]
-test = [
-    "pytest>=8.0.0",
-    "mypy>=1.0.0",
-]
-"""
-    (project_root / "pyproject.toml").write_text(pyproject_content)
-
-    # Create subfolder
-    subfolder = project_root / "subfolder"
-    subfolder.mkdir(exist_ok=True)
-    (subfolder / "module.py").write_text("def func(): pass")
-
-    return project_root
-
-
 class TestTemporaryPackageDirectory:
     """
     Tests for temporary package directory creation and cleanup.
@@ -94,7 +49,7 @@ class TestTemporaryPackageDirectory:
         """Test that temporary package directory is created with correct import name."""
         project_root = test_project_with_pyproject
         subfolder = project_root / "subfolder"
-        (subfolder / "module.py").write_text("def func(): pass")
+        (subfolder / "module.py").write_bytes(b"def func(): pass")
 
         config = SubfolderBuildConfig(
             project_root=project_root,
@@ -126,7 +81,7 @@ class TestTemporaryPackageDirectory:
         """Test that temp package directory name converts hyphens to underscores."""
         project_root = test_project_with_pyproject
         subfolder = project_root / "subfolder"
-        (subfolder / "module.py").write_text("def func(): pass")
+        (subfolder / "module.py").write_bytes(b"def func(): pass")
 
         config = SubfolderBuildConfig(
             project_root=project_root,
@@ -149,7 +104,7 @@ class TestTemporaryPackageDirectory:
         """Test that temporary package directory is cleaned up on restore."""
         project_root = test_project_with_pyproject
         subfolder = project_root / "subfolder"
-        (subfolder / "module.py").write_text("def func(): pass")
+        (subfolder / "module.py").write_bytes(b"def func(): pass")
 
         config = SubfolderBuildConfig(
             project_root=project_root,
@@ -177,7 +132,7 @@ class TestTemporaryPackageDirectory:
         """Test that packages configuration uses temp directory path."""
         project_root = test_project_with_pyproject
         subfolder = project_root / "subfolder"
-        (subfolder / "module.py").write_text("def func(): pass")
+        (subfolder / "module.py").write_bytes(b"def func(): pass")
 
         config = SubfolderBuildConfig(
             project_root=project_root,
@@ -202,10 +157,10 @@ class TestTemporaryPackageDirectory:
         """Test that temp package directory preserves the original directory structure."""
         project_root = test_project_with_pyproject
         subfolder = project_root / "subfolder"
-        (subfolder / "module.py").write_text("def func(): pass")
+        (subfolder / "module.py").write_bytes(b"def func(): pass")
         (subfolder / "submodule").mkdir()
-        (subfolder / "submodule" / "__init__.py").write_text("")
-        (subfolder / "submodule" / "helper.py").write_text("def helper(): pass")
+        (subfolder / "submodule" / "__init__.py").write_bytes(b"")
+        (subfolder / "submodule" / "helper.py").write_bytes(b"def helper(): pass")
 
         config = SubfolderBuildConfig(
             project_root=project_root,
@@ -231,13 +186,13 @@ class TestTemporaryPackageDirectory:
         """Test that temp package directory creation handles existing directory."""
         project_root = test_project_with_pyproject
         subfolder = project_root / "subfolder"
-        (subfolder / "module.py").write_text("def func(): pass")
+        (subfolder / "module.py").write_bytes(b"def func(): pass")
 
         # Create a directory that would conflict (using import name directly)
         import_name = "test_package_subfolder"  # Import name from "test-package-subfolder"
         existing_temp_dir = project_root / import_name
         existing_temp_dir.mkdir()
-        (existing_temp_dir / "old_file.py").write_text("# Old file")
+        (existing_temp_dir / "old_file.py").write_bytes(b"# Old file")
 
         config = SubfolderBuildConfig(
             project_root=project_root,
@@ -275,14 +230,14 @@ class TestTemporaryPackageDirectory:
         subfolder = project_root / "subfolder"
         
         # Create files that should NOT be excluded
-        (subfolder / "__init__.py").write_text("# Package init")
-        (subfolder / "module.py").write_text("def func(): pass")
-        (subfolder / "utils.py").write_text("def util(): pass")
+        (subfolder / "__init__.py").write_bytes(b"# Package init")
+        (subfolder / "module.py").write_bytes(b"def func(): pass")
+        (subfolder / "utils.py").write_bytes(b"def util(): pass")
         
         # Create a file that SHOULD be excluded (matches pattern)
-        (subfolder / "test_helper.py").write_text("def test(): pass")
+        (subfolder / "test_helper.py").write_bytes(b"def test(): pass")
         (subfolder / "_SS").mkdir()
-        (subfolder / "_SS" / "excluded.py").write_text("# Should be excluded")
+        (subfolder / "_SS" / "excluded.py").write_bytes(b"# Should be excluded")
         
         # Update pyproject.toml with exclude patterns that could match test directory names
         pyproject_path = project_root / "pyproject.toml"
@@ -351,30 +306,30 @@ class TestTemporaryPackageDirectory:
         subfolder = project_root / "subfolder"
         
         # Create a file in subfolder that imports _globals
-        (subfolder / "__init__.py").write_text("# Package init")
-        (subfolder / "module.py").write_text(
-            "from _globals import IS_TESTING\n\ndef func(): return IS_TESTING"
+        (subfolder / "__init__.py").write_bytes(b"# Package init")
+        (subfolder / "module.py").write_bytes(
+            b"from _globals import IS_TESTING\n\ndef func(): return IS_TESTING"
         )
         
         # Create _globals.py at root of src/ (outside subfolder)
         src_dir = project_root / "src"
         src_dir.mkdir(exist_ok=True)
-        (src_dir / "_globals.py").write_text("IS_TESTING = False")
+        (src_dir / "_globals.py").write_bytes(b"IS_TESTING = False")
         
         # Create other directories in src/ that should NOT be copied
         (src_dir / "features").mkdir()
-        (src_dir / "features" / "__init__.py").write_text("# Features")
-        (src_dir / "features" / "feature.py").write_text("def feature(): pass")
+        (src_dir / "features" / "__init__.py").write_bytes(b"# Features")
+        (src_dir / "features" / "feature.py").write_bytes(b"def feature(): pass")
         
         (src_dir / "integration").mkdir()
-        (src_dir / "integration" / "__init__.py").write_text("# Integration")
-        (src_dir / "integration" / "integration.py").write_text("def integration(): pass")
+        (src_dir / "integration" / "__init__.py").write_bytes(b"# Integration")
+        (src_dir / "integration" / "integration.py").write_bytes(b"def integration(): pass")
         
         (src_dir / "docs").mkdir()
-        (src_dir / "docs" / "readme.md").write_text("# Docs")
+        (src_dir / "docs" / "readme.md").write_bytes(b"# Docs")
         
         (src_dir / "infrastructure").mkdir()
-        (src_dir / "infrastructure" / "__init__.py").write_text("# Infrastructure")
+        (src_dir / "infrastructure" / "__init__.py").write_bytes(b"# Infrastructure")
         
         # Build the subfolder
         manager = BuildManager(project_root=project_root, src_dir=subfolder)
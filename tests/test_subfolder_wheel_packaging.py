@@ -23,54 +23,9 @@ import venv
 import zipfile
 from pathlib import Path
 
-import pytest
-
 from python_package_folder import BuildManager, SubfolderBuildConfig
 
 
-@pytest.fixture
-def test_project_with_pyproject(tmp_path: Path) -> Path:
-    """Create a test project with pyproject.toml."""
-    project_root = tmp_path / "test_project"
-    project_root.mkdir()
-
-    # Create pyproject.toml
-    pyproject_content = """[project]
-name = "test-package"
-version = "0.1.0"
-dynamic = ["version"]
-
-[tool.hatch.version]
-source = "uv-dynamic-versioning"
-
-[tool.uv-dynamic-versioning]
-vcs = "git"
-style = "pep440"
-bump = true
-
-[tool.hatch.build.targets.wheel]
-packages = ["src/test_package"]
-
-[dependency-groups]
-dev = [
-    "pytest>=8.0.0",
-    "pytest-cov>=4.0.0",
-]
-test = [
-    "pytest>=8.0.0",
-    "mypy>=1.0.0",
-]
-"""
-    (project_root / "pyproject.toml").write_text(pyproject_content)
-
-    # Create subfolder
-    subfolder = project_root / "subfolder"
-    subfolder.mkdir(exist_ok=True)
-    (subfolder / "module.py").write_text("def func(): pass")
-
-    return project_root
-
-
 class TestWheelPackaging:
     """
     Tests to verify that wheels are correctly packaged with the right directory structure.
@@ -92,7 +47,7 @@ class TestWheelPackaging:
         project_root.mkdir()
 
         # Create pyproject.toml
-        pyproject_content = """[project]
+        pyproject_content = b"""[project]
 name = "test-package"
 version = "0.1.0"
 
@@ -100,16 +55,16 @@ version = "0.1.0"
 requires = ["hatchling"]
 build-backend = "hatchling.build"
 """
-        (project_root / "pyproject.toml").write_text(pyproject_content)
+        (project_root / "pyproject.toml").write_bytes(pyproject_content)
 
         # Create subfolder with package name that has hyphens
         subfolder = project_root / "src" / "data"
         subfolder.mkdir(parents=True)
         
         # Create some Python files
-        (subfolder / "__init__.py").write_text("# Package init")
-        (subfolder / "module.py").write_text("def hello(): return 'world'")
-        (subfolder / "utils.py").write_text("def util(): return 'helper'")
+        (subfolder / "__init__.py").write_bytes(b"# Package init")
+        (subfolder / "module.py").write_bytes(b"def hello(): return 'world'")
+        (subfolder / "utils.py").write_bytes(b"def util(): return 'helper'")
 
         # Package name with hyphens (like ml-drawing-assistant-data)
         package_name = "ml-drawing-assistant-data"
@@ -2,137 +2,147 @@
 
 from __future__ import annotations
 
+import shutil
 from pathlib import Path
-from unittest.mock import patch
 
 import pytest
 
 from python_package_folder import BuildManager, ImportAnalyzer
 
-
-@pytest.fixture
-def test_project_with_imports(tmp_path: Path) -> Path:
-    """Create a test project with subfolder containing various imports."""
-    project_root = tmp_path / "test_project"
-    project_root.mkdir()
-
-    # Create pyproject.toml
-    pyproject_content = """[project]
+# Files of the test project, keyed by path relative to the project root
+_PROJECT_WITH_IMPORTS_FILES = {
+    "pyproject.toml": b"""[project]
 name = "test-package"
 version = "0.1.0"
 
 [tool.hatch.build.targets.wheel]
 packages = ["src/test_package"]
-"""
-    (project_root / "pyproject.toml").write_text(pyproject_content)
-
-    # Create subfolder with imports
-    subfolder = project_root / "subfolder_to_build"
-    subfolder.mkdir()
-
-    # Create a file that imports better_enum (package name: better-enum)
-    (subfolder / "better_enum_import.py").write_text(
-        """from better_enum import Enum
+""",
+    # A file that imports better_enum (package name: better-enum)
+    "subfolder_to_build/better_enum_import.py": b"""from better_enum import Enum
 def use_better_enum():
     return Enum
-"""
-    )
-
-    # Create a file that imports fitz (package name: pymupdf)
-    (subfolder / "fitz_import.py").write_text(
-        """import fitz
+""",
+    # A file that imports fitz (package name: pymupdf)
+    "subfolder_to_build/fitz_import.py": b"""import fitz
 def use_fitz():
     return fitz
-"""
-    )
-
-    # Create a file with standard library import (should be excluded)
-    (subfolder / "stdlib_import.py").write_text(
-        """import os
+""",
+    # A file with standard library import (should be excluded)
+    "subfolder_to_build/stdlib_import.py": b"""import os
 import sys
 def use_stdlib():
     return os, sys
-"""
-    )
-
-    # Create a file with local import (should be excluded)
-    (subfolder / "local_import.py").write_text(
-        """from better_enum_import import use_better_enum
+""",
+    # A file with local import (should be excluded)
+    "subfolder_to_build/local_import.py": b"""from better_enum_import import use_better_enum
 def use_local():
     return use_better_enum
-"""
-    )
+""",
+}
+
+
+@pytest.fixture(scope="module")
+def project_with_imports_template(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """
+    Create the test project once for the module.
+
+    Build tests get their own copy through test_project_with_imports, since they modify
+    the project; extraction tests share it read-only through extraction_context.
+    """
+    project_root = tmp_path_factory.mktemp("template") / "test_project"
+    # Each file's directory is created with all its parents in one call
+    for relative_path, content in _PROJECT_WITH_IMPORTS_FILES.items():
+        file_path = project_root / relative_path
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_bytes(content)
 
     return project_root
 
 
+@pytest.fixture
+def test_project_with_imports(tmp_path: Path, project_with_imports_template: Path) -> Path:
+    """Create a test project with subfolder containing various imports."""
+    return Path(
+        shutil.copytree(
+            project_with_imports_template,
+            tmp_path / "test_project",
+            copy_function=shutil.copyfile,
+        )
+    )
+
+
+@pytest.fixture(scope="class")
+def extraction_context(
+    project_with_imports_template: Path,
+) -> tuple[BuildManager, ImportAnalyzer, list[Path]]:
+    """
+    BuildManager, ImportAnalyzer and Python files of the subfolder, shared by a class.
+
+    Dependency extraction only reads the project, so it uses the template directly.
+    Tests that replace manager methods must restore them (e.g. with monkeypatch).
+    """
+    project_root = project_with_imports_template
+    src_dir = project_root / "subfolder_to_build"
+
+    analyzer = ImportAnalyzer(project_root)
+    return BuildManager(project_root, src_dir), analyzer, analyzer.find_all_python_files(src_dir)
+
+
 class TestThirdPartyDependencyExtraction:
     """Tests for extracting third-party dependencies from imports."""
 
-    def test_extract_better_enum_dependency(self, test_project_with_imports: Path) -> None:
+    def test_extract_better_enum_dependency(
+        self,
+        extraction_context: tuple[BuildManager, ImportAnalyzer, list[Path]],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
         """Test that better_enum import is detected and normalized to better-enum."""
-        project_root = test_project_with_imports
-        src_dir = project_root / "subfolder_to_build"
-
-        manager = BuildManager(project_root, src_dir)
-        analyzer = ImportAnalyzer(project_root)
-
-        # Get all Python files
-        python_files = analyzer.find_all_python_files(src_dir)
+        manager, analyzer, python_files = extraction_context
 
         # Mock _get_package_name_from_import to return better-enum for better_enum
-        with patch.object(
+        monkeypatch.setattr(
             manager,
             "_get_package_name_from_import",
-            side_effect=lambda name: "better-enum" if name == "better_enum" else None,
-        ):
-            # Extract third-party dependencies
-            third_party_deps = manager._extract_third_party_dependencies(python_files, analyzer)
+            lambda name: "better-enum" if name == "better_enum" else None,
+        )
+        # Extract third-party dependencies
+        third_party_deps = manager._extract_third_party_dependencies(python_files, analyzer)
 
-            # Should include better-enum (normalized from better_enum)
-            # If better_enum is classified as third_party or ambiguous, it should be included
-            dep_names = {dep.lower().replace("_", "-") for dep in third_party_deps}
-            # Check that better-enum is in the list (normalized) or better_enum if not mapped
-            assert "better-enum" in dep_names or "better_enum" in third_party_deps
+        # Should include better-enum (normalized from better_enum)
+        # If better_enum is classified as third_party or ambiguous, it should be included
+        dep_names = {dep.lower().replace("_", "-") for dep in third_party_deps}
+        # Check that better-enum is in the list (normalized) or better_enum if not mapped
+        assert "better-enum" in dep_names or "better_enum" in third_party_deps
 
     def test_extract_fitz_dependency_mapped_to_pymupdf(
-        self, test_project_with_imports: Path
+        self,
+        extraction_context: tuple[BuildManager, ImportAnalyzer, list[Path]],
+        monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         """Test that fitz import is mapped to pymupdf package name."""
-        project_root = test_project_with_imports
-        src_dir = project_root / "subfolder_to_build"
-
-        manager = BuildManager(project_root, src_dir)
-        analyzer = ImportAnalyzer(project_root)
-
-        # Get all Python files
-        python_files = analyzer.find_all_python_files(src_dir)
+        manager, analyzer, python_files = extraction_context
 
         # Mock the _get_package_name_from_import method to return pymupdf for fitz
-        with patch.object(
+        monkeypatch.setattr(
             manager,
             "_get_package_name_from_import",
-            side_effect=lambda name: "pymupdf" if name == "fitz" else None,
-        ):
-            third_party_deps = manager._extract_third_party_dependencies(python_files, analyzer)
-
-            # Should include pymupdf (mapped from fitz) if fitz is classified as third_party
-            # Note: This test depends on fitz being classified as third_party
-            # If it's not installed, it might be classified as ambiguous
-            if "pymupdf" in third_party_deps:
-                # Should not include fitz (the import name)
-                assert "fitz" not in third_party_deps
-
-    def test_extract_dependencies_excludes_stdlib(self, test_project_with_imports: Path) -> None:
-        """Test that standard library imports are excluded."""
-        project_root = test_project_with_imports
-        src_dir = project_root / "subfolder_to_build"
+            lambda name: "pymupdf" if name == "fitz" else None,
+        )
+        third_party_deps = manager._extract_third_party_dependencies(python_files, analyzer)
 
-        manager = BuildManager(project_root, src_dir)
-        analyzer = ImportAnalyzer(project_root)
+        # Should include pymupdf (mapped from fitz) if fitz is classified as third_party
+        # Note: This test depends on fitz being classified as third_party
+        # If it's not installed, it might be classified as ambiguous
+        if "pymupdf" in third_party_deps:
+            # Should not include fitz (the import name)
+            assert "fitz" not in third_party_deps
 
-        # Get all Python files
-        python_files = analyzer.find_all_python_files(src_dir)
+    def test_extract_dependencies_excludes_stdlib(
+        self, extraction_context: tuple[BuildManager, ImportAnalyzer, list[Path]]
+    ) -> None:
+        """Test that standard library imports are excluded."""
+        manager, analyzer, python_files = extraction_context
 
         # Extract third-party dependencies
         third_party_deps = manager._extract_third_party_dependencies(python_files, analyzer)
@@ -142,17 +152,10 @@ class TestThirdPartyDependencyExtraction:
         assert "sys" not in third_party_deps
 
     def test_extract_dependencies_excludes_local_imports(
-        self, test_project_with_imports: Path
+        self, extraction_context: tuple[BuildManager, ImportAnalyzer, list[Path]]
     ) -> None:
         """Test that local imports are excluded."""
-        project_root = test_project_with_imports
-        src_dir = project_root / "subfolder_to_build"
-
-        manager = BuildManager(project_root, src_dir)
-        analyzer = ImportAnalyzer(project_root)
-
-        # Get all Python files
-        python_files = analyzer.find_all_python_files(src_dir)
+        manager, analyzer, python_files = extraction_context
 
         # Extract third-party dependencies
         third_party_deps = manager._extract_third_party_dependencies(python_files, analyzer)
@@ -160,17 +163,25 @@ class TestThirdPartyDependencyExtraction:
         # Should not include local module names
         assert "better_enum_import" not in third_party_deps
 
-    def test_get_package_name_from_import_with_mapping(self, tmp_path: Path) -> None:
-        """Test _get_package_name_from_import with package name mapping."""
-        from python_package_folder.manager import BuildManager
+    def test_extract_dependencies_prefetches_files(
+        self,
+        extraction_context: tuple[BuildManager, ImportAnalyzer, list[Path]],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test that files are prefetched before being analyzed."""
+        manager, analyzer, python_files = extraction_context
+        prefetched: list[list[Path]] = []
+        monkeypatch.setattr(analyzer, "prefetch_imports", prefetched.append)
 
-        project_root = tmp_path / "test_project"
-        project_root.mkdir()
-        src_dir = project_root / "subfolder"
-        src_dir.mkdir()
-        (src_dir / "test.py").write_text("pass")
+        manager._extract_third_party_dependencies(python_files, analyzer)
 
-        manager = BuildManager(project_root, src_dir)
+        assert prefetched == [python_files]
+
+    def test_get_package_name_from_import_with_mapping(
+        self, extraction_context: tuple[BuildManager, ImportAnalyzer, list[Path]]
+    ) -> None:
+        """Test _get_package_name_from_import with package name mapping."""
+        manager = extraction_context[0]
 
         # Test that the method exists and can be called
         # The actual result depends on what's installed in the environment
@@ -181,17 +192,11 @@ class TestThirdPartyDependencyExtraction:
         # This is acceptable - the important thing is that the method works
         assert isinstance(package_name, str) or package_name is None
 
-    def test_get_package_name_fallback_to_import_name(self, tmp_path: Path) -> None:
+    def test_get_package_name_fallback_to_import_name(
+        self, extraction_context: tuple[BuildManager, ImportAnalyzer, list[Path]]
+    ) -> None:
         """Test that _get_package_name_from_import can be called."""
-        from python_package_folder.manager import BuildManager
-
-        project_root = tmp_path / "test_project"
-        project_root.mkdir()
-        src_dir = project_root / "subfolder"
-        src_dir.mkdir()
-        (src_dir / "test.py").write_text("pass")
-
-        manager = BuildManager(project_root, src_dir)
+        manager = extraction_context[0]
 
         # Test that the method exists and can be called
         # The actual result depends on what's installed in the environment
@@ -203,6 +208,21 @@ class TestThirdPartyDependencyExtraction:
         # False positives are possible when searching through distributions
         assert isinstance(package_name, str) or package_name is None
 
+    def test_get_package_name_cached_across_managers(self, tmp_path: Path) -> None:
+        """Test that package name lookups are shared by BuildManager instances."""
+        from python_package_folder.manager import BuildManager, _resolve_import_to_package
+
+        project_root = tmp_path / "test_project"
+        src_dir = project_root / "subfolder"
+        src_dir.mkdir(parents=True)
+
+        _resolve_import_to_package.cache_clear()
+        first = BuildManager(project_root, src_dir)._get_package_name_from_import("pytest.mark")
+        second = BuildManager(project_root, src_dir)._get_package_name_from_import("pytest")
+
+        assert first == second == "pytest"
+        assert _resolve_import_to_package.cache_info().hits == 1
+
 
 class TestThirdPartyDependenciesInSubfolderBuild:
     """Tests for third-party dependencies in subfolder builds."""
@@ -236,7 +256,7 @@ class TestThirdPartyDependenciesInSubfolderBuild:
         manager.cleanup()
 
     def test_dependencies_normalized_in_pyproject_toml(
-        self, test_project_with_imports: Path
+        self, test_project_with_imports: Path, monkeypatch: pytest.MonkeyPatch
     ) -> None:
         """Test that dependencies are normalized (underscores -> hyphens) in pyproject.toml."""
         project_root = test_project_with_imports
@@ -245,27 +265,27 @@ class TestThirdPartyDependenciesInSubfolderBuild:
         manager = BuildManager(project_root, src_dir)
 
         # Mock the dependency extraction to return better_enum
-        with patch.object(
-            manager,
-            "_extract_third_party_dependencies",
-            return_value=["better_enum"],
-        ):
-            manager.prepare_build(version="1.0.0", package_name="test-subfolder")
+        monkeypatch.setattr(
+            manager, "_extract_third_party_dependencies", lambda *args: ["better_enum"]
+        )
+        manager.prepare_build(version="1.0.0", package_name="test-subfolder")
 
-            # Check pyproject.toml content
-            pyproject_path = project_root / "pyproject.toml"
-            content = pyproject_path.read_text()
+        # Check pyproject.toml content
+        pyproject_path = project_root / "pyproject.toml"
+        content = pyproject_path.read_text()
 
-            # Should have better-enum (normalized) not better_enum
-            assert '"better-enum"' in content or "'better-enum'" in content
-            # Should not have better_enum (unnormalized)
-            assert '"better_enum"' not in content or (
-                '"better_enum"' in content and '"better-enum"' in content
-            )
+        # Should have better-enum (normalized) not better_enum
+        assert '"better-enum"' in content or "'better-enum'" in content
+        # Should not have better_enum (unnormalized)
+        assert '"better_enum"' not in content or (
+            '"better_enum"' in content and '"better-enum"' in content
+        )
 
-            manager.cleanup()
+        manager.cleanup()
 
-    def test_package_name_mapping_in_pyproject_toml(self, test_project_with_imports: Path) -> None:
+    def test_package_name_mapping_in_pyproject_toml(
+        self, test_project_with_imports: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Test that import names are mapped to package names in pyproject.toml."""
         project_root = test_project_with_imports
         src_dir = project_root / "subfolder_to_build"
@@ -273,20 +293,16 @@ class TestThirdPartyDependenciesInSubfolderBuild:
         manager = BuildManager(project_root, src_dir)
 
         # Mock _extract_third_party_dependencies to return pymupdf (mapped from fitz)
-        with patch.object(
-            manager,
-            "_extract_third_party_dependencies",
-            return_value=["pymupdf"],  # Should be mapped from fitz
-        ):
-            manager.prepare_build(version="1.0.0", package_name="test-subfolder")
+        monkeypatch.setattr(manager, "_extract_third_party_dependencies", lambda *args: ["pymupdf"])
+        manager.prepare_build(version="1.0.0", package_name="test-subfolder")
 
-            # Check pyproject.toml content
-            pyproject_path = project_root / "pyproject.toml"
-            content = pyproject_path.read_text()
+        # Check pyproject.toml content
+        pyproject_path = project_root / "pyproject.toml"
+        content = pyproject_path.read_text()
 
-            # Should have pymupdf (the actual package name)
-            assert '"pymupdf"' in content or "'pymupdf'" in content
-            # Should not have fitz (the import name)
-            assert '"fitz"' not in content or ('"fitz"' in content and '"pymupdf"' in content)
+        # Should have pymupdf (the actual package name)
+        assert '"pymupdf"' in content or "'pymupdf'" in content
+        # Should not have fitz (the import name)
+        assert '"fitz"' not in content or ('"fitz"' in content and '"pymupdf"' in content)
 
-            manager.cleanup()
+        manager.cleanup()
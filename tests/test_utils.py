@@ -7,7 +7,11 @@ from pathlib import Path
 import pytest
 
 from python_package_folder import find_project_root, find_source_directory
-from python_package_folder.utils import is_python_package_directory
+from python_package_folder.utils import (
+    is_python_package_directory,
+    iter_python_file_entries,
+    write_file_atomic,
+)
 
 
 class TestFindProjectRoot:
@@ -158,3 +162,46 @@ class TestIsPythonPackageDirectory:
         pkg_dir.mkdir()
 
         assert is_python_package_directory(pkg_dir) is False
+
+
+class TestIterPythonFileEntries:
+    """Tests for iter_python_file_entries function."""
+
+    def test_iter_python_file_entries_matches_rglob(self, tmp_path: Path) -> None:
+        """Test that the walk finds the same files, in the same order, as rglob("*.py")."""
+        for relative_path in ("a.py", "b/c.py", "b/d/e.py", "b/notes.txt", "f/g.py"):
+            file_path = tmp_path / relative_path
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            file_path.write_text("")
+
+        entries = [entry.path for entry in iter_python_file_entries(tmp_path)]
+
+        assert entries == [str(path) for path in tmp_path.rglob("*.py")]
+        assert list(iter_python_file_entries(tmp_path / "missing")) == []
+
+    def test_iter_python_file_entries_skips_excluded_names(self, tmp_path: Path) -> None:
+        """Test that excluded directories are not entered and excluded files are skipped."""
+        for relative_path in ("a.py", "_skip.py", "_skip_dir/b.py", "keep/c.py"):
+            file_path = tmp_path / relative_path
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            file_path.write_text("")
+
+        entries = iter_python_file_entries(tmp_path, lambda name: name.startswith("_skip"))
+
+        assert sorted(entry.name for entry in entries) == ["a.py", "c.py"]
+
+
+class TestWriteFileAtomic:
+    """Tests for write_file_atomic function."""
+
+    def test_write_file_atomic_replaces_content(self, tmp_path: Path) -> None:
+        """Test that the content is replaced, keeping the mode and no temporary file."""
+        path = tmp_path / "pyproject.toml"
+        path.write_text("old")
+        path.chmod(0o600)
+
+        write_file_atomic(path, b"new")
+
+        assert path.read_bytes() == b"new"
+        assert (path.stat().st_mode & 0o777) == 0o600
+        assert list(tmp_path.iterdir()) == [path]
@@ -51,15 +51,10 @@ class TestVersionManager:
         pyproject.write_text('[project]\nname = "test-package"\nversion = "1.2.3"\n')
 
         manager = VersionManager(test_pyproject)
-        manager.get_current_version()  # Should not crash
 
         # Version manager should be able to read it
         # If tomllib is available, it should work. If not, regex fallback should work.
-        # For now, just verify the file has the version and manager doesn't crash
-        content = pyproject.read_text()
-        assert "1.2.3" in content
-        # Version might be None if parsing fails, but that's okay for this test
-        # The important thing is that set_version works (tested in other tests)
+        assert manager.get_current_version() == "1.2.3"
 
     def test_set_version(self, test_pyproject: Path) -> None:
         """Test setting a version."""
@@ -67,15 +62,10 @@ class TestVersionManager:
 
         manager.set_version("2.0.0")
 
-        # Check version was set in file
+        # Check version was set in file, and that the manager kept what it wrote
         content = (test_pyproject / "pyproject.toml").read_text()
         assert '"2.0.0"' in content or "'2.0.0'" in content
-
-        # Check version can be read back (may need to re-read)
-        # The set_version modifies the file, so get_current_version should work
-        content_after = (test_pyproject / "pyproject.toml").read_text()
-        # Verify version string appears in the file
-        assert "2.0.0" in content_after
+        assert manager._cached_content == content
 
         # Check dynamic versioning sections should be removed
         assert "[tool.hatch.version]" not in content
@@ -86,12 +76,28 @@ class TestVersionManager:
 
         manager.set_version("1.0.0")
 
-        content = (test_pyproject / "pyproject.toml").read_text()
+        content = manager._cached_content
 
         # Check dynamic versioning sections are removed
         assert "[tool.hatch.version]" not in content
         assert "[tool.uv-dynamic-versioning]" not in content
 
+    def test_set_version_keeps_following_sections(self, test_pyproject: Path) -> None:
+        """Test that sections after the dynamic versioning sections are preserved."""
+        pyproject = test_pyproject / "pyproject.toml"
+        pyproject.write_text(
+            pyproject.read_text()
+            + '\n[tool.hatch.build.targets.wheel]\npackages = ["src/test_package"]\n'
+        )
+        manager = VersionManager(test_pyproject)
+
+        manager.set_version("1.0.0")
+
+        content = manager._cached_content
+        assert "[tool.uv-dynamic-versioning]" not in content
+        assert "[tool.hatch.build.targets.wheel]" in content
+        assert 'packages = ["src/test_package"]' in content
+
     def test_validate_version_format(self, test_pyproject: Path) -> None:
         """Test version format validation."""
         manager = VersionManager(test_pyproject)
@@ -101,9 +107,77 @@ class TestVersionManager:
         for version in valid_versions:
             # Should not raise an error
             manager.set_version(version)
-            # Verify it was set (check file content)
-            content = (test_pyproject / "pyproject.toml").read_text()
-            assert version in content
+            # Verify it was set (check written content)
+            assert version in manager._cached_content
+
+    def test_get_current_version_tracks_file_changes(self, test_pyproject: Path) -> None:
+        """Test that the cached pyproject.toml is refreshed after writes."""
+        manager = VersionManager(test_pyproject)
+        assert manager.get_current_version() is None
+
+        manager.set_version("2.0.0")
+        assert manager.get_current_version() == "2.0.0"
+
+        # External edit with a different size invalidates the cache
+        pyproject = test_pyproject / "pyproject.toml"
+        pyproject.write_text('[project]\nname = "test-package"\nversion = "10.0.0"\n')
+        assert manager.get_current_version() == "10.0.0"
+
+    def test_set_version_keeps_file_identity(self, test_pyproject: Path, tmp_path: Path) -> None:
+        """Test that writes keep a symlinked pyproject.toml, its mode and its hard links."""
+        pyproject = test_pyproject / "pyproject.toml"
+        pyproject.chmod(0o600)
+        target = tmp_path / "shared" / "pyproject.toml"
+        target.parent.mkdir()
+        pyproject.rename(target)
+        pyproject.symlink_to(target)
+        hard_link = tmp_path / "hard_link.toml"
+
+        manager = VersionManager(test_pyproject)
+        manager.set_version("2.0.0")
+
+        assert pyproject.is_symlink()
+        assert (target.stat().st_mode & 0o777) == 0o600
+        assert "2.0.0" in target.read_text()
+        assert list(target.parent.iterdir()) == [target]
+
+        hard_link.hardlink_to(target)
+        manager.restore_dynamic_versioning()
+
+        assert "[tool.hatch.version]" in hard_link.read_text()
+        assert hard_link.samefile(target)
+
+    def test_missing_pyproject(self, tmp_path: Path) -> None:
+        """Test reading and restoring versions when pyproject.toml doesn't exist."""
+        manager = VersionManager(tmp_path)
+
+        assert manager.get_current_version() is None
+        manager.restore_dynamic_versioning()
+        assert not (tmp_path / "pyproject.toml").exists()
+
+        with pytest.raises(FileNotFoundError, match="pyproject.toml not found"):
+            manager.set_version("1.0.0")
+
+    def test_validate_version_pep440_segments(self, test_pyproject: Path) -> None:
+        """Test validation of epoch, pre-release, post-release and dev segments."""
+        manager = VersionManager(test_pyproject)
+
+        valid_versions = ["1", "1!2.0", "1.2.3a1", "1.2.3rc2", "1.2.3.post1", "1.2.3b1.post2.dev3"]
+        for version in valid_versions:
+            assert manager._validate_version(version), version
+
+        invalid_versions = [
+            "",
+            "1.",
+            ".1",
+            "1..2",
+            "1.2.3a",
+            "1.2.3.post",
+            "1.2.3.dev1.post1",
+            "a1",
+        ]
+        for version in invalid_versions:
+            assert not manager._validate_version(version), version
 
     def test_invalid_version_format(self, test_pyproject: Path) -> None:
         """Test that invalid version formats raise errors."""
@@ -125,7 +199,7 @@ class TestVersionManager:
         manager.restore_dynamic_versioning()
 
         # Check dynamic versioning is restored
-        content = (test_pyproject / "pyproject.toml").read_text()
+        content = manager._cached_content
         assert "[tool.hatch.version]" in content
         assert "[tool.uv-dynamic-versioning]" in content
 
@@ -140,6 +214,21 @@ class TestVersionManager:
         manager.restore_dynamic_versioning()
 
         # Check dynamic versioning is restored
-        content = (test_pyproject / "pyproject.toml").read_text()
+        content = manager._cached_content
         # Version should be removed or dynamic should be added
         assert "[tool.hatch.version]" in content or 'dynamic = ["version"]' in content
+
+    def test_restore_dynamic_versioning_scans_whole_project_section(
+        self, test_pyproject: Path
+    ) -> None:
+        """Test that a version far down the [project] section is detected."""
+        pyproject = test_pyproject / "pyproject.toml"
+        fields = "".join(f'field{i} = "{i}"\n' for i in range(12))
+        pyproject.write_text(f'[project]\nname = "test-package"\n{fields}version = "1.0.0"\n')
+        manager = VersionManager(test_pyproject)
+
+        manager.restore_dynamic_versioning()
+
+        content = manager._cached_content
+        assert "[tool.hatch.version]" in content
+        assert "dynamic = " not in content